@@ -3,4 +3,8 @@ from .calculate_feature_matrix import (
     approximate_features,
     calculate_feature_matrix
 )
+from .compiled_features import CompiledFeatures, compile_features
+from .compute_session import ComputeSession
+from .feature_cache import FeatureCache
+from .feature_scorer import FeatureScorer
 from .utils import bin_cutoff_times, create_client_and_cluster
@@ -1,31 +1,54 @@
 import logging
 import math
+import multiprocessing
 import os
 import shutil
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 
 import cloudpickle
 import dask.dataframe as dd
 import numpy as np
 import pandas as pd
+import pandas.api.types as pdtypes
+from dask.base import tokenize
 
+from featuretools.computational_backends.compiled_features import (
+    CompiledFeatures,
+    compile_features
+)
+from featuretools.computational_backends.compute_session import ComputeSession
+from featuretools.computational_backends.cutoff_join import (
+    can_join_cutoff_times,
+    can_join_dask_cutoff_times,
+    join_cutoff_times,
+    join_dask_cutoff_times
+)
+from featuretools.computational_backends.feature_cache import FeatureCache
 from featuretools.computational_backends.feature_set import FeatureSet
 from featuretools.computational_backends.feature_set_calculator import (
     FeatureSetCalculator
 )
+from featuretools.computational_backends.partition import (
+    get_entityset_partition
+)
+from featuretools.computational_backends.time_sweep import TimeSweep
 from featuretools.computational_backends.utils import (
     _check_cutoff_time_type,
     _validate_cutoff_time,
     bin_cutoff_times,
+    check_worker_memory,
     create_client_and_cluster,
-    gather_approximate_features,
     gen_empty_approx_features_df,
-    save_csv_decorator
+    get_entityset_token,
+    n_jobs_to_workers,
+    save_progress_decorator
 )
 from featuretools.entityset.relationship import RelationshipPath
-from featuretools.feature_base import AggregationFeature, FeatureBase
+from featuretools.feature_base import save_features
 from featuretools.utils import Trie
 from featuretools.utils.gen_utils import make_tqdm_iterator
 from featuretools.variable_types import NumericTimeIndex
@@ -34,6 +57,10 @@ logger = logging.getLogger('featuretools.computational_backend')
 
 PBAR_FORMAT = "Elapsed: {elapsed} | Progress: {l_bar}{bar}"
 FEATURE_CALCULATION_PERCENTAGE = .95  # make total 5% higher to allot time for wrapping up at end
+# seconds each chunk should take to calculate when chunks are sized adaptively
+ADAPTIVE_CHUNK_SECONDS = 10
+# cutoff times in each chunk before the time taken per cutoff time is known
+ADAPTIVE_INITIAL_CHUNK_SIZE = 100
 
 
 def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instance_ids=None,
@@ -43,16 +70,20 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
                              save_progress=None, verbose=False,
                              chunk_size=None, n_jobs=1,
                              dask_kwargs=None, progress_callback=None,
-                             include_cutoff_time=True):
+                             include_cutoff_time=True, incremental_aggregations=False,
+                             output=None, feature_cache=None, backend='distributed',
+                             n_threads=1, session=None, partition_entityset=False):
     """Calculates a matrix for a given set of instance ids and calculation times.
 
     Args:
-        features (list[:class:`.FeatureBase`]): Feature definitions to be calculated.
+        features (list[:class:`.FeatureBase`] or :class:`.CompiledFeatures`): Feature
+            definitions to be calculated, or features compiled with
+            :func:`compile_features` to skip planning the calculation again.
 
         entityset (EntitySet): An already initialized entityset. Required if `entities` and `relationships`
             not provided
 
-        cutoff_time (pd.DataFrame or Datetime): Specifies times at which to calculate
+        cutoff_time (pd.DataFrame, dd.DataFrame or Datetime): Specifies times at which to calculate
             the features for each instance. The resulting feature matrix will use data
             up to and including the cutoff_time. Can either be a DataFrame or a single
             value. If a DataFrame is passed the instance ids for which to calculate features
@@ -61,7 +92,9 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
             the same name as the target entity time index or a column named `time`. If the
             DataFrame has more than two columns, any additional columns will be added to the
             resulting feature matrix. If a single value is passed, this value will be used for
-            all instances.
+            all instances. With Dask Entities, a Dask DataFrame of cutoff times is not
+            computed if the features can be calculated for every cutoff time in a single
+            lazy graph.
 
         instance_ids (list): List of instances to calculate features on. Only
             used if cutoff_time is a single datetime.
@@ -96,7 +129,10 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
             output feature matrix to calculate at time. If passed an integer
             greater than 0, will try to use that many rows per chunk. If passed
             a float value between 0 and 1 sets the chunk size to that
-            percentage of all rows. if None, and n_jobs > 1 it will be set to 1/n_jobs
+            percentage of all rows. If None and the feature matrix is calculated in
+            parallel with the "distributed" backend, chunks are sized while they are
+            calculated so each takes about ``ADAPTIVE_CHUNK_SECONDS``, and may contain
+            many cutoff times. Otherwise if None and n_jobs > 1 it will be set to 1/n_jobs
 
         n_jobs (int, optional): number of parallel processes to use when
             calculating feature matrix.
@@ -115,6 +151,35 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
 
             Valid keyword arguments for LocalCluster will also be accepted.
 
+        backend (str, optional): How to calculate the feature matrix when n_jobs is
+            not 1. If "distributed", the entityset is scattered to the workers of a
+            dask distributed cluster. If "processes", a pool of forked processes is
+            used instead, which share the entityset of the parent process without
+            copying it, and are only sent the cutoff times of each chunk. The
+            "processes" backend is only available on platforms which can fork
+            processes, and does not accept dask_kwargs. Defaults to "distributed".
+
+        n_threads (int, optional): Number of threads each process uses to calculate
+            the features of different child and parent entities of an entity at the
+            same time. Most of the calculation is done by pandas and numpy, which
+            release the GIL, so this can use idle cores without copying the data.
+            Defaults to 1.
+
+        session (ComputeSession, optional): Session to calculate the feature matrix
+            with. The cluster of the session is used instead of creating a cluster,
+            and the entityset is only scattered to its workers if it was not
+            already scattered by an earlier call. Cannot be used with dask_kwargs or
+            the "processes" backend.
+
+        partition_entityset (bool, optional): If True, when calculating in parallel
+            with the "distributed" backend, cutoff times are chunked by instance, and
+            each chunk is sent only the rows of each entity which are reachable from
+            its instances through the relationships used by the features, instead of
+            scattering the whole entityset to every worker. This allows entitysets
+            larger than the memory of a single worker to be used, but the rows shared
+            by the instances of different chunks are sent more than once. Not supported
+            with Dask Entities. Defaults to False.
+
         save_progress (str, optional): path to save intermediate computational results.
 
         progress_callback (callable): function to be called with incremental progress updates.
@@ -126,12 +191,46 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
 
         include_cutoff_time (bool): Include data at cutoff times in feature calculations. Defaults to ``True``.
 
+        incremental_aggregations (bool, optional): If True, aggregations which can be
+            merged from batches of data (such as Sum, Count, Mean, Min, Max and Std)
+            are calculated at each cutoff time by merging in only the data added since
+            the previous cutoff time. Aggregations which only differ in their use_previous
+            window are also calculated together in one pass over the data. If all of the
+            features are such aggregations of the children of the target entity or
+            variables of the target entity, the features are calculated for every cutoff
+            time at once by joining the child data to the cutoff times of each instance.
+            This is much faster when there are many cutoff times or windows, but floating
+            point results may differ very slightly from calculating each cutoff time
+            separately. Even if False, chunks with many cutoff times are calculated at
+            once if the features are variables of the target entity or aggregations
+            of its children, by tagging each child row with the pairs of instance and
+            cutoff time which use it and grouping the tagged rows by pair. Defaults to
+            ``False``.
+
+        output (str or callable, optional): Where to write the feature matrix as it
+            is calculated, instead of holding the full feature matrix in memory. If a
+            path to a directory, each chunk of the feature matrix is written to it as
+            a Parquet file named ``part-00000.parquet``, ``part-00001.parquet``, etc. If
+            a callable, it is called with each chunk of the feature matrix as a
+            DataFrame. Chunks are written in order of cutoff time, with instances at
+            the same cutoff time sorted by instance id, rather than in the order of
+            the given cutoff times. Not supported with Dask Entities.
+
+        feature_cache (str or FeatureCache, optional): Cache to reuse the values of
+            features calculated by earlier calls from. If a path to a directory, a
+            :class:`.FeatureCache` without a maximum size is created in it. The values
+            of each feature are cached by instance for the data of the entityset and the
+            cutoff time they were calculated for, so only the features and instances
+            which are not in the cache are calculated. Not supported with Dask Entities.
+
     Returns:
-        pd.DataFrame: The feature matrix.
+        pd.DataFrame: The feature matrix. If ``output`` is given, returns None.
     """
-    assert (isinstance(features, list) and features != [] and
-            all([isinstance(feature, FeatureBase) for feature in features])), \
-        "features must be a non-empty list of features"
+    if isinstance(features, CompiledFeatures):
+        compiled = features
+    else:
+        compiled = compile_features(features)
+    features = compiled.features
 
     # handle loading entityset
     from featuretools.entityset.entityset import EntitySet
@@ -139,19 +238,52 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
         if entities is not None and relationships is not None:
             entityset = EntitySet("entityset", entities, relationships)
 
-    if any(isinstance(es.df, dd.DataFrame) for es in entityset.entities):
-        if approximate:
-            msg = "Using approximate is not supported with Dask Entities"
-            raise ValueError(msg)
+    compiled.check_entityset(entityset)
+
+    if backend not in ['distributed', 'processes']:
+        raise ValueError("Unknown backend '{}', must be 'distributed' or 'processes'".format(backend))
+
+    if backend == 'processes':
+        if dask_kwargs is not None:
+            raise ValueError("dask_kwargs can only be used with the 'distributed' backend")
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise ValueError("The 'processes' backend is not supported on this platform")
+
+    if session is not None:
+        if dask_kwargs is not None:
+            raise ValueError("dask_kwargs cannot be used with a session")
+        if backend == 'processes':
+            raise ValueError("The 'processes' backend cannot be used with a session")
+
+    is_dask = any(isinstance(es.df, dd.DataFrame) for es in entityset.entities)
+    if is_dask:
         if training_window:
             msg = "Using training_window is not supported with Dask Entities"
             raise ValueError(msg)
+        if output is not None:
+            msg = "Using output is not supported with Dask Entities"
+            raise ValueError(msg)
+        if feature_cache is not None:
+            msg = "Using feature_cache is not supported with Dask Entities"
+            raise ValueError(msg)
+        if backend == 'processes':
+            msg = "Using the processes backend is not supported with Dask Entities"
+            raise ValueError(msg)
+        if partition_entityset:
+            msg = "Using partition_entityset is not supported with Dask Entities"
+            raise ValueError(msg)
 
     target_entity = entityset[features[0].entity.id]
 
-    cutoff_time = _validate_cutoff_time(cutoff_time, target_entity)
+    # With Dask entities, the features may be calculated for every cutoff time
+    # in a single lazy graph, so a Dask dataframe of cutoff times is not computed
+    lazy_join = is_dask and approximate is None and save_progress is None and \
+        n_jobs == 1 and dask_kwargs is None and session is None and \
+        can_join_dask_cutoff_times(compiled.get_feature_set()[0], entityset)
 
-    if isinstance(cutoff_time, pd.DataFrame):
+    cutoff_time = _validate_cutoff_time(cutoff_time, target_entity, keep_dask=lazy_join)
+
+    if isinstance(cutoff_time, (pd.DataFrame, dd.DataFrame)):
         if instance_ids:
             msg = "Passing 'instance_ids' is valid only if 'cutoff_time' is a single value or None - ignoring"
             warnings.warn(msg)
@@ -185,6 +317,7 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
             instance_ids = pd.Series(instance_ids)
 
         cutoff_time = (cutoff_time, instance_ids)
+        lazy_join = False
 
     _check_cutoff_time_type(cutoff_time, entityset.time_type)
 
@@ -195,33 +328,10 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
         warnings.warn(msg)
         cutoff_time = pd.DataFrame({"instance_id": cutoff_time[1], "time": [cutoff_time[0]] * len(cutoff_time[1])})
 
-    feature_set = FeatureSet(features)
-
-    # Get features to approximate
-    if approximate is not None:
-        approximate_feature_trie = gather_approximate_features(feature_set)
-        # Make a new FeatureSet that ignores approximated features
-        feature_set = FeatureSet(features, approximate_feature_trie=approximate_feature_trie)
-
-    # Check if there are any non-approximated aggregation features
-    no_unapproximated_aggs = True
-    for feature in features:
-        if isinstance(feature, AggregationFeature):
-            # do not need to check if feature is in to_approximate since
-            # only base features of direct features can be in to_approximate
-            no_unapproximated_aggs = False
-            break
-
-        if approximate is not None:
-            all_approx_features = {f for _, feats in feature_set.approximate_feature_trie
-                                   for f in feats}
-        else:
-            all_approx_features = set()
-        deps = feature.get_dependencies(deep=True, ignored=all_approx_features)
-        for dependency in deps:
-            if isinstance(dependency, AggregationFeature):
-                no_unapproximated_aggs = False
-                break
+    # The execution plan is built when the features are compiled, before the
+    # feature set is copied to any other processes, so the plan is reused by
+    # every chunk.
+    feature_set, no_unapproximated_aggs = compiled.get_feature_set(approximate is not None)
 
     cutoff_df_time_var = 'time'
     target_time = '_original_time'
@@ -238,7 +348,10 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
     else:
         cutoff_time_to_pass = cutoff_time
 
-    if isinstance(cutoff_time, pd.DataFrame):
+    if isinstance(cutoff_time, dd.DataFrame):
+        # only the number of cutoff times is computed
+        cutoff_time_len = len(cutoff_time)
+    elif isinstance(cutoff_time, pd.DataFrame):
         cutoff_time_len = cutoff_time.shape[0]
     else:
         cutoff_time_len = len(cutoff_time[1])
@@ -254,8 +367,99 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
         # allows us to utilize progress_bar updates without printing to anywhere
         tqdm_options.update({'file': open(os.devnull, 'w'), 'disable': False})
 
-    with make_tqdm_iterator(**tqdm_options) as progress_bar:
-        if n_jobs != 1 or dask_kwargs is not None:
+    # identifies everything the saved parts of the feature matrix depend on
+    # besides their cutoff time and instances, so they can be reused by a
+    # later run
+    entityset_token = None
+    if save_progress is not None or feature_cache is not None:
+        entityset_token = get_entityset_token(entityset)
+
+    save_progress_fingerprint = None
+    if save_progress is not None:
+        save_progress_fingerprint = tokenize(save_features(features),
+                                             entityset_token,
+                                             approximate,
+                                             training_window,
+                                             include_cutoff_time,
+                                             incremental_aggregations)
+
+    # identifies everything the cached values of each feature depend on
+    # besides the feature, cutoff time, instances and training window
+    feature_cache_fingerprint = None
+    if feature_cache is not None:
+        if isinstance(feature_cache, str):
+            feature_cache = FeatureCache(feature_cache)
+        feature_cache_fingerprint = tokenize(entityset_token,
+                                             approximate,
+                                             include_cutoff_time,
+                                             incremental_aggregations)
+
+    write_chunk = _get_chunk_writer(output, cutoff_time_in_index)
+
+    with _get_approximation_session(session, approximate, backend, n_jobs, dask_kwargs) as session, \
+            make_tqdm_iterator(**tqdm_options) as progress_bar:
+        if session is not None:
+            dask_kwargs = None
+
+        # Calculate the approximate features of every bucket of cutoff times once
+        # for the whole run, in parallel if the run is, rather than separately in
+        # every chunk. When saving progress or caching features they are only
+        # calculated by the chunks which are not already saved, unless the
+        # chunks only have part of the entityset.
+        approximated = None
+        if approximate is not None and \
+                ((save_progress is None and feature_cache is None) or partition_entityset):
+            approximated = approximate_features(feature_set,
+                                                cutoff_time_to_pass,
+                                                window=approximate,
+                                                entityset=entityset,
+                                                training_window=training_window,
+                                                include_cutoff_time=include_cutoff_time,
+                                                incremental_aggregations=incremental_aggregations,
+                                                n_threads=n_threads,
+                                                n_jobs=n_jobs,
+                                                backend=backend,
+                                                dask_kwargs=dask_kwargs,
+                                                session=session,
+                                                partition_entityset=partition_entityset)
+
+        if lazy_join:
+            feature_matrix = join_dask_cutoff_times(feature_set,
+                                                    entityset,
+                                                    cutoff_time_to_pass,
+                                                    pass_columns,
+                                                    include_cutoff_time=include_cutoff_time)
+            # the features of every cutoff time are in the lazy graph
+            previous_progress = progress_bar.n
+            progress_bar.update(cutoff_time_len)
+            if progress_callback is not None:
+                update, progress_percent, time_elapsed = update_progress_callback_parameters(progress_bar,
+                                                                                             previous_progress)
+                progress_callback(update, progress_percent, time_elapsed)
+        elif n_jobs != 1 and backend == 'processes':
+            feature_matrix = process_calculate_chunks(cutoff_time=cutoff_time_to_pass,
+                                                      chunk_size=chunk_size,
+                                                      feature_set=feature_set,
+                                                      approximate=approximate,
+                                                      training_window=training_window,
+                                                      save_progress=save_progress,
+                                                      entityset=entityset,
+                                                      n_jobs=n_jobs,
+                                                      no_unapproximated_aggs=no_unapproximated_aggs,
+                                                      cutoff_df_time_var=cutoff_df_time_var,
+                                                      target_time=target_time,
+                                                      pass_columns=pass_columns,
+                                                      progress_bar=progress_bar,
+                                                      progress_callback=progress_callback,
+                                                      include_cutoff_time=include_cutoff_time,
+                                                      incremental_aggregations=incremental_aggregations,
+                                                      n_threads=n_threads,
+                                                      output=write_chunk,
+                                                      save_progress_fingerprint=save_progress_fingerprint,
+                                                      feature_cache=feature_cache,
+                                                      feature_cache_fingerprint=feature_cache_fingerprint,
+                                                      approximated=approximated)
+        elif n_jobs != 1 or dask_kwargs is not None or session is not None:
             feature_matrix = parallel_calculate_chunks(cutoff_time=cutoff_time_to_pass,
                                                        chunk_size=chunk_size,
                                                        feature_set=feature_set,
@@ -271,7 +475,16 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
                                                        progress_bar=progress_bar,
                                                        dask_kwargs=dask_kwargs or {},
                                                        progress_callback=progress_callback,
-                                                       include_cutoff_time=include_cutoff_time)
+                                                       include_cutoff_time=include_cutoff_time,
+                                                       incremental_aggregations=incremental_aggregations,
+                                                       n_threads=n_threads,
+                                                       output=write_chunk,
+                                                       save_progress_fingerprint=save_progress_fingerprint,
+                                                       feature_cache=feature_cache,
+                                                       feature_cache_fingerprint=feature_cache_fingerprint,
+                                                       approximated=approximated,
+                                                       session=session,
+                                                       partition_entityset=partition_entityset)
         else:
             feature_matrix = calculate_chunk(cutoff_time=cutoff_time_to_pass,
                                              chunk_size=chunk_size,
@@ -286,7 +499,14 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
                                              pass_columns=pass_columns,
                                              progress_bar=progress_bar,
                                              progress_callback=progress_callback,
-                                             include_cutoff_time=include_cutoff_time)
+                                             include_cutoff_time=include_cutoff_time,
+                                             incremental_aggregations=incremental_aggregations,
+                                             n_threads=n_threads,
+                                             output=write_chunk,
+                                             save_progress_fingerprint=save_progress_fingerprint,
+                                             feature_cache=feature_cache,
+                                             feature_cache_fingerprint=feature_cache_fingerprint,
+                                             approximated=approximated)
 
         # ensure rows are sorted by input order
         if isinstance(feature_matrix, pd.DataFrame):
@@ -319,147 +539,256 @@ def calculate_feature_matrix(features, entityset=None, cutoff_time=None, instanc
 
 def calculate_chunk(cutoff_time, chunk_size, feature_set, entityset, approximate, training_window,
                     save_progress, no_unapproximated_aggs, cutoff_df_time_var, target_time,
-                    pass_columns, progress_bar=None, progress_callback=None, include_cutoff_time=True):
+                    pass_columns, progress_bar=None, progress_callback=None, include_cutoff_time=True,
+                    incremental_aggregations=False, output=None, save_progress_fingerprint=None,
+                    feature_cache=None, feature_cache_fingerprint=None, n_threads=1,
+                    approximated=None):
 
     if not isinstance(feature_set, FeatureSet):
         feature_set = cloudpickle.loads(feature_set)
 
     feature_matrix = []
+
+    def run_calculator(time_last, ids, training_window, progress_callback,
+                       get_precalculated_features=None, cache_key=None):
+        time_sweep.advance(time_last)
+
+        def calculate(feature_set, ids=ids):
+            precalculated_features = None
+            if get_precalculated_features is not None:
+                precalculated_features = get_precalculated_features()
+            calculator = FeatureSetCalculator(entityset,
+                                              feature_set,
+                                              time_last,
+                                              training_window=training_window,
+                                              precalculated_features=precalculated_features,
+                                              time_sweep=time_sweep,
+                                              incremental_aggregations=incremental_aggregations,
+                                              n_threads=n_threads,
+                                              executor=executor)
+            return calculator.run(ids,
+                                  progress_callback=progress_callback,
+                                  include_cutoff_time=include_cutoff_time)
+
+        if feature_cache is None:
+            return calculate(feature_set)
+
+        key = tokenize(feature_cache_fingerprint, cache_key, training_window)
+        return feature_cache.calculate(feature_set, key, ids, calculate,
+                                       progress_callback=progress_callback)
+
+    def add_result(result):
+        # write each part of the feature matrix as soon as it is calculated
+        # rather than keeping it in memory
+        if output is not None:
+            output(result)
+        else:
+            feature_matrix.append(result)
+    # cutoff times are visited in increasing order, so share a sweep between
+    # all of the calculators run for this chunk
+    time_sweep = TimeSweep(entityset,
+                           include_cutoff_time=include_cutoff_time,
+                           incremental_aggregations=incremental_aggregations)
     if no_unapproximated_aggs and approximate is not None:
         if entityset.time_type == NumericTimeIndex:
             group_time = np.inf
         else:
             group_time = datetime.now()
 
-    if isinstance(cutoff_time, tuple):
-        update_progress_callback = None
-        if progress_bar is not None:
-            def update_progress_callback(done):
-                previous_progress = progress_bar.n
-                progress_bar.update(done * len(cutoff_time[1]))
-                if progress_callback is not None:
-                    update, progress_percent, time_elapsed = update_progress_callback_parameters(progress_bar,
-                                                                                                 previous_progress)
-                    progress_callback(update, progress_percent, time_elapsed)
-
-        time_last = cutoff_time[0]
-        ids = cutoff_time[1]
-        calculator = FeatureSetCalculator(entityset,
-                                          feature_set,
-                                          time_last,
-                                          training_window=training_window)
-        _feature_matrix = calculator.run(ids,
-                                         progress_callback=update_progress_callback,
-                                         include_cutoff_time=include_cutoff_time)
-        if isinstance(_feature_matrix, pd.DataFrame):
-            time_index = pd.Index([time_last] * len(ids), name='time')
-            _feature_matrix = _feature_matrix.set_index(time_index, append=True)
-        feature_matrix.append(_feature_matrix)
-
-    else:
-        for _, group in cutoff_time.groupby(cutoff_df_time_var):
-            # if approximating, calculate the approximate features
-            if approximate is not None:
-                precalculated_features_trie = approximate_features(
-                    feature_set,
-                    group,
-                    window=approximate,
-                    entityset=entityset,
-                    training_window=training_window,
-                    include_cutoff_time=include_cutoff_time,
-                )
-            else:
-                precalculated_features_trie = None
-
-            @save_csv_decorator(save_progress)
-            def calc_results(time_last, ids, precalculated_features=None, training_window=None, include_cutoff_time=True):
-                update_progress_callback = None
-
+    # the calculators of every cutoff time of the chunk share one thread pool
+    executor = None
+    if n_threads > 1:
+        # the thread running the calculator also calculates features
+        executor = ThreadPoolExecutor(n_threads - 1)
+    try:
+        if isinstance(cutoff_time, tuple):
+            update_progress_callback = None
+            if progress_bar is not None:
+                def update_progress_callback(done):
+                    previous_progress = progress_bar.n
+                    progress_bar.update(done * len(cutoff_time[1]))
+                    if progress_callback is not None:
+                        update, progress_percent, time_elapsed = update_progress_callback_parameters(progress_bar,
+                                                                                                     previous_progress)
+                        progress_callback(update, progress_percent, time_elapsed)
+
+            time_last = cutoff_time[0]
+            ids = cutoff_time[1]
+            _feature_matrix = run_calculator(time_last, ids, training_window,
+                                             update_progress_callback,
+                                             cache_key=time_last)
+            if isinstance(_feature_matrix, pd.DataFrame):
+                time_index = pd.Index([time_last] * len(ids), name='time')
+                _feature_matrix = _feature_matrix.set_index(time_index, append=True)
+            add_result(_feature_matrix)
+
+        elif approximate is None and training_window is None and \
+                save_progress is None and feature_cache is None and \
+                not pdtypes.is_categorical_dtype(cutoff_time['instance_id']) and \
+                (incremental_aggregations or cutoff_time[cutoff_df_time_var].nunique() > 1) and \
+                can_join_cutoff_times(feature_set, entityset, incremental_aggregations):
+            # calculate the features at all of the cutoff times of each piece
+            # of chunk_size cutoff times at once, in order of cutoff time
+            cutoff_time = cutoff_time.sort_values([cutoff_df_time_var, 'instance_id'],
+                                                  kind='mergesort')
+            num_cutoff_times = cutoff_time.shape[0]
+            piece_size = chunk_size or max(num_cutoff_times, 1)
+            for start in range(0, max(num_cutoff_times, 1), piece_size):
+                piece = cutoff_time.iloc[start:start + piece_size]
+                add_result(_join_cutoff_time_chunk(piece, feature_set, entityset,
+                                                   cutoff_df_time_var, pass_columns,
+                                                   include_cutoff_time,
+                                                   incremental_aggregations))
                 if progress_bar is not None:
-                    def update_progress_callback(done):
-                        previous_progress = progress_bar.n
-                        progress_bar.update(done * group.shape[0])
-                        if progress_callback is not None:
-                            update, progress_percent, time_elapsed = update_progress_callback_parameters(progress_bar,
-                                                                                                         previous_progress)
-                            progress_callback(update, progress_percent, time_elapsed)
-
-                calculator = FeatureSetCalculator(entityset,
-                                                  feature_set,
-                                                  time_last,
-                                                  training_window=training_window,
-                                                  precalculated_features=precalculated_features)
-                matrix = calculator.run(ids, progress_callback=update_progress_callback, include_cutoff_time=include_cutoff_time)
-
-                return matrix
-
-            # if all aggregations have been approximated, can calculate all together
-            if no_unapproximated_aggs and approximate is not None:
-                inner_grouped = [[group_time, group]]
-            else:
-                # if approximated features, set cutoff_time to unbinned time
-                if precalculated_features_trie is not None:
-                    group[cutoff_df_time_var] = group[target_time]
-
-                inner_grouped = group.groupby(cutoff_df_time_var, sort=True)
-
-            if chunk_size is not None:
-                inner_grouped = _chunk_dataframe_groups(inner_grouped, chunk_size)
+                    previous_progress = progress_bar.n
+                    progress_bar.update(piece.shape[0])
+                    if progress_callback is not None:
+                        update, progress_percent, time_elapsed = update_progress_callback_parameters(progress_bar,
+                                                                                                     previous_progress)
+                        progress_callback(update, progress_percent, time_elapsed)
 
-            for time_last, group in inner_grouped:
-                # sort group by instance id
-                ids = group['instance_id'].sort_values().values
-                if no_unapproximated_aggs and approximate is not None:
-                    window = None
-                else:
-                    window = training_window
-
-                # calculate values for those instances at time time_last
-                _feature_matrix = calc_results(time_last,
-                                               ids,
-                                               precalculated_features=precalculated_features_trie,
-                                               training_window=window,
-                                               include_cutoff_time=include_cutoff_time)
-
-                if isinstance(_feature_matrix, dd.DataFrame):
-                    id_name = _feature_matrix.columns[-1]
-                else:
-                    id_name = _feature_matrix.index.name
-
-                # if approximate, merge feature matrix with group frame to get original
-                # cutoff times and passed columns
-                if approximate:
-                    indexer = group[['instance_id', target_time] + pass_columns]
-                    _feature_matrix = indexer.merge(_feature_matrix,
-                                                    left_on=['instance_id'],
-                                                    right_index=True,
-                                                    how='left')
-                    _feature_matrix.set_index(['instance_id', target_time], inplace=True)
-                    _feature_matrix.index.set_names([id_name, 'time'], inplace=True)
-                    _feature_matrix.sort_index(level=1, kind='mergesort', inplace=True)
+        else:
+            # If approximating and the approximate features were not calculated
+            # for the whole run, calculate them for all groups of this chunk the
+            # first time they are needed, as every group may already be saved by
+            # an earlier run with the same save_progress
+            approximated_buckets = {}
+
+            def get_bucket_features(bucket):
+                if approximate is None:
+                    return None
+                if 'buckets' not in approximated_buckets:
+                    trie = approximated
+                    if trie is None:
+                        trie = approximate_features(
+                            feature_set,
+                            cutoff_time,
+                            window=approximate,
+                            entityset=entityset,
+                            training_window=training_window,
+                            include_cutoff_time=include_cutoff_time,
+                            incremental_aggregations=incremental_aggregations,
+                            n_threads=n_threads,
+                        )
+                    approximated_buckets['buckets'], approximated_buckets['empty'] = \
+                        _split_approximated_features(trie)
+                return approximated_buckets['buckets'].get(bucket, approximated_buckets['empty'])
+
+            for bucket, group in cutoff_time.groupby(cutoff_df_time_var):
+                def get_precalculated_features(bucket=bucket):
+                    return get_bucket_features(bucket)
+
+                fingerprint = save_progress_fingerprint
+                group_key = None
+                if approximate is not None and (save_progress is not None or feature_cache is not None):
+                    # the approximated features depend on all instances of the group
+                    group_key = tokenize(group[['instance_id', cutoff_df_time_var]])
+                    fingerprint = tokenize(fingerprint, group_key)
+
+                # when all aggregations are approximated, the cutoff time used is
+                # the time of the run
+                all_approximated = no_unapproximated_aggs and approximate is not None
+
+                @save_progress_decorator(save_progress,
+                                         fingerprint=fingerprint,
+                                         ignore_cutoff_time=all_approximated)
+                def calc_results(time_last, ids, training_window=None, include_cutoff_time=True):
+                    update_progress_callback = None
+
+                    if progress_bar is not None:
+                        def update_progress_callback(done):
+                            previous_progress = progress_bar.n
+                            progress_bar.update(done * group.shape[0])
+                            if progress_callback is not None:
+                                update, progress_percent, time_elapsed = update_progress_callback_parameters(progress_bar,
+                                                                                                             previous_progress)
+                                progress_callback(update, progress_percent, time_elapsed)
+
+                    cache_key = group_key if all_approximated else (group_key, time_last)
+                    return run_calculator(time_last, ids, training_window,
+                                          update_progress_callback,
+                                          get_precalculated_features=get_precalculated_features,
+                                          cache_key=cache_key)
+
+                # if all aggregations have been approximated, can calculate all together
+                if all_approximated:
+                    inner_grouped = [[group_time, group]]
                 else:
-                    # all rows have same cutoff time. set time and add passed columns
-                    num_rows = len(ids)
-                    if len(pass_columns) > 0:
-                        pass_through = group[['instance_id', cutoff_df_time_var] + pass_columns]
-                        pass_through.rename(columns={'instance_id': id_name,
-                                                     cutoff_df_time_var: 'time'},
-                                            inplace=True)
-                    if isinstance(_feature_matrix, pd.DataFrame):
-                        time_index = pd.Index([time_last] * num_rows, name='time')
-                        _feature_matrix = _feature_matrix.set_index(time_index, append=True)
+                    # if approximated features, set cutoff_time to unbinned time
+                    if approximate is not None:
+                        group = group.assign(**{cutoff_df_time_var: group[target_time]})
+
+                    inner_grouped = group.groupby(cutoff_df_time_var, sort=True)
+
+                if chunk_size is not None:
+                    inner_grouped = _chunk_dataframe_groups(inner_grouped, chunk_size)
+
+                for time_last, group in inner_grouped:
+                    # sort group by instance id
+                    ids = group['instance_id'].sort_values().values
+                    if no_unapproximated_aggs and approximate is not None:
+                        window = None
+                    else:
+                        window = training_window
+
+                    # calculate values for those instances at time time_last
+                    _feature_matrix = calc_results(time_last,
+                                                   ids,
+                                                   training_window=window,
+                                                   include_cutoff_time=include_cutoff_time)
+
+                    if isinstance(_feature_matrix, dd.DataFrame):
+                        id_name = _feature_matrix.columns[-1]
+                    else:
+                        id_name = _feature_matrix.index.name
+
+                    # if approximate, merge feature matrix with group frame to get original
+                    # cutoff times and passed columns
+                    if approximate and isinstance(_feature_matrix, dd.DataFrame):
+                        # the cutoff times are not kept, but each instance has a
+                        # row for each of its cutoff times in the group
+                        indexer = group[['instance_id'] + pass_columns]
+                        indexer = indexer.rename(columns={'instance_id': id_name})
+                        indexer = dd.from_pandas(indexer, npartitions=_feature_matrix.npartitions)
+                        _feature_matrix = _feature_matrix.merge(indexer, on=id_name, how='outer')
+                    elif approximate:
+                        indexer = group[['instance_id', target_time] + pass_columns]
+                        _feature_matrix = indexer.merge(_feature_matrix,
+                                                        left_on=['instance_id'],
+                                                        right_index=True,
+                                                        how='left')
+                        _feature_matrix.set_index(['instance_id', target_time], inplace=True)
+                        _feature_matrix.index.set_names([id_name, 'time'], inplace=True)
+                        _feature_matrix.sort_index(level=1, kind='mergesort', inplace=True)
+                    else:
+                        # all rows have same cutoff time. set time and add passed columns
+                        num_rows = len(ids)
                         if len(pass_columns) > 0:
-                            pass_through.set_index([id_name, 'time'], inplace=True)
-                            for col in pass_columns:
-                                _feature_matrix[col] = pass_through[col]
-                    elif isinstance(_feature_matrix, dd.DataFrame) and (len(pass_columns) > 0):
-                        _feature_matrix['time'] = time_last
-                        for col in pass_columns:
-                            pass_df = dd.from_pandas(pass_through[[id_name, 'time', col]], npartitions=_feature_matrix.npartitions)
+                            pass_through = group[['instance_id', cutoff_df_time_var] + pass_columns]
+                            pass_through.rename(columns={'instance_id': id_name,
+                                                         cutoff_df_time_var: 'time'},
+                                                inplace=True)
+                        if isinstance(_feature_matrix, pd.DataFrame):
+                            time_index = pd.Index([time_last] * num_rows, name='time')
+                            _feature_matrix = _feature_matrix.set_index(time_index, append=True)
+                            if len(pass_columns) > 0:
+                                pass_through.set_index([id_name, 'time'], inplace=True)
+                                for col in pass_columns:
+                                    _feature_matrix[col] = pass_through[col]
+                        elif isinstance(_feature_matrix, dd.DataFrame) and (len(pass_columns) > 0):
+                            # merge all of the passed columns at once
+                            _feature_matrix['time'] = time_last
+                            pass_df = dd.from_pandas(pass_through, npartitions=_feature_matrix.npartitions)
                             _feature_matrix = _feature_matrix.merge(pass_df, how="outer")
-                        _feature_matrix = _feature_matrix.drop(columns=['time'])
+                            _feature_matrix = _feature_matrix.drop(columns=['time'])
+
+                    add_result(_feature_matrix)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-                feature_matrix.append(_feature_matrix)
+    if output is not None:
+        return None
 
     if any(isinstance(fm, dd.DataFrame) for fm in feature_matrix):
         feature_matrix = dd.concat(feature_matrix)
@@ -469,14 +798,39 @@ def calculate_chunk(cutoff_time, chunk_size, feature_set, entityset, approximate
     return feature_matrix
 
 
+def _join_cutoff_time_chunk(cutoff_time, feature_set, entityset, cutoff_df_time_var,
+                            pass_columns, include_cutoff_time, incremental_aggregations):
+    """Calculate the feature matrix of a chunk of cutoff times with
+    join_cutoff_times, in the same order as calculating each cutoff time
+    separately."""
+    cutoff_time = cutoff_time.sort_values([cutoff_df_time_var, 'instance_id'],
+                                          kind='mergesort')
+    ids = cutoff_time['instance_id'].values
+    times = cutoff_time[cutoff_df_time_var].values
+    feature_matrix = join_cutoff_times(feature_set, entityset, ids, times,
+                                       include_cutoff_time=include_cutoff_time,
+                                       incremental_aggregations=incremental_aggregations)
+    id_name = entityset[feature_set.target_eid].index
+    feature_matrix.index = pd.MultiIndex.from_arrays([ids, times], names=[id_name, 'time'])
+    for col in pass_columns:
+        feature_matrix[col] = cutoff_time[col].values
+    return feature_matrix
+
+
 def approximate_features(feature_set, cutoff_time, window, entityset,
-                         training_window=None, include_cutoff_time=True):
+                         training_window=None, include_cutoff_time=True,
+                         incremental_aggregations=False, n_threads=1, n_jobs=1,
+                         backend='distributed', dask_kwargs=None, session=None,
+                         partition_entityset=False):
     '''Given a set of features and cutoff_times to be passed to
     calculate_feature_matrix, calculates approximate values of some features
     to speed up calculations.  Cutoff times are sorted into
     window-sized buckets and the approximate feature values are only calculated
     at one cutoff time for each bucket.
 
+    The approximate feature values of every bucket are calculated together, so
+    the values of each instance in each bucket are only calculated once.
+
 
     ..note:: this only approximates DirectFeatures of AggregationFeatures, on
         the target entity. In future versions, it may also be possible to
@@ -504,10 +858,44 @@ def approximate_features(feature_set, cutoff_time, window, entityset,
         include_cutoff_time (bool):
             If True, data at cutoff times are included in feature calculations.
 
+        incremental_aggregations (bool):
+            If True, aggregations with a mergeable state are calculated by merging
+            in only the data added since the previous cutoff time.
+
+        n_threads (int):
+            Number of threads to calculate the features of different entities
+            concurrently with.
+
+        n_jobs (int):
+            Number of parallel processes to calculate the approximate features
+            with. See calculate_feature_matrix.
+
+        backend (str):
+            How to calculate the approximate features in parallel. See
+            calculate_feature_matrix.
+
+        dask_kwargs (dict):
+            Dictionary of keyword arguments to be passed when creating the dask
+            client and scheduler. See calculate_feature_matrix.
+
+        session (ComputeSession):
+            Session to calculate the approximate features with. See
+            calculate_feature_matrix.
+
+        partition_entityset (bool):
+            Whether to send each chunk only the part of the entityset it uses.
+            See calculate_feature_matrix.
+
+    Returns:
+        Trie[RelationshipPath -> pd.DataFrame]: The approximate feature values
+            of each relationship path, indexed by the id of the instance at the
+            end of the path and the bucket of cutoff times.
     '''
     approx_fms_trie = Trie(path_constructor=RelationshipPath)
 
+    cutoff_time = cutoff_time[['instance_id', 'time']].copy()
     target_time_colname = 'target_time'
+    approx_bucket_colname = 'approx_bucket'
     cutoff_time[target_time_colname] = cutoff_time['time']
     approx_cutoffs = bin_cutoff_times(cutoff_time, window)
     cutoff_df_time_var = 'time'
@@ -529,6 +917,10 @@ def approximate_features(feature_set, cutoff_time, window, entityset,
 
         cutoffs_with_approx_e_ids = cutoffs_with_approx_e_ids[columns_we_want]
         cutoffs_with_approx_e_ids = cutoffs_with_approx_e_ids.drop_duplicates()
+        # there is at most one row for each cutoff time, so the cutoffs joined
+        # through Dask entities fit in memory
+        if isinstance(cutoffs_with_approx_e_ids, dd.DataFrame):
+            cutoffs_with_approx_e_ids = cutoffs_with_approx_e_ids.compute()
         cutoffs_with_approx_e_ids.dropna(subset=[new_approx_entity_index_var],
                                          inplace=True)
 
@@ -545,14 +937,31 @@ def approximate_features(feature_set, cutoff_time, window, entityset,
             cutoff_time_to_pass = cutoff_time_to_pass[[cutoff_df_instance_var, cutoff_df_time_var]]
 
             cutoff_time_to_pass.drop_duplicates(inplace=True)
+            # feature matrices of Dask entities do not keep the cutoff times,
+            # so pass the bucket of each row through as a column
+            is_dask = isinstance(entityset[approx_features[0].entity.id].df, dd.DataFrame)
+            if is_dask:
+                cutoff_time_to_pass[approx_bucket_colname] = cutoff_time_to_pass[cutoff_df_time_var]
             approx_fm = calculate_feature_matrix(approx_features,
                                                  entityset,
                                                  cutoff_time=cutoff_time_to_pass,
                                                  training_window=training_window,
                                                  approximate=None,
-                                                 cutoff_time_in_index=False,
-                                                 chunk_size=cutoff_time_to_pass.shape[0],
-                                                 include_cutoff_time=include_cutoff_time)
+                                                 cutoff_time_in_index=True,
+                                                 include_cutoff_time=include_cutoff_time,
+                                                 incremental_aggregations=incremental_aggregations,
+                                                 n_threads=n_threads,
+                                                 n_jobs=n_jobs,
+                                                 backend=backend,
+                                                 dask_kwargs=dask_kwargs,
+                                                 session=session,
+                                                 partition_entityset=partition_entityset)
+            if is_dask:
+                # the approximate values of each bucket are merged into the
+                # feature matrix of each chunk, so they are computed once
+                id_name = approx_features[0].entity.index
+                approx_fm = approx_fm.compute().set_index([id_name, approx_bucket_colname])
+                approx_fm.index.names = [id_name, cutoff_df_time_var]
 
         approx_fms_trie.get_node(relationship_path).value = approx_fm
 
@@ -568,33 +977,59 @@ def scatter_warning(num_scattered_workers, num_workers):
 def parallel_calculate_chunks(cutoff_time, chunk_size, feature_set, approximate, training_window,
                               save_progress, entityset, n_jobs, no_unapproximated_aggs,
                               cutoff_df_time_var, target_time, pass_columns,
-                              progress_bar, dask_kwargs=None, progress_callback=None, include_cutoff_time=True):
-    from dask.base import tokenize
-    from distributed import Future, as_completed
+                              progress_bar, dask_kwargs=None, progress_callback=None, include_cutoff_time=True,
+                              incremental_aggregations=False, output=None,
+                              save_progress_fingerprint=None, feature_cache=None,
+                              feature_cache_fingerprint=None, n_threads=1, approximated=None,
+                              session=None, partition_entityset=False):
+    from distributed import as_completed
 
     client = None
     cluster = None
     try:
-        client, cluster = create_client_and_cluster(n_jobs=n_jobs,
-                                                    dask_kwargs=dask_kwargs,
-                                                    entityset_size=entityset.__sizeof__())
         # scatter the entityset
         # denote future with leading underscore
         start = time.time()
-        es_token = "EntitySet-{}".format(tokenize(entityset))
-        if es_token in client.list_datasets():
-            msg = "Using EntitySet persisted on the cluster as dataset {}"
-            progress_bar.write(msg.format(es_token))
-            _es = client.get_dataset(es_token)
+        if partition_entityset:
+            # each chunk is sent its own part of the entityset after the
+            # chunks are made
+            if session is not None:
+                client = session.client
+            else:
+                client, cluster = create_client_and_cluster(n_jobs=n_jobs,
+                                                            dask_kwargs=dask_kwargs,
+                                                            entityset_size=0)
+        elif session is not None:
+            # the client and the entityset scattered by the session are
+            # reused by every call
+            client = session.client
+            _es, scattered = session.scatter_entityset(entityset)
+            if scattered:
+                progress_bar.write("Using EntitySet scattered by the session")
         else:
-            _es = client.scatter([entityset])[0]
-            client.publish_dataset(**{_es.key: _es})
+            client, cluster = create_client_and_cluster(n_jobs=n_jobs,
+                                                        dask_kwargs=dask_kwargs,
+                                                        entityset_size=entityset.__sizeof__())
+            es_token = "EntitySet-{}".format(tokenize(entityset))
+            if es_token in client.list_datasets():
+                msg = "Using EntitySet persisted on the cluster as dataset {}"
+                progress_bar.write(msg.format(es_token))
+                _es = client.get_dataset(es_token)
+            else:
+                _es = client.scatter([entityset])[0]
+                client.publish_dataset(**{_es.key: _es})
 
         # save features to a tempfile and scatter it
         pickled_feats = cloudpickle.dumps(feature_set)
         _saved_features = client.scatter(pickled_feats)
-        client.replicate([_es, _saved_features])
-        num_scattered_workers = len(client.who_has([Future(es_token)]).get(es_token, []))
+        to_replicate = [_saved_features]
+        if not partition_entityset:
+            to_replicate.append(_es)
+        _approximated = None
+        if approximated is not None:
+            _approximated = client.scatter([approximated])[0]
+            to_replicate.append(_approximated)
+        client.replicate(to_replicate)
         num_workers = len(client.scheduler_info()['workers'].values())
 
         if isinstance(cutoff_time, pd.DataFrame):
@@ -604,19 +1039,51 @@ def parallel_calculate_chunks(cutoff_time, chunk_size, feature_set, approximate,
             chunks = cutoff_time
             cutoff_time_len = len(cutoff_time[1])
 
-        if not chunk_size:
-            chunk_size = _handle_chunk_size(1.0 / num_workers, cutoff_time_len)
-
-        chunks = _chunk_dataframe_groups(chunks, chunk_size)
+        # Without a chunk size, chunks are sized while they are calculated.
+        # Saved progress and cached features are looked up by the cutoff
+        # times of each chunk, and partitions of the entityset are made for
+        # each chunk before it is calculated, so they use fixed chunks.
+        chunker = None
+        if not chunk_size and not partition_entityset and \
+                save_progress is None and feature_cache is None:
+            chunker = _AdaptiveChunker(cutoff_time, cutoff_df_time_var, num_workers)
+            # keep the workers busy while the chunks before are gathered
+            chunks = [chunker.next_chunk() for _ in range(2 * num_workers)]
+            chunks = [chunk for chunk in chunks if chunk is not None]
+        else:
+            if not chunk_size:
+                chunk_size = _handle_chunk_size(1.0 / num_workers, cutoff_time_len)
 
-        chunks = [df for _, df in chunks]
+            if partition_entityset:
+                chunks = list(_chunk_instances(cutoff_time, chunk_size))
+            else:
+                chunks = _chunk_dataframe_groups(chunks, chunk_size)
+                chunks = [df for _, df in chunks]
 
         if len(chunks) < num_workers:
             chunk_warning = "Fewer chunks ({}), than workers ({}) consider reducing the chunk size"
             warning_string = chunk_warning.format(len(chunks), num_workers)
             progress_bar.write(warning_string)
 
-        scatter_warning(num_scattered_workers, num_workers)
+        if partition_entityset:
+            # Scatter the rows of the entityset reachable from the instances
+            # of each chunk to a single worker, rather than every row to
+            # every worker. The chunk is calculated by the worker with its
+            # part of the entityset.
+            _partitions = []
+            partition_size = 0
+            for chunk in chunks:
+                if isinstance(chunk, tuple):
+                    instance_ids = chunk[1]
+                else:
+                    instance_ids = chunk['instance_id'].unique()
+                partition = get_entityset_partition(entityset, feature_set, instance_ids)
+                partition_size = max(partition_size, partition.__sizeof__())
+                _partitions.append(client.scatter([partition], hash=False)[0])
+            check_worker_memory(client, partition_size)
+        else:
+            num_scattered_workers = len(client.who_has([_es]).get(_es.key, []))
+            scatter_warning(num_scattered_workers, num_workers)
         end = time.time()
         scatter_time = round(end - start)
 
@@ -624,32 +1091,71 @@ def parallel_calculate_chunks(cutoff_time, chunk_size, feature_set, approximate,
         if not progress_bar.disable:
             progress_bar.reset()
 
-        scatter_string = "EntitySet scattered to {} workers in {} seconds"
-        progress_bar.write(scatter_string.format(num_scattered_workers, scatter_time))
+        if partition_entityset:
+            scatter_string = "EntitySet partitioned into {} chunks in {} seconds"
+            progress_bar.write(scatter_string.format(len(chunks), scatter_time))
+        else:
+            scatter_string = "EntitySet scattered to {} workers in {} seconds"
+            progress_bar.write(scatter_string.format(num_scattered_workers, scatter_time))
+
+        chunk_kwargs = dict(feature_set=_saved_features,
+                            chunk_size=None,
+                            approximate=approximate,
+                            training_window=training_window,
+                            save_progress=save_progress,
+                            no_unapproximated_aggs=no_unapproximated_aggs,
+                            cutoff_df_time_var=cutoff_df_time_var,
+                            target_time=target_time,
+                            pass_columns=pass_columns,
+                            progress_bar=None,
+                            progress_callback=progress_callback,
+                            include_cutoff_time=include_cutoff_time,
+                            incremental_aggregations=incremental_aggregations,
+                            n_threads=n_threads,
+                            save_progress_fingerprint=save_progress_fingerprint,
+                            feature_cache=feature_cache,
+                            feature_cache_fingerprint=feature_cache_fingerprint,
+                            approximated=_approximated)
         # map chunks
         # TODO: consider handling task submission dask kwargs
-        _chunks = client.map(calculate_chunk,
-                             chunks,
-                             feature_set=_saved_features,
-                             chunk_size=None,
-                             entityset=_es,
-                             approximate=approximate,
-                             training_window=training_window,
-                             save_progress=save_progress,
-                             no_unapproximated_aggs=no_unapproximated_aggs,
-                             cutoff_df_time_var=cutoff_df_time_var,
-                             target_time=target_time,
-                             pass_columns=pass_columns,
-                             progress_bar=None,
-                             progress_callback=progress_callback,
-                             include_cutoff_time=include_cutoff_time)
+        if partition_entityset:
+            _chunks = [client.submit(calculate_chunk, chunk, entityset=_partition, **chunk_kwargs)
+                       for chunk, _partition in zip(chunks, _partitions)]
+        elif chunker is not None:
+            _chunks = client.map(_calculate_timed_chunk, chunks, entityset=_es, **chunk_kwargs)
+        else:
+            _chunks = client.map(calculate_chunk, chunks, entityset=_es, **chunk_kwargs)
 
         feature_matrix = []
-        iterator = as_completed(_chunks).batches()
-        for batch in iterator:
+
+        # Chunks finish out of order, so when writing to output keep finished
+        # chunks until all of the chunks before them have been written.
+        chunk_positions = {future.key: i for i, future in enumerate(_chunks)}
+        finished = {}
+        next_position = 0
+
+        iterator = as_completed(_chunks)
+        for batch in iterator.batches():
             results = client.gather(batch)
-            for result in results:
-                feature_matrix.append(result)
+            for future, result in zip(batch, results):
+                if chunker is not None:
+                    # size the next chunk from the time taken by this one
+                    result, seconds = result
+                    chunker.add_timing(result.shape[0], seconds)
+                    chunk = chunker.next_chunk()
+                    if chunk is not None:
+                        _chunk = client.submit(_calculate_timed_chunk, chunk,
+                                               entityset=_es, **chunk_kwargs)
+                        chunk_positions[_chunk.key] = len(chunk_positions)
+                        iterator.add(_chunk)
+
+                if output is not None:
+                    finished[chunk_positions[future.key]] = result
+                    while next_position in finished:
+                        output(finished.pop(next_position))
+                        next_position += 1
+                else:
+                    feature_matrix.append(result)
                 previous_progress = progress_bar.n
                 progress_bar.update(result.shape[0])
                 if progress_callback is not None:
@@ -660,17 +1166,104 @@ def parallel_calculate_chunks(cutoff_time, chunk_size, feature_set, approximate,
     except Exception:
         raise
     finally:
-        if client is not None:
+        if client is not None and session is None:
             client.close()
 
-        if 'cluster' not in dask_kwargs and cluster is not None:
+        if session is None and 'cluster' not in dask_kwargs and cluster is not None:
             cluster.close()
 
+    if output is not None:
+        return None
+
     feature_matrix = pd.concat(feature_matrix)
 
     return feature_matrix
 
 
+# Arguments of calculate_chunk shared by the processes of a process pool. They
+# are set before the pool is created, so the forked processes inherit them
+# from the parent process rather than having them pickled for every chunk.
+_process_chunk_kwargs = {}
+
+
+def _calculate_process_chunk(positioned_chunk):
+    position, chunk = positioned_chunk
+    return position, calculate_chunk(chunk, **_process_chunk_kwargs)
+
+
+def process_calculate_chunks(cutoff_time, chunk_size, feature_set, approximate, training_window,
+                             save_progress, entityset, n_jobs, no_unapproximated_aggs,
+                             cutoff_df_time_var, target_time, pass_columns,
+                             progress_bar, progress_callback=None, include_cutoff_time=True,
+                             incremental_aggregations=False, output=None,
+                             save_progress_fingerprint=None, feature_cache=None,
+                             feature_cache_fingerprint=None, n_threads=1, approximated=None):
+    num_workers = n_jobs_to_workers(n_jobs)
+
+    if isinstance(cutoff_time, pd.DataFrame):
+        chunks = cutoff_time.groupby(cutoff_df_time_var)
+        cutoff_time_len = cutoff_time.shape[0]
+    else:
+        chunks = cutoff_time
+        cutoff_time_len = len(cutoff_time[1])
+
+    if not chunk_size:
+        chunk_size = _handle_chunk_size(1.0 / num_workers, cutoff_time_len)
+
+    chunks = [df for _, df in _chunk_dataframe_groups(chunks, chunk_size)]
+
+    _process_chunk_kwargs.update(feature_set=feature_set,
+                                 chunk_size=None,
+                                 entityset=entityset,
+                                 approximate=approximate,
+                                 training_window=training_window,
+                                 save_progress=save_progress,
+                                 no_unapproximated_aggs=no_unapproximated_aggs,
+                                 cutoff_df_time_var=cutoff_df_time_var,
+                                 target_time=target_time,
+                                 pass_columns=pass_columns,
+                                 include_cutoff_time=include_cutoff_time,
+                                 incremental_aggregations=incremental_aggregations,
+                                 n_threads=n_threads,
+                                 save_progress_fingerprint=save_progress_fingerprint,
+                                 feature_cache=feature_cache,
+                                 feature_cache_fingerprint=feature_cache_fingerprint,
+                                 approximated=approximated)
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(processes=min(num_workers, len(chunks))) as pool:
+            feature_matrix = []
+
+            # Chunks finish out of order, so when writing to output keep
+            # finished chunks until all of the chunks before them have been
+            # written.
+            finished = {}
+            next_position = 0
+
+            iterator = pool.imap_unordered(_calculate_process_chunk, enumerate(chunks))
+            for position, result in iterator:
+                if output is not None:
+                    finished[position] = result
+                    while next_position in finished:
+                        output(finished.pop(next_position))
+                        next_position += 1
+                else:
+                    feature_matrix.append(result)
+                previous_progress = progress_bar.n
+                progress_bar.update(result.shape[0])
+                if progress_callback is not None:
+                    update, progress_percent, time_elapsed = update_progress_callback_parameters(progress_bar,
+                                                                                                 previous_progress)
+                    progress_callback(update, progress_percent, time_elapsed)
+    finally:
+        _process_chunk_kwargs.clear()
+
+    if output is not None:
+        return None
+
+    return pd.concat(feature_matrix)
+
+
 def _add_approx_entity_index_var(es, target_entity_id, cutoffs, path):
     """
     Add a variable to the cutoff df linking it to the entity at the end of the
@@ -691,9 +1284,14 @@ def _add_approx_entity_index_var(es, target_entity_id, cutoffs, path):
         new_var_name = '%s.%s' % (last_child_var, relationship.child_variable.id)
         to_rename = {relationship.child_variable.id: new_var_name}
         child_df = child_df.rename(columns=to_rename)
-        cutoffs = cutoffs.merge(child_df,
-                                left_on=last_child_var,
-                                right_on=last_parent_var)
+        if isinstance(child_df, dd.DataFrame):
+            cutoffs = dd.merge(cutoffs, child_df,
+                               left_on=last_child_var,
+                               right_on=last_parent_var)
+        else:
+            cutoffs = cutoffs.merge(child_df,
+                                    left_on=last_child_var,
+                                    right_on=last_parent_var)
 
         # These will be used in the next iteration.
         last_child_var = new_var_name
@@ -713,6 +1311,186 @@ def _chunk_dataframe_groups(grouped, chunk_size):
                 yield group_key, group_df.iloc[i:i + chunk_size]
 
 
+def _calculate_timed_chunk(cutoff_time, **kwargs):
+    """Calculate a chunk, returning the feature matrix and the seconds taken."""
+    start = time.time()
+    feature_matrix = calculate_chunk(cutoff_time, **kwargs)
+    return feature_matrix, time.time() - start
+
+
+class _AdaptiveChunker(object):
+    """
+    Splits cutoff times into chunks which each take about target_seconds to
+    calculate, based on the time taken by the chunks calculated so far.
+
+    The cutoff times are sorted by time and split into consecutive chunks, so
+    many cutoff times with few instances are calculated by a single chunk
+    rather than a chunk each. The first chunks have at most
+    ADAPTIVE_INITIAL_CHUNK_SIZE cutoff times. Later chunks are sized by the
+    average number of seconds taken per cutoff time, and are never larger
+    than an equal share of the remaining cutoff times between the workers,
+    so the last chunks finish at about the same time. No chunk is smaller than
+    an equal share of the first chunk between the workers, and cutoff times
+    left over after a chunk which are fewer than that are added to the chunk,
+    so the last chunks are not split into many chunks of a few cutoff times.
+    """
+
+    def __init__(self, cutoff_time, cutoff_df_time_var, num_workers,
+                 target_seconds=ADAPTIVE_CHUNK_SECONDS):
+        if isinstance(cutoff_time, tuple):
+            self._time_last, self._rows = cutoff_time
+        else:
+            self._time_last = None
+            self._rows = cutoff_time.sort_values([cutoff_df_time_var, 'instance_id'],
+                                                 kind='mergesort')
+        self.num_workers = num_workers
+        self.target_seconds = target_seconds
+        initial_size = min(ADAPTIVE_INITIAL_CHUNK_SIZE, math.ceil(len(self._rows) / num_workers))
+        self.min_chunk_size = max(math.ceil(initial_size / num_workers), 1)
+        self._position = 0
+        self._rows_timed = 0
+        self._seconds = 0
+
+    def add_timing(self, num_rows, seconds):
+        """Record the seconds taken to calculate a chunk of num_rows cutoff times."""
+        self._rows_timed += num_rows
+        self._seconds += seconds
+
+    def chunk_size(self):
+        """The number of cutoff times to put in the next chunk."""
+        remaining = len(self._rows) - self._position
+        max_size = max(math.ceil(remaining / self.num_workers), 1)
+        if not self._rows_timed:
+            size = min(ADAPTIVE_INITIAL_CHUNK_SIZE, max_size)
+        elif not self._seconds:
+            size = max_size
+        else:
+            seconds_per_row = self._seconds / self._rows_timed
+            size = min(int(self.target_seconds / seconds_per_row), max_size)
+
+        size = max(size, self.min_chunk_size)
+        if remaining - size < self.min_chunk_size:
+            size = remaining
+        return size
+
+    def next_chunk(self):
+        """Get the next chunk of cutoff times, or None if there are none left."""
+        if self._position >= len(self._rows):
+            return None
+
+        end = self._position + self.chunk_size()
+        rows = self._rows.iloc[self._position:end]
+        self._position = end
+        if self._time_last is not None:
+            return self._time_last, rows
+        return rows
+
+
+def _chunk_instances(cutoff_time, chunk_size):
+    """
+    Chunks cutoff times by instance, so all cutoff times of an instance are in
+    the same chunk. Each instance is put in the chunk its first cutoff time
+    would be in if the cutoff times were grouped by instance, so a chunk has
+    more than chunk_size cutoff times only if its last instance has many.
+    """
+    if isinstance(cutoff_time, tuple):
+        time_last, instance_ids = cutoff_time
+        for i in range(0, len(instance_ids), chunk_size):
+            yield time_last, instance_ids.iloc[i:i + chunk_size]
+    else:
+        codes, _ = pd.factorize(cutoff_time['instance_id'])
+        counts = np.bincount(codes)
+        # the chunk of each instance is the number of cutoff times of the
+        # instances before it divided by the chunk size
+        instance_chunks = (np.cumsum(counts) - counts) // chunk_size
+        for _, chunk in cutoff_time.groupby(instance_chunks[codes], sort=True):
+            yield chunk
+
+
+@contextmanager
+def _get_approximation_session(session, approximate, backend, n_jobs, dask_kwargs):
+    """
+    Get the session to calculate a feature matrix with. When approximating on
+    a dask cluster which is created for the run, a session is kept for the
+    whole run, so the approximate features of every relationship path and the
+    chunks are calculated on one cluster rather than each creating their own.
+    A cluster given in dask_kwargs is already shared by every calculation.
+    """
+    dask_kwargs = dask_kwargs or {}
+    if session is not None or approximate is None or backend != 'distributed' or \
+            (n_jobs == 1 and not dask_kwargs) or 'cluster' in dask_kwargs:
+        yield session
+        return
+
+    with ComputeSession(n_jobs=n_jobs, dask_kwargs=dask_kwargs) as session:
+        yield session
+
+
+def _split_approximated_features(approximated):
+    """
+    Split the approximate feature values of all buckets of cutoff times into a
+    trie for each bucket, indexed by instance id like the precalculated
+    features of FeatureSetCalculator.
+
+    Returns a dictionary mapping each bucket to its trie, and a trie of empty
+    dataframes to use for buckets without any approximate feature values.
+    """
+    buckets = {}
+    empty = Trie(path_constructor=RelationshipPath)
+    for path, approx_fm in approximated:
+        if approx_fm is None:
+            continue
+        if isinstance(approx_fm.index, pd.MultiIndex):
+            for bucket, bucket_fm in approx_fm.groupby(level='time', sort=False):
+                if bucket not in buckets:
+                    buckets[bucket] = Trie(path_constructor=RelationshipPath)
+                buckets[bucket].get_node(path).value = bucket_fm.droplevel('time')
+            approx_fm = approx_fm.iloc[:0].droplevel('time')
+        empty.get_node(path).value = approx_fm
+
+    # paths without values in a bucket get empty values
+    for trie in buckets.values():
+        for path, approx_fm in empty:
+            node = trie.get_node(path)
+            if approx_fm is not None and node.value is None:
+                node.value = approx_fm
+
+    return buckets, empty
+
+
+def _get_chunk_writer(output, cutoff_time_in_index):
+    """Get a function which writes each chunk of the feature matrix to the
+    output, or None if the feature matrix is not written to an output."""
+    if output is None:
+        return None
+
+    write_output = _get_output_writer(output)
+
+    def write_chunk(chunk):
+        if not cutoff_time_in_index:
+            chunk = chunk.reset_index(level='time', drop=True)
+        write_output(chunk)
+
+    return write_chunk
+
+
+def _get_output_writer(output):
+    """Get a function which writes a part of the feature matrix to output."""
+    if callable(output):
+        return output
+
+    os.makedirs(output, exist_ok=True)
+    part_number = 0
+
+    def write_parquet(feature_matrix):
+        nonlocal part_number
+        path = os.path.join(output, 'part-{:05d}.parquet'.format(part_number))
+        feature_matrix.to_parquet(path)
+        part_number += 1
+
+    return write_parquet
+
+
 def _handle_chunk_size(chunk_size, total_size):
     if chunk_size is not None:
         assert chunk_size > 0, "Chunk size must be greater than 0"
@@ -0,0 +1,101 @@
+import pandas as pd
+
+
+class ColumnStore(object):
+    """
+    Collects the feature columns calculated for an entity without copying the
+    dataframe for every group of features.
+
+    Adding a column to a pandas dataframe with ``assign`` or ``merge`` copies
+    all of its existing columns, so calculating many groups of features copies
+    the dataframe once per group. The column store keeps the original
+    dataframe untouched and holds the new columns separately, aligned to the
+    index of the original dataframe. The columns are only put together into a
+    single dataframe once, by calling ``to_frame``.
+
+    The store supports the subset of the dataframe interface used by the
+    feature calculators: getting and setting columns, ``columns``, ``index``,
+    ``empty``, ``shape``, ``assign`` and ``fillna``.
+    """
+
+    def __init__(self, df):
+        """
+        Args:
+            df (pd.DataFrame): The dataframe to add feature columns to.
+        """
+        self._df = df
+        self._columns = {}
+
+    @property
+    def index(self):
+        return self._df.index
+
+    @property
+    def columns(self):
+        new_columns = [name for name in self._columns if name not in self._df.columns]
+        return self._df.columns.append(pd.Index(new_columns, dtype=object))
+
+    @property
+    def empty(self):
+        return len(self.index) == 0 or len(self.columns) == 0
+
+    @property
+    def shape(self):
+        return (len(self.index), len(self.columns))
+
+    def __contains__(self, name):
+        return name in self._columns or name in self._df.columns
+
+    def __getitem__(self, key):
+        if isinstance(key, list):
+            return pd.DataFrame({name: self[name] for name in key},
+                                index=self.index, columns=key)
+
+        if key in self._columns:
+            return self._columns[key]
+
+        return self._df[key]
+
+    def __setitem__(self, name, values):
+        if isinstance(values, pd.Series):
+            if not values.index.equals(self.index):
+                values = values.reindex(self.index)
+            values = pd.Series(values, name=name)
+        else:
+            values = pd.Series(values, index=self.index, name=name)
+
+        self._columns[name] = values
+
+    def assign(self, **columns):
+        """Add the given columns to the store, returning the store."""
+        for name, values in columns.items():
+            self[name] = values
+
+        return self
+
+    def fillna(self, value):
+        """Fill missing values of columns in the store in place, returning
+        the store. Takes a dictionary mapping column names to fill values."""
+        for name, fill_value in value.items():
+            if name in self:
+                self[name] = self[name].fillna(fill_value)
+
+        return self
+
+    def to_frame(self):
+        """Get a dataframe of the original columns and all added columns."""
+        if not self._columns:
+            return self._df
+
+        df = self._df
+        replaced = [name for name in self._columns if name in df.columns]
+        if replaced:
+            df = df.drop(columns=replaced)
+
+        new_columns = pd.DataFrame({name: values.array for name, values in self._columns.items()},
+                                   index=self.index)
+        df = pd.concat([df, new_columns], axis=1)
+        if replaced:
+            # replaced columns keep their position in the original dataframe
+            df = df[self.columns]
+        return df
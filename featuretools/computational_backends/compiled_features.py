@@ -0,0 +1,129 @@
+from dask.base import tokenize
+
+from featuretools.computational_backends.feature_set import FeatureSet
+from featuretools.computational_backends.utils import (
+    gather_approximate_features
+)
+from featuretools.feature_base import AggregationFeature, FeatureBase
+
+
+class CompiledFeatures(object):
+    """
+    Features which have been prepared for calculation, so that they can be
+    calculated many times without repeating the work of planning how to
+    calculate them. Created with :func:`compile_features`.
+
+    The feature sets and execution plans are built once, the first time they
+    are needed, and then reused by every call to calculate_feature_matrix the
+    compiled features are passed to. Compiled features can be pickled along with
+    everything which has been built, to reuse them in other processes.
+    """
+
+    def __init__(self, features, entityset=None):
+        """
+        Args:
+            features (list[:class:`.FeatureBase`]): Feature definitions to be
+                calculated.
+
+            entityset (EntitySet, optional): The entityset, or the metadata of
+                the entityset, the features will be calculated on. If given,
+                calculating the features on an entityset with different
+                metadata raises an error.
+        """
+        self.features = features
+        self.entityset_token = None
+        if entityset is not None:
+            self.entityset_token = tokenize(entityset)
+
+        # Maps whether features are approximated to a tuple of (FeatureSet,
+        # whether there are no aggregations which are not approximated).
+        self._feature_sets = {}
+
+    def get_feature_set(self, approximate=False):
+        """
+        Get the feature set of the features, with the execution plan built.
+
+        Args:
+            approximate (bool): If True, the feature set ignores features
+                which can be approximated.
+
+        Returns:
+            (FeatureSet, bool): The feature set, and whether none of the
+                aggregation features it calculates are approximated.
+        """
+        if approximate not in self._feature_sets:
+            feature_set = FeatureSet(self.features)
+
+            # Get features to approximate
+            if approximate:
+                approximate_feature_trie = gather_approximate_features(feature_set)
+                # Make a new FeatureSet that ignores approximated features
+                feature_set = FeatureSet(self.features,
+                                         approximate_feature_trie=approximate_feature_trie)
+
+            feature_set.build_execution_plan()
+            self._feature_sets[approximate] = (feature_set,
+                                               _no_unapproximated_aggs(feature_set, approximate))
+
+        return self._feature_sets[approximate]
+
+    def check_entityset(self, entityset):
+        """Raise an error if the features were compiled for an entityset with
+        different metadata."""
+        if self.entityset_token is not None and self.entityset_token != tokenize(entityset):
+            raise ValueError("Features were compiled for an entityset with different metadata")
+
+
+def compile_features(features, entityset=None):
+    """
+    Prepare features for calculation, so that they can be passed to
+    calculate_feature_matrix many times without repeating the work of planning
+    how to calculate them. This is useful when the same features are
+    calculated over and over, for example to score new data.
+
+    Args:
+        features (list[:class:`.FeatureBase`]): Feature definitions to be
+            calculated.
+
+        entityset (EntitySet, optional): The entityset, or the metadata of the
+            entityset, the features will be calculated on. If given,
+            calculating the features on an entityset with different metadata
+            raises an error.
+
+    Returns:
+        :class:`.CompiledFeatures`: Compiled features which can be passed to
+            calculate_feature_matrix in place of the list of features.
+
+    Examples:
+        .. code-block:: python
+
+            compiled = ft.compile_features(features, es.metadata)
+            fm = ft.calculate_feature_matrix(compiled, es, cutoff_time=cutoff_time)
+    """
+    assert (isinstance(features, list) and features != [] and
+            all([isinstance(feature, FeatureBase) for feature in features])), \
+        "features must be a non-empty list of features"
+
+    return CompiledFeatures(features, entityset=entityset)
+
+
+def _no_unapproximated_aggs(feature_set, approximate):
+    """Check that there are no aggregation features which are not approximated."""
+    if approximate:
+        all_approx_features = {f for _, feats in feature_set.approximate_feature_trie
+                               for f in feats}
+    else:
+        all_approx_features = set()
+
+    for feature in feature_set.target_features:
+        if isinstance(feature, AggregationFeature):
+            # do not need to check if feature is in to_approximate since
+            # only base features of direct features can be in to_approximate
+            return False
+
+        deps = feature.get_dependencies(deep=True, ignored=all_approx_features)
+        for dependency in deps:
+            if isinstance(dependency, AggregationFeature):
+                return False
+
+    return True
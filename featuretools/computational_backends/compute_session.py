@@ -0,0 +1,93 @@
+from featuretools.computational_backends.utils import (
+    check_worker_memory,
+    create_client_and_cluster,
+    get_entityset_token
+)
+
+
+class ComputeSession(object):
+    """
+    Keeps a dask distributed cluster and an entityset scattered to its
+    workers, so they can be reused by successive calls to
+    calculate_feature_matrix.
+
+    Without a session, each call to calculate_feature_matrix with ``n_jobs``
+    or ``dask_kwargs`` creates a client, scatters the entityset to every
+    worker and closes the client again. A session only scatters an
+    entityset the first time it is used. The scattered entityset is kept
+    under a token of its metadata and data, so if the entityset is changed,
+    the changed entityset is scattered in place of it by the next call.
+
+    Examples:
+        .. code-block:: python
+
+            with ft.ComputeSession(es, n_jobs=4) as session:
+                for cutoff_time in cutoff_times:
+                    fm = ft.calculate_feature_matrix(features, es,
+                                                     cutoff_time=cutoff_time,
+                                                     session=session)
+    """
+
+    def __init__(self, entityset=None, n_jobs=-1, dask_kwargs=None):
+        """
+        Args:
+            entityset (EntitySet, optional): Entityset to scatter to the
+                workers when the session is created. If None, entitysets are
+                scattered when they are first used.
+
+            n_jobs (int, optional): Number of workers of the cluster. Defaults
+                to -1, which uses all of the available cores.
+
+            dask_kwargs (dict, optional): Dictionary of keyword arguments to be
+                passed when creating the dask client and scheduler. See
+                calculate_feature_matrix.
+        """
+        dask_kwargs = dict(dask_kwargs or {})
+        self._external_cluster = 'cluster' in dask_kwargs
+        # the memory of the workers is checked for each scattered entityset
+        self.client, self.cluster = create_client_and_cluster(n_jobs=n_jobs,
+                                                              dask_kwargs=dask_kwargs,
+                                                              entityset_size=0)
+        self._entityset_token = None
+        self._entityset_future = None
+        if entityset is not None:
+            self.scatter_entityset(entityset)
+
+    def scatter_entityset(self, entityset):
+        """
+        Get a future of the entityset on the workers of the cluster,
+        scattering it to every worker if it has not been scattered yet.
+
+        Args:
+            entityset (EntitySet): The entityset to scatter.
+
+        Returns:
+            tuple(distributed.Future, bool): The future of the entityset, and
+                whether it was already scattered by the session.
+        """
+        token = get_entityset_token(entityset)
+        if token == self._entityset_token:
+            return self._entityset_future, True
+
+        check_worker_memory(self.client, entityset.__sizeof__())
+        # tokenizing an entityset only uses its metadata, so the changed
+        # entityset would be given the same key as the one scattered before
+        future = self.client.scatter([entityset], broadcast=True, hash=False)[0]
+        # the entityset scattered before is released from the workers
+        self._entityset_token = token
+        self._entityset_future = future
+        return future, False
+
+    def close(self):
+        """Close the client, and the cluster if it was created by the session."""
+        self._entityset_token = None
+        self._entityset_future = None
+        self.client.close()
+        if not self._external_cluster and self.cluster is not None:
+            self.cluster.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,636 @@
+import warnings
+
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from featuretools import variable_types
+from featuretools.computational_backends.feature_set_calculator import can_agg
+from featuretools.feature_base import AggregationFeature, IdentityFeature
+
+# maximum number of child rows tagged with their pairs at once
+MAX_TAGGED_ROWS = 10 ** 7
+
+# names of the columns of the pairs of instance and cutoff time in the lazy
+# feature matrix of Dask entities, which are unlikely to be variable names
+PAIR_ID = '_pair_instance_id'
+PAIR_TIME = '_pair_cutoff_time'
+PAIR_EXISTS = '_pair_instance_exists'
+
+
+def can_join_cutoff_times(feature_set, entityset, incremental_aggregations=True):
+    """
+    Whether the features can be calculated for many pairs of instance and
+    cutoff time at once with :func:`join_cutoff_times`.
+
+    This is possible when every target feature is either an identity feature
+    of the target entity, or an aggregation of a variable of a child of the
+    target entity which is calculated by its primitive's function, or if
+    incremental_aggregations is True, whose primitive has a state which can be
+    accumulated. The child entities must be sorted by their time index.
+    """
+    if any(not isinstance(entity.df, pd.DataFrame) for entity in entityset.entities):
+        return False
+
+    target_entity = entityset[feature_set.target_eid]
+    for feature in feature_set.target_features:
+        if isinstance(feature, IdentityFeature):
+            if feature.entity.id != target_entity.id:
+                return False
+        elif not isinstance(feature, AggregationFeature) or \
+                not _can_join_aggregation(feature, incremental_aggregations):
+            return False
+
+    return True
+
+
+def _can_join_aggregation(feature, incremental_aggregations):
+    if len(feature.relationship_path) != 1 or len(feature.base_features) != 1:
+        return False
+    if feature.number_output_features != 1:
+        return False
+
+    child_entity = feature.relationship_path[0][1].child_entity
+    if child_entity.time_index is not None and not child_entity._time_index_is_sorted():
+        return False
+    if not _uses_child_variables(feature):
+        return False
+
+    if incremental_aggregations and _can_accumulate(feature):
+        return True
+    return can_agg(feature)
+
+
+def _uses_child_variables(feature):
+    """Whether the aggregation only uses variables of the child entity which
+    are not masked by a secondary time index."""
+    child_entity = feature.relationship_path[0][1].child_entity
+    variables = [feature.base_features[0]]
+    if feature.where is not None:
+        variables.append(feature.where)
+
+    masked = {col for cols in child_entity.secondary_time_index.values()
+              for col in cols}
+    for variable in variables:
+        if not isinstance(variable, IdentityFeature) or \
+                variable.entity.id != child_entity.id or \
+                variable.variable.id in masked:
+            return False
+
+    return True
+
+
+def _can_accumulate(feature):
+    aggregation = feature.get_incremental_aggregation()
+    if aggregation is None or aggregation.accumulate is None:
+        return False
+    if feature.relationship_path[0][1].child_entity.time_index is None:
+        return False
+    # The state of the rows before the start of a use_previous window is
+    # removed from the state of the rows before the cutoff time.
+    if feature.use_previous is not None:
+        if not feature.use_previous.has_no_observations() or \
+                aggregation.subtract is None:
+            return False
+
+    return True
+
+
+def join_cutoff_times(feature_set, entityset, instance_ids, times, include_cutoff_time=True,
+                      incremental_aggregations=True):
+    """
+    Calculate features for many pairs of instance and cutoff time at once,
+    rather than calculating the features separately at each cutoff time.
+
+    The child rows of each aggregation are joined to the cutoff times of their
+    parent instance. If incremental_aggregations is True and the state of the
+    aggregation can be accumulated, the rows and cutoff times are sorted
+    together by parent and time, each row is assigned to the first cutoff
+    time at or after it, and the states of the rows assigned to each cutoff
+    time are accumulated over the cutoff times of each parent. Otherwise each
+    row is tagged with every pair which uses it, and the aggregation is
+    calculated by grouping the tagged rows by pair. The features must pass
+    :func:`can_join_cutoff_times`.
+
+    Args:
+        feature_set (FeatureSet): The features to calculate.
+
+        entityset (EntitySet): The entityset to calculate the features on.
+
+        instance_ids (np.ndarray): Id of the instance of each pair.
+
+        times (np.ndarray): Cutoff time of each pair.
+
+        include_cutoff_time (bool): If True, data at the cutoff times are
+            included in calculating features.
+
+        incremental_aggregations (bool): If True, aggregations whose state can
+            be accumulated are calculated by accumulating their states.
+
+    Returns:
+        pd.DataFrame: The feature values, with a row for each pair in the
+            order they were given.
+    """
+    target_entity = entityset[feature_set.target_eid]
+    target_df = target_entity.df
+    instance_ids = pd.Index(instance_ids)
+    times = np.asarray(times)
+
+    # instances which were not created by the cutoff time get default values
+    exists = instance_ids.isin(target_df.index)
+    if target_entity.time_index is not None:
+        created = target_df[target_entity.time_index].reindex(instance_ids).values
+        exists &= _compare_to_cutoffs(created, times, include_cutoff_time)
+
+    masked = {}
+    for secondary_time_index, columns in target_entity.secondary_time_index.items():
+        secondary_times = target_df[secondary_time_index].reindex(instance_ids).values
+        for column in columns:
+            masked[column] = secondary_times >= times
+
+    # aggregations of the same rows are calculated from the same tagged rows
+    tagged_groups = {}
+    for feature in feature_set.target_features:
+        if isinstance(feature, AggregationFeature) and \
+                not (incremental_aggregations and _can_accumulate(feature)):
+            where = None if feature.where is None else feature.where.get_name()
+            use_previous = None if feature.use_previous is None else feature.use_previous.get_name()
+            key = (feature.relationship_path[0][1], where, use_previous)
+            tagged_groups.setdefault(key, []).append(feature)
+
+    tagged = {}
+    for features in tagged_groups.values():
+        tagged.update(_aggregate_tagged_rows(features, instance_ids, times,
+                                             include_cutoff_time))
+
+    columns = {}
+    for feature in feature_set.target_features:
+        name = feature.get_name()
+        if isinstance(feature, IdentityFeature):
+            values = target_df[feature.variable.id].reindex(instance_ids).values
+            values = pd.Series(values).where(exists)
+            if feature.variable.id in masked:
+                values = values.mask(masked[feature.variable.id])
+        else:
+            if name in tagged:
+                values = tagged[name]
+            else:
+                values = _aggregate_at_cutoffs(feature, instance_ids, times,
+                                               include_cutoff_time)
+            values = _cast_like_calculator(values, exists, times, feature)
+        columns[name] = values.values
+
+    return pd.DataFrame(columns, columns=[f.get_name() for f in feature_set.target_features])
+
+
+def _calculator_dtype(feature):
+    """
+    Get the dtype the calculator gives the values of an aggregation feature
+    at a cutoff time, by aggregating a child row with the primitive's
+    function the same way.
+    """
+    child_df = feature.relationship_path[0][1].child_entity.df
+    sample = child_df[feature.base_features[0].get_name()].iloc[:1]
+    func = feature.get_function()
+    if func == pd.Series.count:
+        func = "count"
+    dtype = sample.groupby(np.zeros(len(sample))).agg(func).dtype
+
+    # like the calculator, convert boolean values of numeric features to floats
+    if feature.variable_type == variable_types.Numeric and \
+            dtype.name in ['object', 'bool']:
+        return np.dtype(float)
+    return dtype
+
+
+def _cast_like_calculator(values, exists, times, feature):
+    """
+    Fill the values of an aggregation which are missing with its default
+    value, and cast the values to the dtype they have when the feature matrix
+    of each cutoff time is calculated separately and the feature matrices are
+    concatenated.
+
+    At a cutoff time, the calculator gives the instances with child rows
+    values of the dtype of its aggregation, and the instances without child
+    rows missing values, which upcast the values of the other instances
+    before they are filled. The instances which don't exist yet are given a
+    frame of default values. So the dtype of the feature matrix of each
+    cutoff time depends on which kinds of instances it has.
+    """
+    no_rows = pd.Series(exists & values.isnull().values)
+    values = values.where(exists).fillna(feature.default_value)
+    dtype = _calculator_dtype(feature)
+    if exists.all() and not no_rows.any():
+        return values.astype(dtype)
+
+    kinds = pd.DataFrame({'rows': exists & ~no_rows.values,
+                          'no_rows': no_rows.values,
+                          'new': ~exists})
+    kinds = kinds.groupby(times).any().drop_duplicates()
+    valid = values[(exists & ~no_rows.values)].values[:1]
+    example = pd.Series(valid if len(valid) else [feature.default_value]).astype(dtype)
+
+    examples = []
+    for has_rows, has_no_rows, has_new in kinds.itertuples(index=False):
+        if has_rows and has_no_rows:
+            examples.append(example.reindex([0, 1]).fillna(feature.default_value))
+        elif has_rows:
+            examples.append(example)
+        elif has_no_rows:
+            examples.append(pd.Series([np.nan]).fillna(feature.default_value))
+        if has_new:
+            examples.append(pd.Series([feature.default_value]))
+
+    with warnings.catch_warnings():
+        # the feature matrices of the cutoff times are concatenated with the
+        # same deprecated upcasting of booleans concatenated with numbers
+        warnings.simplefilter('ignore', FutureWarning)
+        return values.astype(pd.concat(examples).dtype)
+
+
+def _aggregate_at_cutoffs(feature, instance_ids, times, include_cutoff_time):
+    """
+    Calculate an aggregation feature for each pair of instance and cutoff
+    time. Returns a pd.Series with the value of each pair by position, which
+    is null for pairs without any child rows.
+    """
+    relationship = feature.relationship_path[0][1]
+    child_entity = relationship.child_entity
+    aggregation = feature.get_incremental_aggregation()
+
+    child_df = child_entity.df
+    if feature.where is not None:
+        child_df = child_df.loc[child_df[feature.where.get_name()]]
+
+    # only the children of the given instances are needed
+    parents = instance_ids.unique()
+    row_parents = parents.get_indexer(child_df[relationship.child_variable.id])
+    keep = row_parents >= 0
+    row_parents = row_parents[keep]
+    row_times = child_df[child_entity.time_index].values[keep]
+    values = child_df[feature.base_features[0].get_name()][keep]
+
+    num_pairs = len(instance_ids)
+    if not len(values):
+        return pd.Series(np.nan, index=range(num_pairs))
+
+    # Each pair has a bound at its cutoff time, and another bound at the start
+    # of the use_previous window. Rows at the same time as a bound are sorted
+    # after it, unless they are included at the cutoff time.
+    pair_parents = parents.get_indexer(instance_ids)
+    bound_parents = [pair_parents]
+    bound_times = [times]
+    bound_ties = [np.full(num_pairs, 1 if include_cutoff_time else -1)]
+    if feature.use_previous is not None:
+        unique_times, time_codes = np.unique(times, return_inverse=True)
+        window_starts = [t - feature.use_previous for t in pd.Series(unique_times)]
+        window_starts = pd.Series(window_starts).values.astype(times.dtype)
+        bound_parents.append(pair_parents)
+        bound_times.append(window_starts[time_codes])
+        bound_ties.append(np.full(num_pairs, -1))
+
+    num_rows = len(values)
+    order = np.lexsort((np.concatenate([np.zeros(num_rows, dtype=int)] + bound_ties),
+                        np.concatenate([row_times] + bound_times),
+                        np.concatenate([row_parents] + bound_parents)))
+    is_bound = order >= num_rows
+    # the number of bounds sorted before each row and bound
+    ranks = np.cumsum(is_bound) - is_bound
+    sorted_bound_parents = np.concatenate(bound_parents)[order[is_bound] - num_rows]
+
+    # Each row is assigned to the next bound, unless the next bound belongs to
+    # another parent, in which case the row is after all bounds of its parent.
+    row_order = order[~is_bound]
+    row_ranks = ranks[~is_bound]
+    next_bound_parents = np.append(sorted_bound_parents, -1)[row_ranks]
+    assigned = next_bound_parents == row_parents[row_order]
+    if not assigned.any():
+        return pd.Series(np.nan, index=range(num_pairs))
+
+    grouped = values.iloc[row_order[assigned]].groupby(row_ranks[assigned], sort=True)
+    state = aggregation.chunk(grouped)
+    state_ranks = state.index.values
+    state = aggregation.accumulate(state, sorted_bound_parents[state_ranks])
+
+    # The state at each bound is the accumulated state of the last bound at or
+    # before it with any rows, if that bound belongs to the same parent.
+    bound_ranks = np.arange(len(sorted_bound_parents))
+    positions = np.searchsorted(state_ranks, bound_ranks, side='right') - 1
+    valid = positions >= 0
+    valid[valid] = sorted_bound_parents[state_ranks[positions[valid]]] == \
+        sorted_bound_parents[valid]
+    bound_states = state.iloc[positions[valid]]
+    bound_states.index = order[is_bound][valid] - num_rows
+
+    pair_states = bound_states[bound_states.index < num_pairs]
+    if feature.use_previous is not None:
+        window_states = bound_states[bound_states.index >= num_pairs]
+        window_states.index = window_states.index - num_pairs
+        pair_states = aggregation.subtract(pair_states, window_states)
+
+    return aggregation.finalize(pair_states).reindex(range(num_pairs))
+
+
+def _aggregate_tagged_rows(features, instance_ids, times, include_cutoff_time):
+    """
+    Calculate aggregation features of the same child rows for each pair of
+    instance and cutoff time, by tagging each child row with every pair whose
+    cutoff time and use_previous window include it, and grouping the tagged
+    rows by pair. Returns a dictionary of pd.Series with the value of each
+    pair by position, which are null for pairs without any child rows.
+    """
+    feature = features[0]
+    relationship = feature.relationship_path[0][1]
+    child_entity = relationship.child_entity
+    time_index = child_entity.time_index
+    use_previous = feature.use_previous
+
+    child_df = child_entity.df
+    if feature.where is not None:
+        child_df = child_df.loc[child_df[feature.where.get_name()]]
+
+    # only the children of the given instances are needed
+    parents = instance_ids.unique()
+    row_parents = parents.get_indexer(child_df[relationship.child_variable.id])
+    keep = row_parents >= 0
+    if time_index is not None:
+        # rows without a time are never before a cutoff time
+        keep &= child_df[time_index].notnull().values
+    positions = np.flatnonzero(keep)
+    row_parents = row_parents[keep]
+
+    # The rows are sorted by parent, and then by time as the child entity is
+    # sorted by time. The rows of each pair are a range of the sorted rows
+    # from the start of the window to the cutoff time.
+    order = np.argsort(row_parents, kind='mergesort')
+    positions = positions[order]
+    row_parents = row_parents[order]
+
+    pair_parents = parents.get_indexer(instance_ids)
+    starts = np.searchsorted(row_parents, pair_parents, side='left')
+    if time_index is None:
+        ends = np.searchsorted(row_parents, pair_parents, side='right')
+    else:
+        row_times = child_df[time_index].values[positions]
+        ends = _count_rows_before(row_parents, row_times, pair_parents, times,
+                                  include_cutoff_time)
+        if use_previous is not None and use_previous.has_no_observations():
+            unique_times, time_codes = np.unique(times, return_inverse=True)
+            window_starts = [t - use_previous for t in pd.Series(unique_times)]
+            window_starts = pd.Series(window_starts).values.astype(times.dtype)
+            starts = _count_rows_before(row_parents, row_times, pair_parents,
+                                        window_starts[time_codes], False)
+
+    if use_previous is not None and not use_previous.has_no_observations():
+        starts = np.maximum(starts, ends - use_previous.get_value('o'))
+
+    lengths = np.maximum(ends - starts, 0)
+    num_pairs = len(instance_ids)
+    results = {f.get_name(): [] for f in features}
+    # only the columns of the base features are tagged
+    base_names = list(dict.fromkeys(f.base_features[0].get_name() for f in features))
+    base_df = child_df[base_names]
+    # tag the rows of a batch of pairs at a time, so the tagged rows fit in
+    # memory even when instances have many cutoff times and child rows
+    batches = np.cumsum(lengths) // MAX_TAGGED_ROWS
+    batch_starts = np.flatnonzero(np.diff(batches, prepend=-1))
+    for first_pair, last_pair in zip(batch_starts, np.append(batch_starts[1:], num_pairs)):
+        batch_lengths = lengths[first_pair:last_pair]
+        total = batch_lengths.sum()
+        if not total:
+            continue
+        offsets = np.cumsum(batch_lengths) - batch_lengths
+        rows = np.arange(total) - np.repeat(offsets - starts[first_pair:last_pair],
+                                            batch_lengths)
+        pairs = np.repeat(np.arange(first_pair, last_pair), batch_lengths)
+        tagged_df = base_df.iloc[positions[rows]]
+        for f in features:
+            func = f.get_function()
+            # the string count is faster than the function, see the calculator
+            if func == pd.Series.count:
+                func = "count"
+            values = tagged_df[f.base_features[0].get_name()]
+            results[f.get_name()].append(values.groupby(pairs, sort=False).agg(func))
+
+    return {name: _concat_pairs(values, num_pairs) for name, values in results.items()}
+
+
+def _count_rows_before(row_parents, row_times, pair_parents, times, include_times):
+    """
+    For each pair of parent and time, count the rows sorted by parent and time
+    which are before that time or the parent. Rows at the same time are
+    counted if include_times is True.
+    """
+    num_rows = len(row_parents)
+    ties = np.full(len(times), 1 if include_times else -1)
+    order = np.lexsort((np.concatenate([np.zeros(num_rows, dtype=int), ties]),
+                        np.concatenate([row_times, times]),
+                        np.concatenate([row_parents, pair_parents])))
+    is_row = order < num_rows
+    rows_before = np.cumsum(is_row) - is_row
+    counts = np.empty(len(times), dtype=int)
+    counts[order[~is_row] - num_rows] = rows_before[~is_row]
+    return counts
+
+
+def _concat_pairs(values, num_pairs):
+    if not values:
+        return pd.Series(np.nan, index=range(num_pairs))
+    return pd.concat(values).reindex(range(num_pairs))
+
+
+def _compare_to_cutoffs(values, times, include_cutoff_time):
+    if include_cutoff_time:
+        return values <= times
+    return values < times
+
+
+def can_join_dask_cutoff_times(feature_set, entityset):
+    """
+    Whether the features of Dask entities can be calculated for every pair of
+    instance and cutoff time in a single lazy graph with
+    :func:`join_dask_cutoff_times`.
+
+    This is possible when every target feature is either an identity feature
+    of the target entity, or an aggregation of a variable of a child of the
+    target entity by a primitive with a Dask aggregation, without a
+    use_previous window or with a window of a fixed length of time.
+    """
+    if any(not isinstance(entity.df, dd.DataFrame) for entity in entityset.entities):
+        return False
+
+    target_entity = entityset[feature_set.target_eid]
+    for feature in feature_set.target_features:
+        if isinstance(feature, IdentityFeature):
+            if feature.entity.id != target_entity.id:
+                return False
+        elif not isinstance(feature, AggregationFeature) or \
+                not _can_join_dask_aggregation(feature):
+            return False
+
+    return True
+
+
+def _can_join_dask_aggregation(feature):
+    if len(feature.relationship_path) != 1 or len(feature.base_features) != 1:
+        return False
+    if not can_agg(feature) or not feature.primitive.dask_compatible:
+        return False
+    if not _uses_child_variables(feature):
+        return False
+
+    # the start of the window is found for every pair at once, so it must be
+    # the same length of time before every cutoff time
+    use_previous = feature.use_previous
+    if use_previous is not None:
+        child_entity = feature.relationship_path[0][1].child_entity
+        if not isinstance(use_previous.delta_obj, pd.Timedelta) or \
+                child_entity.time_index is None:
+            return False
+
+    return True
+
+
+def join_dask_cutoff_times(feature_set, entityset, cutoff_time, pass_columns,
+                           include_cutoff_time=True):
+    """
+    Calculate features of Dask entities for every pair of instance and cutoff
+    time in a single lazy graph, rather than building a graph for each cutoff
+    time and concatenating them.
+
+    The cutoff times are merged with the target entity to get the variables of
+    the instance of each pair. For each aggregation, they are merged with the
+    rows of the child entity on the parent instance, tagging each child row
+    with every pair of its parent. The tagged rows are filtered by the cutoff
+    time and use_previous window of their pair, and grouped by pair with the
+    Dask aggregation of the primitive. Nothing is computed until the returned
+    feature matrix is, so it can be written with ``to_parquet`` without
+    collecting it on the client. The features must pass
+    :func:`can_join_dask_cutoff_times`.
+
+    Args:
+        feature_set (FeatureSet): The features to calculate.
+
+        entityset (EntitySet): The entityset of Dask entities to calculate
+            the features on.
+
+        cutoff_time (pd.DataFrame or dd.DataFrame): The pairs, with columns
+            "instance_id" and "time".
+
+        pass_columns (list[str]): Columns of the cutoff times to add to the
+            feature matrix.
+
+        include_cutoff_time (bool): If True, data at the cutoff times are
+            included in calculating features.
+
+    Returns:
+        dd.DataFrame: The feature values, id of the instance and pass columns
+            of each pair, like the feature matrix calculated separately at
+            each cutoff time. The features of pairs whose instance does not
+            exist at their cutoff time are null.
+    """
+    target_entity = entityset[feature_set.target_eid]
+    target_df = target_entity.df
+    if isinstance(cutoff_time, pd.DataFrame):
+        cutoff_time = dd.from_pandas(cutoff_time, npartitions=target_df.npartitions)
+    pairs = cutoff_time[['instance_id', 'time'] + pass_columns]
+    pairs = pairs.rename(columns={'instance_id': PAIR_ID, 'time': PAIR_TIME})
+
+    identity_features = [f for f in feature_set.target_features
+                         if isinstance(f, IdentityFeature)]
+    columns = [target_entity.index] + [f.variable.id for f in identity_features]
+    if target_entity.time_index is not None:
+        columns.append(target_entity.time_index)
+    columns += list(target_entity.secondary_time_index)
+    columns = list(dict.fromkeys(columns))
+
+    fm = pairs.merge(target_df[columns], left_on=PAIR_ID,
+                     right_on=target_entity.index, how='left')
+    # instances which were not created by the cutoff time have null values,
+    # as when passing columns of the cutoff times to the calculator
+    exists = fm[target_entity.index].notnull()
+    if target_entity.time_index is not None:
+        exists &= _compare_to_cutoffs(fm[target_entity.time_index], fm[PAIR_TIME],
+                                      include_cutoff_time)
+    fm = fm.assign(**{PAIR_EXISTS: exists, target_entity.index: fm[PAIR_ID]})
+    fm = fm.assign(**{f.get_name(): fm[f.get_name()].where(fm[PAIR_EXISTS])
+                      for f in identity_features if f.variable.id != target_entity.index})
+    for secondary_time_index, masked in target_entity.secondary_time_index.items():
+        mask = fm[secondary_time_index] >= fm[PAIR_TIME]
+        fm = fm.assign(**{col: fm[col].mask(mask, np.nan)
+                          for col in masked if col in fm.columns})
+
+    # aggregations of the same rows are calculated from the same tagged rows
+    tagged_groups = {}
+    for feature in feature_set.target_features:
+        if isinstance(feature, AggregationFeature):
+            where = None if feature.where is None else feature.where.get_name()
+            use_previous = None if feature.use_previous is None else feature.use_previous.get_name()
+            key = (feature.relationship_path[0][1], where, use_previous)
+            tagged_groups.setdefault(key, []).append(feature)
+
+    for features in tagged_groups.values():
+        to_merge = _aggregate_dask_tagged_rows(features, pairs[[PAIR_ID, PAIR_TIME]],
+                                               include_cutoff_time)
+        fm = fm.merge(to_merge, on=[PAIR_ID, PAIR_TIME], how='left')
+
+    fm = fm.assign(**{f.get_name(): fm[f.get_name()].fillna(f.default_value).where(fm[PAIR_EXISTS])
+                      for features in tagged_groups.values() for f in features})
+
+    column_list = [name for f in feature_set.target_features for name in f.get_feature_names()]
+    column_list.append(target_entity.index)
+    return fm[column_list + pass_columns]
+
+
+def _aggregate_dask_tagged_rows(features, pairs, include_cutoff_time):
+    """
+    Calculate aggregation features of the same child rows of Dask entities for
+    each pair, by merging the pairs with the child rows of their instance.
+    Returns a Dask DataFrame of the features of the pairs with child rows,
+    with the pair in columns PAIR_ID and PAIR_TIME.
+    """
+    feature = features[0]
+    relationship = feature.relationship_path[0][1]
+    child_entity = relationship.child_entity
+    time_index = child_entity.time_index
+
+    columns = [relationship.child_variable.id]
+    if time_index is not None:
+        columns.append(time_index)
+    columns += [f.base_features[0].get_name() for f in features]
+    if feature.where is not None:
+        columns.append(feature.where.get_name())
+    child_df = child_entity.df[list(dict.fromkeys(columns))]
+    if feature.where is not None:
+        child_df = child_df[child_df[feature.where.get_name()]]
+
+    tagged = pairs.merge(child_df, left_on=PAIR_ID,
+                         right_on=relationship.child_variable.id, how='inner')
+    if time_index is not None:
+        row_times = tagged[time_index]
+        keep = _compare_to_cutoffs(row_times, tagged[PAIR_TIME], include_cutoff_time)
+        if feature.use_previous is not None:
+            keep &= row_times >= tagged[PAIR_TIME] - feature.use_previous.delta_obj
+        tagged = tagged[keep]
+
+    to_agg = {}
+    agg_names = {}
+    for f in features:
+        variable_id = f.base_features[0].get_name()
+        func = f.get_dask_aggregation()
+        funcname = func.__name__ if isinstance(func, dd.Aggregation) else func
+        if (variable_id, funcname) not in agg_names:
+            to_agg.setdefault(variable_id, []).append(func)
+        agg_names.setdefault((variable_id, funcname), []).append(f.get_name())
+
+    # the ids of the pairs are categorical if the child variable is
+    aggregated = tagged.groupby([PAIR_ID, PAIR_TIME], observed=True).agg(to_agg,
+                                                                         split_out=pairs.npartitions)
+    aggregated.columns = ["-".join(x) for x in aggregated.columns]
+    aggregated = aggregated.reset_index()
+
+    # features with the same aggregation of the same variable share a column
+    aggregated = aggregated.assign(**{name: aggregated[u"{}-{}".format(variable_id, funcname)]
+                                      for (variable_id, funcname), names in agg_names.items()
+                                      for name in names})
+    return aggregated[[PAIR_ID, PAIR_TIME] + [f.get_name() for f in features]]
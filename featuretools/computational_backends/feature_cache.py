@@ -0,0 +1,151 @@
+import os
+import uuid
+
+import pandas as pd
+from dask.base import tokenize
+
+
+class FeatureCache(object):
+    """
+    Caches the calculated values of each feature on disk, so they can be
+    reused by later calls to calculate_feature_matrix.
+
+    The values of a feature are saved by instance for each cutoff time. The
+    values are identified by a key made from the data of the entityset, the
+    cutoff time and the options of the calculation, and the unique name of
+    the feature. When features are calculated, only the features and
+    instances missing from the cache are calculated, so the values are reused
+    however the cutoff times are split into chunks, and adding a feature to a
+    list of features which was already calculated only costs the calculation
+    of the new feature. Instances calculated at the same time by different
+    processes may be saved by only one of them, in which case the others are
+    calculated again by a later call.
+
+    If ``max_size`` is set, the least recently used values are removed from the
+    cache whenever it grows larger than ``max_size``.
+    """
+
+    def __init__(self, path, max_size=None):
+        """
+        Args:
+            path (str): Directory to save the cached values to.
+
+            max_size (int, optional): Maximum size of the cache in bytes. If
+                None, values are never removed from the cache.
+        """
+        self.path = path
+        self.max_size = max_size
+
+    def get(self, key):
+        """
+        Get the values saved for the key, or None if they are not in the cache.
+        """
+        file_path = self._file_path(key)
+        try:
+            values = pd.read_pickle(file_path)
+            # mark the values as recently used
+            os.utime(file_path)
+        except (FileNotFoundError, EOFError):
+            # the file was never saved or was removed while reading it
+            return None
+
+        return values
+
+    def set(self, key, values):
+        """Save the values for the key."""
+        if not os.path.exists(self.path):
+            os.makedirs(self.path, exist_ok=True)
+
+        # only move the file once it is complete, so an interrupted write is
+        # never read back
+        temp_file_path = os.path.join(self.path, 'temp-{}.pkl'.format(uuid.uuid4().hex))
+        values.to_pickle(temp_file_path)
+        os.replace(temp_file_path, self._file_path(key))
+
+    def evict(self):
+        """
+        Remove the least recently used values until the cache is no larger
+        than max_size.
+        """
+        if self.max_size is None or not os.path.exists(self.path):
+            return
+
+        files = []
+        for entry in os.scandir(self.path):
+            if entry.name.startswith('ft_'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, file_path in sorted(files):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                # already removed by another process
+                pass
+            size -= file_size
+
+    def calculate(self, feature_set, key, instance_ids, calculate, progress_callback=None):
+        """
+        Get the values of the target features of a feature set for the given
+        instances, only calculating the values which are not in the cache.
+
+        Args:
+            feature_set (FeatureSet): The features to get values of.
+
+            key (str): Identifies the data and cutoff time the features are
+                calculated for.
+
+            instance_ids (list): Ids of the instances to get values of.
+
+            calculate (callable): Function taking a FeatureSet and a list of
+                instance ids, and returning a DataFrame of the values of its
+                target features for those instances.
+
+            progress_callback (callable, optional): Called with 1 if all of the
+                values are in the cache.
+
+        Returns:
+            pd.DataFrame: The values of the target features of the feature set.
+        """
+        instance_ids = pd.Series(instance_ids).drop_duplicates()
+        feature_keys = {f.unique_name(): tokenize(key, f.unique_name())
+                        for f in feature_set.target_features}
+        cached = {}
+        missing = []
+        missing_ids = pd.Index([])
+        for feature in feature_set.target_features:
+            values = self.get(feature_keys[feature.unique_name()])
+            cached[feature.unique_name()] = values
+            if values is None:
+                feature_missing_ids = pd.Index(instance_ids)
+            else:
+                feature_missing_ids = pd.Index(instance_ids).difference(values.index, sort=False)
+            if len(feature_missing_ids):
+                missing.append(feature)
+                missing_ids = missing_ids.union(feature_missing_ids, sort=False)
+
+        if missing:
+            # keep the instances in the order they were given
+            missing_ids = instance_ids[instance_ids.isin(missing_ids)].values
+            df = calculate(feature_set.get_subset(missing), missing_ids)
+            for feature in missing:
+                values = df[feature.get_feature_names()]
+                previous = cached[feature.unique_name()]
+                if previous is not None:
+                    values = pd.concat([previous, values[~values.index.isin(previous.index)]])
+                self.set(feature_keys[feature.unique_name()], values)
+                cached[feature.unique_name()] = values
+            self.evict()
+        elif progress_callback is not None:
+            progress_callback(1)
+
+        frames = [cached[f.unique_name()].loc[instance_ids.values] for f in feature_set.target_features]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, axis=1)
+
+    def _file_path(self, key):
+        return os.path.join(self.path, 'ft_{}.pkl'.format(key))
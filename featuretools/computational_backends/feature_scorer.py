@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from featuretools.computational_backends.compiled_features import (
+    CompiledFeatures,
+    compile_features
+)
+from featuretools.computational_backends.feature_set_calculator import (
+    FeatureSetCalculator
+)
+from featuretools.variable_types import NumericTimeIndex
+
+
+class FeatureScorer(object):
+    """
+    Calculates features for a few instances at a time with low latency, for
+    example to score instances as they arrive in an online service.
+
+    The scorer compiles the features once, and adds row indexes to the
+    entities of the entityset for each variable used to look up rows of an
+    entity (see :meth:`.Entity.add_row_indexes`). Scoring then looks up the
+    rows related to the given instances by their positions in each entity,
+    rather than comparing every row of each entity to the instance ids.
+
+    Only pandas entitysets are supported.
+
+    Examples:
+        .. code-block:: python
+
+            scorer = ft.FeatureScorer(features, es)
+            fm = scorer.score([1, 2], time=pd.Timestamp.now())
+    """
+
+    def __init__(self, features, entityset, training_window=None, include_cutoff_time=True):
+        """
+        Args:
+            features (list[:class:`.FeatureBase`] or :class:`.CompiledFeatures`):
+                Feature definitions to be calculated.
+
+            entityset (EntitySet): An already initialized entityset.
+
+            training_window (Timedelta or str, optional): Window defining how much
+                time before the cutoff time data can be used when calculating
+                features. If None, all data before cutoff time is used.
+
+            include_cutoff_time (bool): Include data at cutoff times in feature
+                calculations. Defaults to ``True``.
+        """
+        if any(not isinstance(entity.df, pd.DataFrame) for entity in entityset.entities):
+            raise ValueError("FeatureScorer does not support Dask Entities")
+
+        if not isinstance(features, CompiledFeatures):
+            features = compile_features(features, entityset)
+        features.check_entityset(entityset)
+
+        self.entityset = entityset
+        self.feature_set, _ = features.get_feature_set()
+        self.training_window = training_window
+        self.include_cutoff_time = include_cutoff_time
+
+        for entity_id, variable_id in _get_queried_variables(self.feature_set, entityset):
+            entityset[entity_id].add_row_indexes([variable_id])
+
+    def score(self, instance_ids, time=None):
+        """
+        Calculate the features for the given instances.
+
+        Args:
+            instance_ids (list): Ids of instances of the target entity to
+                calculate features for.
+
+            time (pd.Timestamp or int, optional): Cutoff time to calculate the
+                features at. If None, the current time is used, or infinity if
+                the entityset has a numeric time index.
+
+        Returns:
+            pd.DataFrame: The feature matrix, indexed by instance id.
+        """
+        if time is None:
+            if self.entityset.time_type == NumericTimeIndex:
+                time = np.inf
+            else:
+                time = pd.Timestamp.now()
+
+        calculator = FeatureSetCalculator(self.entityset,
+                                          self.feature_set,
+                                          time,
+                                          training_window=self.training_window)
+        return calculator.run(np.asarray(instance_ids),
+                              include_cutoff_time=self.include_cutoff_time)
+
+
+def _get_queried_variables(feature_set, entityset):
+    """
+    Get tuples of (entity id, variable id) for the variables which the
+    calculator looks up rows of each entity in the feature set by.
+    """
+    target_entity = entityset[feature_set.target_eid]
+    queried = {(target_entity.id, target_entity.index)}
+    for path, _ in feature_set.execution_plan:
+        if not len(path):
+            continue
+        is_forward, relationship = path[-1]
+        if is_forward:
+            queried.add((relationship.parent_entity.id, relationship.parent_variable.id))
+        else:
+            queried.add((relationship.child_entity.id, relationship.child_variable.id))
+
+    return queried
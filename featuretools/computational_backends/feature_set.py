@@ -61,6 +61,8 @@ class FeatureSet(object):
             for fname, f in self.features_by_name.items()}
 
         self._feature_trie = None
+        self._execution_plan = None
+        self._subsets = {}
 
     @property
     def feature_trie(self):
@@ -82,6 +84,82 @@ class FeatureSet(object):
 
         return self._feature_trie
 
+    @property
+    def execution_plan(self):
+        """
+        The order to calculate the features of each entity in, see
+        build_execution_plan.
+
+        Returns:
+            Trie[RelationshipPath, (bool, list[list[Feature]], list[list[Feature]])]
+        """
+        return self.build_execution_plan()
+
+    def build_execution_plan(self):
+        """
+        Build the order to calculate the features of each entity in, if it
+        has not been built yet. The plan is built from the feature trie once,
+        and then reused by every calculator of this feature set. Build it
+        before pickling the feature set to send it to other processes, so that
+        it is not rebuilt for every chunk of the feature matrix.
+
+        The plan is a trie with the same edges as the feature trie, and values
+        which are tuples of (bool, list[list[Feature]], list[list[Feature]]).
+        The bool represents whether the full entity df is needed at that node,
+        the first list contains the groups of features which are needed on the
+        full entity, and the second list contains the groups of the rest of the
+        features. Groups are in topological order, see group_features.
+
+        The plan only fixes the order of the feature groups of each entity. It
+        is not a graph of operations: the calculator still walks the trie
+        depth first, querying and joining the data of each entity itself, and
+        steps shared by features of different entities are not deduplicated.
+
+        Returns:
+            Trie[RelationshipPath, (bool, list[list[Feature]], list[list[Feature]])]
+        """
+        if self._execution_plan is None:
+            self._execution_plan = self._build_execution_plan()
+
+        return self._execution_plan
+
+    def get_subset(self, features):
+        """
+        Get a feature set of some of the target features. The feature set of
+        each subset is kept, so its execution plan is only built once.
+
+        Args:
+            features (list[Feature]): Target features of this feature set.
+
+        Returns:
+            FeatureSet: This feature set if all of the target features are
+                given, or else a feature set of the given features.
+        """
+        names = tuple(f.unique_name() for f in features)
+        if names == tuple(f.unique_name() for f in self.target_features):
+            return self
+
+        if names not in self._subsets:
+            self._subsets[names] = FeatureSet(features,
+                                              approximate_feature_trie=self.approximate_feature_trie)
+        return self._subsets[names]
+
+    @property
+    def num_features(self):
+        """The number of target features and dependencies to be calculated."""
+        return sum(len(group)
+                   for _, (_, groups1, groups2) in self.execution_plan
+                   for group in groups1 + groups2)
+
+    def _build_execution_plan(self):
+        plan = Trie(path_constructor=RelationshipPath)
+        for path, (needs_full_entity, full_features, not_full_features) in self.feature_trie:
+            plan.get_node(path).value = (needs_full_entity,
+                                         self.group_features(full_features),
+                                         self.group_features(not_full_features))
+
+        return plan
+
     def _build_feature_trie(self):
         """
         Build the feature trie by adding the target features and their dependencies recursively.
@@ -143,7 +221,7 @@ class FeatureSet(object):
     def group_features(self, feature_names):
         """
         Topologically sort the given features, then group by path,
-        feature type, use_previous, and where.
+        feature type, observation based use_previous, and where.
         """
         features = [self.features_by_name[name] for name in feature_names]
         depths = self._get_feature_depths(features)
@@ -203,14 +281,15 @@ class FeatureSet(object):
 # These functions are used for sorting and grouping features
 
 
-def _get_use_previous(f):  # TODO Sort and group features for DateOffset with two different temporal values
-    if isinstance(f, AggregationFeature) and f.use_previous is not None:
-        if len(f.use_previous.times.keys()) > 1:
-            return ("", -1)
-        else:
-            unit = list(f.use_previous.times.keys())[0]
-            value = f.use_previous.times[unit]
-            return (unit, value)
+def _get_use_previous(f):
+    # Time based windows all end at the cutoff time, so features which only
+    # differ in such a window are kept in the same group and can share the
+    # child data. Windows of observations select different rows per parent.
+    if isinstance(f, AggregationFeature) and f.use_previous is not None and \
+            not f.use_previous.has_no_observations():
+        unit = list(f.use_previous.times.keys())[0]
+        value = f.use_previous.times[unit]
+        return (unit, value)
     else:
         return ("", -1)
 
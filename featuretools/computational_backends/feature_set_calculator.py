@@ -1,3 +1,5 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import partial
 
@@ -7,6 +9,7 @@ import pandas as pd
 import pandas.api.types as pdtypes
 
 from featuretools import variable_types
+from featuretools.computational_backends.column_store import ColumnStore
 from featuretools.entityset.relationship import RelationshipPath
 from featuretools.exceptions import UnknownFeature
 from featuretools.feature_base import (
@@ -26,7 +29,9 @@ class FeatureSetCalculator(object):
     """
 
     def __init__(self, entityset, feature_set, time_last=None,
-                 training_window=None, precalculated_features=None):
+                 training_window=None, precalculated_features=None,
+                 time_sweep=None, incremental_aggregations=False, n_threads=1,
+                 executor=None):
         """
         Args:
             feature_set (FeatureSet): The features to calculate values for.
@@ -40,6 +45,25 @@ class FeatureSetCalculator(object):
             precalculated_features (Trie[RelationshipPath -> pd.DataFrame]):
                 Maps RelationshipPaths to dataframes of precalculated_features
 
+            time_sweep (TimeSweep, optional): Sweep shared between calculators
+                run at increasing cutoff times. Used to restrict entity queries
+                to the rows at or before time_last without scanning the full
+                time index. Must already be advanced to time_last.
+
+            incremental_aggregations (bool): If True, aggregations with a
+                mergeable state which only differ in their use_previous window
+                are calculated together by merging the states of the rows
+                between window starts.
+
+            n_threads (int): Number of threads to calculate the features of
+                sibling entities in the feature trie concurrently with. Most of
+                the work is done by pandas and numpy, which release the GIL.
+
+            executor (ThreadPoolExecutor, optional): Thread pool with
+                n_threads - 1 threads to use when n_threads is greater than
+                one, so that calculators run one after another can share a
+                pool. If None, each run creates its own pool.
+
         """
         self.entityset = entityset
         self.feature_set = feature_set
@@ -50,13 +74,22 @@ class FeatureSetCalculator(object):
 
         self.time_last = time_last
 
+        if time_sweep is not None:
+            assert time_sweep.time_last == time_last, \
+                "time_sweep must be advanced to time_last"
+        self.time_sweep = time_sweep
+        self.incremental_aggregations = incremental_aggregations
+        self.n_threads = n_threads
+        self._shared_executor = executor
+        self._executor = None
+
         if precalculated_features is None:
             precalculated_features = Trie(path_constructor=RelationshipPath)
 
         self.precalculated_features = precalculated_features
 
         # total number of features (including dependencies) to be calculate
-        self.num_features = sum(len(features1) + len(features2) for _, (_, features1, features2) in self.feature_set.feature_trie)
+        self.num_features = self.feature_set.num_features
 
     def run(self, instance_ids, progress_callback=None, include_cutoff_time=True):
         """
@@ -64,9 +97,10 @@ class FeatureSetCalculator(object):
         entity.
 
         Summary of algorithm:
-        1. Construct a trie where the edges are relationships and each node
-            contains a set of features for a single entity. See
-            FeatureSet._build_feature_trie.
+        1. Get the execution plan of the feature set, a trie where the edges
+            are relationships and each node contains the groups of features
+            to calculate for a single entity. It is built once per feature
+            set, see FeatureSet.execution_plan.
         2. Initialize a trie for storing dataframes.
         3. Traverse the trie using depth first search. At each node calculate
             the features and store the resulting dataframe in the dataframe
@@ -95,21 +129,34 @@ class FeatureSetCalculator(object):
             # do nothing for the progress call back if not provided
             def progress_callback(*args):
                 pass
-        feature_trie = self.feature_set.feature_trie
+        feature_trie = self.feature_set.execution_plan
 
         df_trie = Trie(path_constructor=RelationshipPath)
         full_entity_df_trie = Trie(path_constructor=RelationshipPath)
 
         target_entity = self.entityset[self.feature_set.target_eid]
-        self._calculate_features_for_entity(entity_id=self.feature_set.target_eid,
-                                            feature_trie=feature_trie,
-                                            df_trie=df_trie,
-                                            full_entity_df_trie=full_entity_df_trie,
-                                            precalculated_trie=self.precalculated_features,
-                                            filter_variable=target_entity.index,
-                                            filter_values=instance_ids,
-                                            progress_callback=progress_callback,
-                                            include_cutoff_time=include_cutoff_time)
+        owns_executor = False
+        if self.n_threads > 1:
+            self._executor = self._shared_executor
+            if self._executor is None:
+                # the current thread also calculates features
+                self._executor = ThreadPoolExecutor(self.n_threads - 1)
+                owns_executor = True
+            progress_callback = _synchronized(progress_callback)
+        try:
+            self._calculate_features_for_entity(entity_id=self.feature_set.target_eid,
+                                                feature_trie=feature_trie,
+                                                df_trie=df_trie,
+                                                full_entity_df_trie=full_entity_df_trie,
+                                                precalculated_trie=self.precalculated_features,
+                                                filter_variable=target_entity.index,
+                                                filter_values=instance_ids,
+                                                progress_callback=progress_callback,
+                                                include_cutoff_time=include_cutoff_time)
+        finally:
+            if owns_executor:
+                self._executor.shutdown()
+            self._executor = None
 
         # The dataframe for the target entity should be stored at the root of
         # df_trie.
@@ -165,8 +212,8 @@ class FeatureSetCalculator(object):
         Args:
             entity_id (str): The name of the entity to calculate features for.
 
-            feature_trie (Trie): the trie with sets of features to calculate.
-                The root contains features for the given entity.
+            feature_trie (Trie): the execution plan with groups of features to
+                calculate. The root contains features for the given entity.
 
             df_trie (Trie): a parallel trie for storing dataframes. The
                 dataframe with features calculated will be placed in the root.
@@ -199,9 +246,10 @@ class FeatureSetCalculator(object):
         # Step 1: Get a dataframe for the given entity, filtered by the given
         # conditions.
 
-        need_full_entity, full_entity_features, not_full_entity_features = feature_trie.value
+        need_full_entity, full_entity_groups, not_full_entity_groups = feature_trie.value
 
-        all_features = full_entity_features | not_full_entity_features
+        all_features = [f for group in full_entity_groups + not_full_entity_groups
+                        for f in group]
         entity = self.entityset[entity_id]
         columns = self._necessary_columns(entity, all_features)
 
@@ -213,12 +261,17 @@ class FeatureSetCalculator(object):
             query_variable = filter_variable
             query_values = filter_values
 
+        row_limit = None
+        if self.time_sweep is not None:
+            row_limit = self.time_sweep.row_limit(entity_id)
+
         df = entity.query_by_values(query_values,
                                     variable_id=query_variable,
                                     columns=columns,
                                     time_last=self.time_last,
                                     training_window=self.training_window,
-                                    include_cutoff_time=include_cutoff_time)
+                                    include_cutoff_time=include_cutoff_time,
+                                    row_limit=row_limit)
 
         # call to update timer
         progress_callback(0)
@@ -251,6 +304,9 @@ class FeatureSetCalculator(object):
         else:
             filtered_df = df
 
+        # The children of the trie only depend on the dataframe of this entity,
+        # so they can be calculated concurrently.
+        calculate_children = []
         for edge, sub_trie in feature_trie.children():
             is_forward, relationship = edge
             if is_forward:
@@ -270,7 +326,8 @@ class FeatureSetCalculator(object):
             sub_df_trie = df_trie.get_node([edge])
             sub_full_entity_df_trie = full_entity_df_trie.get_node([edge])
             sub_precalc_trie = precalculated_trie.get_node([edge])
-            self._calculate_features_for_entity(
+            calculate_children.append(partial(
+                self._calculate_features_for_entity,
                 entity_id=sub_entity,
                 feature_trie=sub_trie,
                 df_trie=sub_df_trie,
@@ -280,7 +337,9 @@ class FeatureSetCalculator(object):
                 filter_values=sub_filter_values,
                 parent_data=parent_data,
                 progress_callback=progress_callback,
-                include_cutoff_time=include_cutoff_time)
+                include_cutoff_time=include_cutoff_time))
+
+        self._run_concurrently(calculate_children)
 
         # Step 4: Calculate the features for this entity.
         #
@@ -290,21 +349,26 @@ class FeatureSetCalculator(object):
         # Add any precalculated features.
         precalculated_features_df = precalculated_trie.value
         if precalculated_features_df is not None:
-            # Left outer merge to keep all rows of df.
+            # Left outer merge to keep all rows of df. The rows of Dask
+            # dataframes are not indexed by the entity index.
+            if isinstance(df, dd.DataFrame):
+                merge_kwargs = {'left_on': self.entityset[entity_id].index}
+            else:
+                merge_kwargs = {'left_index': True}
             df = df.merge(precalculated_features_df,
                           how='left',
-                          left_index=True,
                           right_index=True,
-                          suffixes=('', '_precalculated'))
+                          suffixes=('', '_precalculated'),
+                          **merge_kwargs)
 
         # call to update timer
         progress_callback(0)
 
         # First, calculate any features that require the full entity. These can
         # be calculated first because all of their dependents are included in
-        # full_entity_features.
+        # full_entity_groups.
         if need_full_entity:
-            df = self._calculate_features(df, full_entity_df_trie, full_entity_features, progress_callback)
+            df = self._calculate_features(df, full_entity_df_trie, full_entity_groups, progress_callback)
 
             # Store full entity df.
             full_entity_df_trie.value = df
@@ -314,23 +378,56 @@ class FeatureSetCalculator(object):
             df = df[df[filter_variable].isin(filter_values)]
 
         # Calculate all features that don't require the full entity.
-        df = self._calculate_features(df, df_trie, not_full_entity_features, progress_callback)
+        df = self._calculate_features(df, df_trie, not_full_entity_groups, progress_callback)
 
         # Step 5: Store the dataframe for this entity at the root of df_trie, so
         # that it can be accessed by the caller.
         df_trie.value = df
 
-    def _calculate_features(self, df, df_trie, features, progress_callback):
-        # Group the features so that each group can be calculated together.
-        # The groups must also be in topological order (if A is a transform of B
-        # then B must be in a group before A).
-        feature_groups = self.feature_set.group_features(features)
+    def _run_concurrently(self, calls):
+        """
+        Run the calls, using the thread pool if there is one. The first call is
+        run on the current thread, as are any calls which have not been started
+        by the thread pool when the current thread gets to them. Threads only
+        wait for calls which are already running, so they can't deadlock
+        waiting for each other when all threads of the pool are in use.
+        """
+        if self._executor is None or len(calls) < 2:
+            for call in calls:
+                call()
+            return
+
+        futures = [self._executor.submit(call) for call in calls[1:]]
+        try:
+            calls[0]()
+            for future, call in zip(futures, calls[1:]):
+                if future.cancel():
+                    call()
+                else:
+                    future.result()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def _calculate_features(self, df, df_trie, feature_groups, progress_callback):
+        # Each group of features is calculated together. The groups are in
+        # topological order (if A is a transform of B then B is in a group
+        # before A).
+        # Collect the columns of pandas dataframes in a column store, so the
+        # dataframe is only copied once after all groups are calculated.
+        is_pandas = isinstance(df, pd.DataFrame)
+        if is_pandas:
+            df = ColumnStore(df)
 
         for group in feature_groups:
             representative_feature = group[0]
             handler = self._feature_type_handler(representative_feature)
             df = handler(group, df, df_trie, progress_callback)
 
+        if is_pandas:
+            df = df.to_frame()
+
         return df
 
     def _add_ancestor_relationship_variables(self, child_df, parent_df,
@@ -473,10 +570,38 @@ class FeatureSetCalculator(object):
             return frame
 
         groupby = features[0].groupby.get_name()
-        grouped = frame.groupby(groupby)
-        groups = frame[groupby].unique()  # get all the unique group name to iterate over later
+        groups = None
 
         for f in features:
+            column_names = [bf.get_name() for bf in f.base_features]
+
+            # calculate the feature for all groups at once if the primitive
+            # supports it
+            groupby_func = f.get_groupby_function()
+            if groupby_func is not None:
+                # exclude the groupby variable from being passed to the function
+                variable_data = [frame[name].groupby(frame[groupby])
+                                 for name in column_names[:-1]]
+                if f.primitive.uses_calc_time:
+                    values = groupby_func(*variable_data, time=self.time_last)
+                else:
+                    values = groupby_func(*variable_data)
+
+                if f.number_output_features == 1:
+                    values = [values]
+
+                assert len(values) == len(f.get_feature_names())
+                for value, name in zip(values, f.get_feature_names()):
+                    frame[name].update(value)
+
+                progress_callback(1 / float(self.num_features))
+                continue
+
+            if groups is None:
+                groups = frame[groupby].unique()  # get all the unique group name to iterate over later
+
+            # exclude the groupby variable from being passed to the function
+            grouped = [frame[name].groupby(frame[groupby]) for name in column_names[:-1]]
             feature_vals = []
             for _ in range(f.number_output_features):
                 feature_vals.append([])
@@ -486,9 +611,7 @@ class FeatureSetCalculator(object):
                 if pd.isnull(group):
                     continue
 
-                column_names = [bf.get_name() for bf in f.base_features]
-                # exclude the groupby variable from being passed to the function
-                variable_data = [grouped[name].get_group(group) for name in column_names[:-1]]
+                variable_data = [values.get_group(group) for values in grouped]
                 feature_func = f.get_function()
 
                 # apply the function to the relevant dataframe slice and add the
@@ -553,8 +676,15 @@ class FeatureSetCalculator(object):
             else:
                 merge_df.set_index(merge_var, inplace=True)
 
-            new_df = child_df.merge(merge_df, left_on=merge_var, right_index=True,
-                                    how='left')
+            if isinstance(child_df, ColumnStore):
+                # only the merge variable is needed to look up the parent rows
+                merged = child_df[[merge_var]].merge(merge_df, left_on=merge_var,
+                                                     right_index=True, how='left')
+                new_df = child_df.assign(**{name: merged[name] for name in merged.columns
+                                            if name != merge_var})
+            else:
+                new_df = child_df.merge(merge_df, left_on=merge_var, right_index=True,
+                                        how='left')
 
         progress_callback(len(features) / float(self.num_features))
 
@@ -598,119 +728,23 @@ class FeatureSetCalculator(object):
 
             groupby_var = get_relationship_variable_id(relationship_path)
 
-            # if the use_previous property exists on this feature, include only the
-            # instances from the child entity included in that Timedelta
-            use_previous = test_feature.use_previous
-            if use_previous:
-                # Filter by use_previous values
-                time_last = self.time_last
-                if use_previous.has_no_observations():
-                    time_first = time_last - use_previous
-                    ti = child_entity.time_index
-                    if ti is not None:
-                        base_frame = base_frame[base_frame[ti] >= time_first]
-                else:
-                    n = use_previous.get_value('o')
-
-                    def last_n(df):
-                        return df.iloc[-n:]
-
-                    base_frame = base_frame.groupby(groupby_var, observed=True, sort=False).apply(last_n)
-
-            to_agg = {}
-            agg_rename = {}
-            to_apply = set()
-            # apply multivariable and time-dependent features as we find them, and
-            # save aggregable features for later
-            for f in features:
-                if _can_agg(f):
-
-                    variable_id = f.base_features[0].get_name()
-                    if variable_id not in to_agg:
-                        to_agg[variable_id] = []
-                    if isinstance(base_frame, dd.DataFrame):
-                        func = f.get_dask_aggregation()
-                    else:
-                        func = f.get_function()
-
-                    # for some reason, using the string count is significantly
-                    # faster than any method a primitive can return
-                    # https://stackoverflow.com/questions/55731149/use-a-function-instead-of-string-in-pandas-groupby-agg
-                    if func == pd.Series.count:
-                        func = "count"
-
-                    funcname = func
-                    if callable(func):
-                        # if the same function is being applied to the same
-                        # variable twice, wrap it in a partial to avoid
-                        # duplicate functions
-                        funcname = str(id(func))
-                        if u"{}-{}".format(variable_id, funcname) in agg_rename:
-                            func = partial(func)
-                            funcname = str(id(func))
-
-                        func.__name__ = funcname
-
-                    if isinstance(func, dd.Aggregation):
-                        # TODO: handle aggregation being applied to same variable twice
-                        # (see above partial wrapping of functions)
-                        funcname = func.__name__
-
-                    to_agg[variable_id].append(func)
-                    # this is used below to rename columns that pandas names for us
-                    agg_rename[u"{}-{}".format(variable_id, funcname)] = f.get_name()
-                    continue
-
-                to_apply.add(f)
-
-            # Apply the non-aggregable functions generate a new dataframe, and merge
-            # it with the existing one
-            if len(to_apply):
-                wrap = agg_wrapper(to_apply, self.time_last)
-                # groupby_var can be both the name of the index and a column,
-                # to silence pandas warning about ambiguity we explicitly pass
-                # the column (in actuality grouping by both index and group would
-                # work)
-                to_merge = base_frame.groupby(base_frame[groupby_var],
-                                              observed=True,
-                                              sort=False).apply(wrap)
-                frame = pd.merge(left=frame, right=to_merge,
-                                 left_index=True,
-                                 right_index=True, how='left')
-
-                progress_callback(len(to_apply) / float(self.num_features))
-
-            # Apply the aggregate functions to generate a new dataframe, and merge
-            # it with the existing one
-            if len(to_agg):
-                # groupby_var can be both the name of the index and a column,
-                # to silence pandas warning about ambiguity we explicitly pass
-                # the column (in actuality grouping by both index and group would
-                # work)
-                if isinstance(base_frame, dd.DataFrame):
-                    to_merge = base_frame.groupby(groupby_var).agg(to_agg)
-
-                else:
-                    to_merge = base_frame.groupby(base_frame[groupby_var],
-                                                  observed=True, sort=False).agg(to_agg)
-                # rename columns to the correct feature names
-                to_merge.columns = [agg_rename["-".join(x)] for x in to_merge.columns.ravel()]
-                to_merge = to_merge[list(agg_rename.values())]
-
-                # workaround for pandas bug where categories are in the wrong order
-                # see: https://github.com/pandas-dev/pandas/issues/22501
-                if pdtypes.is_categorical_dtype(frame.index):
-                    categories = pdtypes.CategoricalDtype(categories=frame.index.categories)
-                    to_merge.index = to_merge.index.astype(object).astype(categories)
-
-                if isinstance(frame, dd.DataFrame):
-                    frame = frame.merge(to_merge, left_on=parent_merge_var, right_index=True, how='left')
-                else:
-                    frame = pd.merge(left=frame, right=to_merge,
-                                     left_index=True, right_index=True, how='left')
-
-                # determine number of features that were just merged
-                progress_callback(len(to_merge.columns) / float(self.num_features))
+            # Features which only differ in their time based use_previous
+            # window are grouped together, so the child data only has to be
+            # queried and filtered by where once for all of the windows.
+            windows = _group_by_use_previous(features)
+            if len(windows) > 1 and self.incremental_aggregations and \
+                    child_entity.time_index is not None and \
+                    isinstance(base_frame, pd.DataFrame):
+                frame, windows = self._calculate_window_family(windows, frame, base_frame,
+                                                               child_entity.time_index,
+                                                               groupby_var, progress_callback)
+
+            for use_previous, window_features in windows:
+                window_frame = self._filter_use_previous(base_frame, use_previous,
+                                                         child_entity, groupby_var)
+                frame = self._aggregate_features(window_features, frame, window_frame,
+                                                 groupby_var, parent_merge_var,
+                                                 progress_callback)
 
         # Handle default values
         fillna_dict = {}
@@ -731,21 +765,248 @@ class FeatureSetCalculator(object):
 
         return frame
 
-    def _necessary_columns(self, entity, feature_names):
+    def _filter_use_previous(self, base_frame, use_previous, child_entity, groupby_var):
+        """Get the rows of base_frame inside the use_previous window."""
+        # if the use_previous property exists on this feature, include only the
+        # instances from the child entity included in that Timedelta
+        if use_previous:
+            # Filter by use_previous values
+            time_last = self.time_last
+            if use_previous.has_no_observations():
+                time_first = time_last - use_previous
+                ti = child_entity.time_index
+                if ti is not None:
+                    base_frame = _filter_time_first(base_frame, ti, time_first)
+            else:
+                n = use_previous.get_value('o')
+                base_frame = base_frame.groupby(base_frame[groupby_var],
+                                                observed=True, sort=False).tail(n)
+
+        return base_frame
+
+    def _aggregate_features(self, features, frame, base_frame, groupby_var,
+                            parent_merge_var, progress_callback):
+        to_agg = {}
+        agg_rename = {}
+        to_apply = set()
+        to_sweep = []
+        # apply multivariable and time-dependent features as we find them, and
+        # save aggregable features for later
+        for f in features:
+            if self.time_sweep is not None and \
+                    self.time_sweep.can_aggregate(f, self.training_window):
+                to_sweep.append(f)
+                continue
+
+            if can_agg(f):
+
+                variable_id = f.base_features[0].get_name()
+                if variable_id not in to_agg:
+                    to_agg[variable_id] = []
+                if isinstance(base_frame, dd.DataFrame):
+                    func = f.get_dask_aggregation()
+                else:
+                    func = f.get_function()
+
+                # for some reason, using the string count is significantly
+                # faster than any method a primitive can return
+                # https://stackoverflow.com/questions/55731149/use-a-function-instead-of-string-in-pandas-groupby-agg
+                if func == pd.Series.count:
+                    func = "count"
+
+                funcname = func
+                if callable(func):
+                    # if the same function is being applied to the same
+                    # variable twice, wrap it in a partial to avoid
+                    # duplicate functions
+                    funcname = str(id(func))
+                    if u"{}-{}".format(variable_id, funcname) in agg_rename:
+                        func = partial(func)
+                        funcname = str(id(func))
+
+                    func.__name__ = funcname
+
+                if isinstance(func, dd.Aggregation):
+                    # TODO: handle aggregation being applied to same variable twice
+                    # (see above partial wrapping of functions)
+                    funcname = func.__name__
+
+                to_agg[variable_id].append(func)
+                # this is used below to rename columns that pandas names for us
+                agg_rename[u"{}-{}".format(variable_id, funcname)] = f.get_name()
+                continue
+
+            to_apply.add(f)
+
+        # Calculate features with a mergeable state from the child rows
+        # added since the previous cutoff time, and merge them with the
+        # existing dataframe
+        if len(to_sweep):
+            to_merge = pd.DataFrame({f.get_name(): self.time_sweep.aggregate(f)
+                                     for f in to_sweep})
+            to_merge = to_merge[to_merge.index.isin(frame.index)]
+
+            # workaround for pandas bug where categories are in the wrong order
+            # see: https://github.com/pandas-dev/pandas/issues/22501
+            if pdtypes.is_categorical_dtype(frame.index):
+                categories = pdtypes.CategoricalDtype(categories=frame.index.categories)
+                to_merge.index = to_merge.index.astype(object).astype(categories)
+
+            frame = merge_feature_columns(frame, to_merge)
+
+            progress_callback(len(to_sweep) / float(self.num_features))
+
+        # Apply the non-aggregable functions generate a new dataframe, and merge
+        # it with the existing one
+        if len(to_apply):
+            wrap = agg_wrapper(to_apply, self.time_last)
+            # groupby_var can be both the name of the index and a column,
+            # to silence pandas warning about ambiguity we explicitly pass
+            # the column (in actuality grouping by both index and group would
+            # work)
+            to_merge = base_frame.groupby(base_frame[groupby_var],
+                                          observed=True,
+                                          sort=False).apply(wrap)
+            frame = merge_feature_columns(frame, to_merge)
+
+            progress_callback(len(to_apply) / float(self.num_features))
+
+        # Apply the aggregate functions to generate a new dataframe, and merge
+        # it with the existing one
+        if len(to_agg):
+            # groupby_var can be both the name of the index and a column,
+            # to silence pandas warning about ambiguity we explicitly pass
+            # the column (in actuality grouping by both index and group would
+            # work)
+            if isinstance(base_frame, dd.DataFrame):
+                to_merge = base_frame.groupby(groupby_var).agg(to_agg)
+
+            else:
+                to_merge = base_frame.groupby(base_frame[groupby_var],
+                                              observed=True, sort=False).agg(to_agg)
+            # rename columns to the correct feature names
+            to_merge.columns = [agg_rename["-".join(x)] for x in to_merge.columns.ravel()]
+            to_merge = to_merge[list(agg_rename.values())]
+
+            # workaround for pandas bug where categories are in the wrong order
+            # see: https://github.com/pandas-dev/pandas/issues/22501
+            if pdtypes.is_categorical_dtype(frame.index):
+                categories = pdtypes.CategoricalDtype(categories=frame.index.categories)
+                to_merge.index = to_merge.index.astype(object).astype(categories)
+
+            if isinstance(frame, dd.DataFrame):
+                frame = frame.merge(to_merge, left_on=parent_merge_var, right_index=True, how='left')
+            else:
+                frame = merge_feature_columns(frame, to_merge)
+
+            # determine number of features that were just merged
+            progress_callback(len(to_merge.columns) / float(self.num_features))
+
+        return frame
+
+    def _calculate_window_family(self, windows, frame, base_frame, time_index,
+                                 groupby_var, progress_callback):
+        """
+        Calculate aggregations which only differ in their use_previous window in
+        a single pass over the child data. The windows all end at time_last, so
+        they are nested. The child data is sorted by time once and cut into
+        slices between consecutive window starts. Starting from the narrowest
+        window, the state of each slice is merged into the state of the
+        previous window to get the state of the next one.
+
+        Returns:
+            (pd.DataFrame, list): The frame with the calculated features added
+                and the (use_previous, features) pairs which still need to be
+                calculated.
+        """
+        families = {}
+        for use_previous, window_features in windows:
+            time_first = self.time_last - use_previous if use_previous else None
+            for f in window_features:
+                if not _can_share_window(f, use_previous):
+                    continue
+                if self.time_sweep is not None and \
+                        self.time_sweep.can_aggregate(f, self.training_window):
+                    continue
+                key = (f.base_features[0].get_name(),
+                       type(f.primitive),
+                       f.primitive.get_args_string())
+                families.setdefault(key, []).append((time_first, f))
+
+        families = [family for family in families.values() if len(family) > 1]
+        if not families:
+            return frame, windows
+
+        shared = {f.unique_name() for family in families for _, f in family}
+        remaining = []
+        for use_previous, window_features in windows:
+            left = [f for f in window_features if f.unique_name() not in shared]
+            if left:
+                remaining.append((use_previous, left))
+
+        times = base_frame[time_index]
+        if not times.is_monotonic_increasing:
+            base_frame = base_frame.sort_values(time_index, kind='mergesort')
+            times = base_frame[time_index]
+
+        columns = {}
+        for family in families:
+            aggregation = family[0][1].get_incremental_aggregation()
+            variable_id = family[0][1].base_features[0].get_name()
+
+            # narrowest window first, no use_previous is the widest window
+            family = sorted(family, key=lambda x: pd.Timestamp.min if x[0] is None else x[0],
+                            reverse=True)
+            state = None
+            end = len(base_frame)
+            for time_first, f in family:
+                start = 0 if time_first is None else \
+                    int(times.searchsorted(time_first, side='left'))
+                if start < end:
+                    rows = base_frame.iloc[start:end]
+                    grouped = rows[variable_id].groupby(rows[groupby_var],
+                                                        observed=True, sort=False)
+                    new_state = aggregation.chunk(grouped)
+                    state = new_state if state is None else aggregation.combine(state, new_state)
+                    end = start
+
+                if state is None:
+                    columns[f.get_name()] = pd.Series(dtype='float64')
+                else:
+                    columns[f.get_name()] = aggregation.finalize(state)
+
+        to_merge = pd.DataFrame(columns)
+        to_merge = to_merge[to_merge.index.isin(frame.index)]
+
+        # workaround for pandas bug where categories are in the wrong order
+        # see: https://github.com/pandas-dev/pandas/issues/22501
+        if pdtypes.is_categorical_dtype(frame.index):
+            categories = pdtypes.CategoricalDtype(categories=frame.index.categories)
+            to_merge.index = to_merge.index.astype(object).astype(categories)
+
+        frame = merge_feature_columns(frame, to_merge)
+        progress_callback(len(columns) / float(self.num_features))
+
+        return frame, remaining
+
+    def _necessary_columns(self, entity, features):
         # We have to keep all Id columns because we don't know what forward
         # relationships will come from this node.
         index_columns = {v.id for v in entity.variables
                          if isinstance(v, (variable_types.Index,
                                            variable_types.Id,
                                            variable_types.TimeIndex))}
-        features = (self.feature_set.features_by_name[name]
-                    for name in feature_names)
         feature_columns = {f.variable.id for f in features
                            if isinstance(f, IdentityFeature)}
         return list(index_columns | feature_columns)
 
 
-def _can_agg(feature):
+def can_agg(feature):
+    """
+    Whether an aggregation feature is calculated by aggregating its base
+    feature with its primitive's function in a groupby, rather than by
+    applying the function to the rows of each instance.
+    """
     assert isinstance(feature, AggregationFeature)
     base_features = feature.base_features
     if feature.where is not None:
@@ -758,6 +1019,40 @@ def _can_agg(feature):
     return len(base_features) == 1 and single_output
 
 
+def _group_by_use_previous(features):
+    """Split features into a list of (use_previous, features) tuples."""
+    windows = []
+    for f in features:
+        for use_previous, window_features in windows:
+            if use_previous == f.use_previous:
+                window_features.append(f)
+                break
+        else:
+            windows.append((f.use_previous, [f]))
+
+    return windows
+
+
+def _can_share_window(feature, use_previous):
+    if use_previous is not None and not use_previous.has_no_observations():
+        return False
+    if not can_agg(feature) or len(feature.base_features) != 1:
+        return False
+    return feature.get_incremental_aggregation() is not None
+
+
+def _filter_time_first(df, time_index, time_first):
+    """Get the rows of the dataframe at or after time_first. Child data is
+    usually still sorted by time, so rather than masking every row the start of
+    the window is found with a binary search and the rows are sliced."""
+    if isinstance(df, pd.DataFrame):
+        times = df[time_index]
+        if times.is_monotonic_increasing:
+            return df.iloc[times.searchsorted(time_first, side='left'):]
+
+    return df[df[time_index] >= time_first]
+
+
 def agg_wrapper(feats, time_last):
     def wrap(df):
         d = {}
@@ -787,6 +1082,16 @@ def set_default_column(frame, f):
         frame[name] = f.default_value
 
 
+def merge_feature_columns(frame, to_merge):
+    """Left join the columns of to_merge onto frame by index."""
+    if isinstance(frame, ColumnStore):
+        to_merge = to_merge.reindex(frame.index)
+        return frame.assign(**{name: to_merge[name] for name in to_merge.columns})
+
+    return pd.merge(left=frame, right=to_merge,
+                    left_index=True, right_index=True, how='left')
+
+
 def update_feature_columns(feature_data, data):
     new_cols = {}
     for item in feature_data:
@@ -808,3 +1113,13 @@ def strip_values_if_series(values):
     if isinstance(values, pd.Series):
         values = values.values
     return values
+
+
+def _synchronized(function):
+    """Wrap a function so that only one thread can call it at a time."""
+    lock = threading.Lock()
+
+    def synchronized(*args, **kwargs):
+        with lock:
+            return function(*args, **kwargs)
+    return synchronized
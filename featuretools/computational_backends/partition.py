@@ -0,0 +1,81 @@
+import copy
+
+import numpy as np
+
+
+def get_entityset_partition(entityset, feature_set, instance_ids):
+    """
+    Get an entityset with only the rows of each entity which can be used to
+    calculate the features of the given instances of the target entity.
+
+    The rows are found by following the relationships of the execution plan
+    of the feature set from the instances, in the same way as
+    FeatureSetCalculator queries the rows of each entity, but without
+    filtering the rows by time. Entities which are used with features that
+    need the full entity keep all of their rows, and entities which are not
+    used keep none.
+
+    Args:
+        entityset (EntitySet): The pandas entityset to partition.
+
+        feature_set (FeatureSet): The features to be calculated.
+
+        instance_ids (list): Ids of instances of the target entity.
+
+    Returns:
+        EntitySet: A copy of the entityset with a subset of the rows of
+            each entity.
+    """
+    rows = {entity.id: np.zeros(len(entity.df), dtype=bool)
+            for entity in entityset.entities}
+    target_entity = entityset[feature_set.target_eid]
+    _add_reachable_rows(entityset,
+                        feature_set.execution_plan,
+                        target_entity.id,
+                        target_entity.index,
+                        instance_ids,
+                        rows)
+
+    # the metadata of an entityset is a copy of it without any data
+    partition = copy.deepcopy(entityset.metadata)
+    for entity in entityset.entities:
+        partition_entity = partition[entity.id]
+        df = entity.df.iloc[np.flatnonzero(rows[entity.id])]
+        partition_entity.df = df
+        last_time_index = entity.last_time_index
+        if last_time_index is not None:
+            last_time_index = last_time_index[last_time_index.index.isin(df.index)]
+        partition_entity.last_time_index = last_time_index
+
+    return partition
+
+
+def _add_reachable_rows(entityset, feature_trie, entity_id, filter_variable,
+                        filter_values, rows):
+    """
+    Mark the rows of the entity matching the filter values, and the rows of
+    other entities reachable from them through the children of the trie.
+    """
+    need_full_entity = feature_trie.value[0]
+    df = entityset[entity_id].df
+    matches = df[filter_variable].isin(filter_values).values
+    if need_full_entity:
+        rows[entity_id][:] = True
+    else:
+        rows[entity_id] |= matches
+
+    # like the calculator, the children are only queried with the values of
+    # the matching rows, even if the full entity is needed
+    filtered_df = df[matches]
+    for (is_forward, relationship), sub_trie in feature_trie.children():
+        if is_forward:
+            sub_entity_id = relationship.parent_entity.id
+            sub_filter_variable = relationship.parent_variable.id
+            sub_filter_values = filtered_df[relationship.child_variable.id]
+        else:
+            sub_entity_id = relationship.child_entity.id
+            sub_filter_variable = relationship.child_variable.id
+            sub_filter_values = filtered_df[relationship.parent_variable.id]
+
+        _add_reachable_rows(entityset, sub_trie, sub_entity_id,
+                            sub_filter_variable, sub_filter_values, rows)
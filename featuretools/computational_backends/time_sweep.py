@@ -0,0 +1,203 @@
+import pandas as pd
+
+from featuretools.feature_base import IdentityFeature
+
+
+class TimeSweep(object):
+    """
+    Sweeps through cutoff times in increasing order, keeping a pointer into the
+    dataframe of each entity to the rows that occur at or before the current
+    cutoff time.
+
+    Entity dataframes are sorted by their time index when the time index is set,
+    so the rows that are valid at a cutoff time are always a prefix of the
+    dataframe. Rather than masking the full time index for every cutoff time,
+    the sweep searches each time index once per cutoff time starting from where
+    the previous cutoff time left off.
+    """
+
+    def __init__(self, entityset, include_cutoff_time=True,
+                 incremental_aggregations=False):
+        """
+        Args:
+            entityset (EntitySet): The entityset to sweep through.
+
+            include_cutoff_time (bool): If True, rows at exactly the cutoff time
+                are included in the prefix for that cutoff time.
+
+            incremental_aggregations (bool): If True, aggregations with a
+                mergeable state are calculated by merging in only the rows
+                added since the previous cutoff time.
+        """
+        self.entityset = entityset
+        self.include_cutoff_time = include_cutoff_time
+        self.incremental_aggregations = incremental_aggregations
+        self.time_last = None
+
+        # Maps entity id to the time index of the entity as a pd.Index, or None
+        # if the rows of the entity cannot be swept.
+        self._time_indexes = {}
+
+        # Maps entity id to a tuple of (time_last, number of rows at or before
+        # time_last).
+        self._positions = {}
+
+        # Maps the unique name of an aggregation feature to a tuple of (first
+        # child row in the state, end of the child rows in the state, state).
+        self._aggregation_states = {}
+
+    def advance(self, time_last):
+        """
+        Move the sweep to the given cutoff time. Moving backwards in time is
+        allowed but resets the sweep, so cutoff times should be passed in
+        increasing order.
+        """
+        if self.time_last is not None and time_last < self.time_last:
+            self._positions = {}
+            self._aggregation_states = {}
+        self.time_last = time_last
+
+    def row_limit(self, entity_id):
+        """
+        Get the number of rows at the start of the entity's dataframe which
+        occur at or before the current cutoff time.
+
+        Returns:
+            int or None: The number of rows, or None if the entity cannot be
+                swept (it has no time index, is not sorted by its time index, or
+                is not a pandas dataframe).
+        """
+        if self.time_last is None:
+            return None
+
+        time_index = self._get_time_index(entity_id)
+        if time_index is None:
+            return None
+
+        last_time, start = self._positions.get(entity_id, (None, 0))
+        if last_time is not None and last_time == self.time_last:
+            return start
+
+        side = 'right' if self.include_cutoff_time else 'left'
+        position = start + time_index[start:].searchsorted(self.time_last, side=side)
+        position = int(position)
+        self._positions[entity_id] = (self.time_last, position)
+
+        return position
+
+    def can_aggregate(self, feature, training_window=None):
+        """
+        Whether the sweep can calculate the aggregation feature incrementally.
+        This is only possible when the primitive has a mergeable state and the
+        values being aggregated only depend on the child rows at or before the
+        cutoff time. Features with a time based use_previous window also need
+        the primitive to support removing values from the state.
+        """
+        if not self.incremental_aggregations or training_window is not None:
+            return False
+        if len(feature.relationship_path) != 1 or len(feature.base_features) != 1:
+            return False
+        if feature.number_output_features != 1:
+            return False
+        aggregation = feature.get_incremental_aggregation()
+        if aggregation is None:
+            return False
+        # Values leave a use_previous window as it slides forward, so they have
+        # to be removed from the state.
+        if feature.use_previous is not None:
+            if not feature.use_previous.has_no_observations() or \
+                    aggregation.subtract is None:
+                return False
+
+        child_entity = feature.relationship_path[0][1].child_entity
+        variables = [feature.base_features[0]]
+        if feature.where is not None:
+            variables.append(feature.where)
+
+        masked = {col for cols in child_entity.secondary_time_index.values()
+                  for col in cols}
+        for variable in variables:
+            if not isinstance(variable, IdentityFeature) or \
+                    variable.entity.id != child_entity.id or \
+                    variable.variable.id in masked:
+                return False
+
+        return self.row_limit(child_entity.id) is not None
+
+    def aggregate(self, feature):
+        """
+        Calculate an aggregation feature for every parent instance using the
+        child rows at or before the current cutoff time. Only the rows added
+        since the previous cutoff time are aggregated, and then merged into the
+        state kept for the feature. If the feature has a use_previous window,
+        the rows which have left the window are removed from the state.
+
+        Returns:
+            pd.Series: Aggregated values indexed by the parent instance id.
+                Parents without any child rows are not included.
+        """
+        child_entity = feature.relationship_path[0][1].child_entity
+        aggregation = feature.get_incremental_aggregation()
+
+        name = feature.unique_name()
+        start, end, state = self._aggregation_states.get(name, (0, 0, None))
+        new_end = self.row_limit(child_entity.id)
+        new_start = 0
+        if feature.use_previous is not None:
+            time_first = self.time_last - feature.use_previous
+            time_index = self._get_time_index(child_entity.id)
+            new_start = int(time_index[:new_end].searchsorted(time_first, side='left'))
+
+        if new_start >= end:
+            # none of the rows in the state are still in the window
+            start, end, state = new_start, new_start, None
+
+        if new_end > end:
+            new_state = self._chunk(feature, aggregation, end, new_end)
+            if new_state is not None:
+                if state is None:
+                    state = new_state
+                else:
+                    state = aggregation.combine(state, new_state)
+            end = new_end
+
+        if new_start > start:
+            old_state = self._chunk(feature, aggregation, start, new_start)
+            if old_state is not None and state is not None:
+                state = aggregation.subtract(state, old_state)
+            start = new_start
+
+        self._aggregation_states[name] = (start, end, state)
+
+        if state is None:
+            return pd.Series(dtype='float64')
+
+        return aggregation.finalize(state)
+
+    def _chunk(self, feature, aggregation, start, end):
+        """Get the state of the child rows in the range [start, end)."""
+        relationship = feature.relationship_path[0][1]
+        rows = self.entityset[relationship.child_entity.id].df.iloc[start:end]
+        if feature.where is not None:
+            rows = rows.loc[rows[feature.where.get_name()]]
+        if rows.empty:
+            return None
+
+        values = rows[feature.base_features[0].get_name()]
+        grouped = values.groupby(rows[relationship.child_variable.id],
+                                 observed=True, sort=False)
+        return aggregation.chunk(grouped)
+
+    def _get_time_index(self, entity_id):
+        if entity_id not in self._time_indexes:
+            entity = self.entityset[entity_id]
+            time_index = None
+            if entity.time_index is not None and isinstance(entity.df, pd.DataFrame):
+                times = entity.df[entity.time_index]
+                # Null times and data which was not sorted when the time index
+                # was set both make the series non monotonic.
+                if times.is_monotonic_increasing:
+                    time_index = pd.Index(times)
+            self._time_indexes[entity_id] = time_index
+
+        return self._time_indexes[entity_id]
@@ -3,6 +3,7 @@ import os
 import warnings
 from functools import wraps
 
+import dask
 import dask.dataframe as dd
 import pandas as pd
 import psutil
@@ -23,30 +24,84 @@ logger = logging.getLogger('featuretools.computational_backend')
 def bin_cutoff_times(cutoff_time, bin_size):
     binned_cutoff_time = cutoff_time.copy()
     if type(bin_size) == int:
-        binned_cutoff_time['time'] = binned_cutoff_time['time'].apply(lambda x: x / bin_size * bin_size)
+        binned_cutoff_time['time'] = binned_cutoff_time['time'] / bin_size * bin_size
     else:
         bin_size = _check_timedelta(bin_size)
         binned_cutoff_time['time'] = datetime_round(binned_cutoff_time['time'], bin_size)
     return binned_cutoff_time
 
 
-def save_csv_decorator(save_progress=None):
+def get_entityset_token(entityset):
+    """
+    Get a token which identifies both the metadata and the data of an
+    entityset. Tokenizing an entityset directly only uses its metadata.
+    """
+    from dask.base import tokenize
+
+    data = [(entity.id, entity.df, entity.last_time_index)
+            for entity in entityset.entities]
+    return tokenize(entityset, data)
+
+
+def save_progress_decorator(save_progress=None, fingerprint=None, ignore_cutoff_time=False):
+    """
+    Save the results of a function calculating part of a feature matrix to
+    save_progress, and load them instead of calling the function if they were
+    already saved by an earlier run.
+
+    The decorated function must take the cutoff time and the instance ids as
+    its first two arguments. Each result is saved to a file named by a token
+    of the fingerprint, the arguments of the call, so a crashed run can be
+    resumed by running it again with the same save_progress. Results are saved
+    as Parquet files if a Parquet engine is installed, and pickled otherwise.
+
+    Args:
+        save_progress (str, optional): Directory to save results to. If None,
+            results are not saved.
+
+        fingerprint (str, optional): Identifies everything besides the
+            arguments which the results depend on, such as the features and
+            the data of the entityset.
+
+        ignore_cutoff_time (bool): If True, the cutoff time is not used to
+            name saved results. Used when the cutoff time is the time of the
+            run rather than a cutoff time given by the user.
+    """
     def inner_decorator(method):
         @wraps(method)
         def wrapped(*args, **kwargs):
             if save_progress is None:
-                r = method(*args, **kwargs)
-            else:
-                time = args[0].to_pydatetime()
-                file_name = 'ft_' + time.strftime("%Y_%m_%d_%I-%M-%S-%f") + '.csv'
-                file_path = os.path.join(save_progress, file_name)
-                temp_dir = os.path.join(save_progress, 'temp')
-                if not os.path.exists(temp_dir):
-                    os.makedirs(temp_dir)
-                temp_file_path = os.path.join(temp_dir, file_name)
-                r = method(*args, **kwargs)
-                r.to_csv(temp_file_path)
-                os.rename(temp_file_path, file_path)
+                return method(*args, **kwargs)
+
+            from dask.base import tokenize
+
+            key_args = args[1:] if ignore_cutoff_time else args
+            token = tokenize(fingerprint, key_args, sorted(kwargs.items()))
+            file_name = 'ft_' + token
+            for extension, read in [('.parquet', pd.read_parquet), ('.pkl', pd.read_pickle)]:
+                file_path = os.path.join(save_progress, file_name + extension)
+                if os.path.exists(file_path):
+                    return read(file_path)
+
+            temp_dir = os.path.join(save_progress, 'temp')
+            if not os.path.exists(temp_dir):
+                os.makedirs(temp_dir)
+
+            r = method(*args, **kwargs)
+            try:
+                extension = '.parquet'
+                temp_file_path = os.path.join(temp_dir, file_name + extension)
+                r.to_parquet(temp_file_path)
+            except (ImportError, ValueError, TypeError):
+                # no parquet engine is installed or the dtypes of the feature
+                # matrix can't be stored in parquet
+                extension = '.pkl'
+                temp_file_path = os.path.join(temp_dir, file_name + extension)
+                r.to_pickle(temp_file_path)
+
+            # only move the file once it is complete, so an interrupted write
+            # is never read back
+            os.rename(temp_file_path, os.path.join(save_progress, file_name + extension))
             return r
         return wrapped
     return inner_decorator
@@ -181,7 +236,16 @@ def create_client_and_cluster(n_jobs, dask_kwargs, entityset_size):
                     print(msg.format(info['services']['bokeh']))
 
     client = Client(cluster)
+    check_worker_memory(client, entityset_size)
+
+    return client, cluster
+
 
+def check_worker_memory(client, entityset_size):
+    """
+    Raise an error if an entityset of the given size does not fit in the
+    memory of the workers of the client, and warn if it barely fits.
+    """
     warned_of_memory = False
     for worker in list(client.scheduler_info()['workers'].values()):
         worker_limit = worker['memory_limit']
@@ -195,8 +259,6 @@ def create_client_and_cluster(n_jobs, dask_kwargs, entityset_size):
                            " for more information.")
             warned_of_memory = True
 
-    return client, cluster
-
 
 def get_client_cluster():
     """
@@ -206,18 +268,19 @@ def get_client_cluster():
     return Client, LocalCluster
 
 
-def _validate_cutoff_time(cutoff_time, target_entity):
+def _validate_cutoff_time(cutoff_time, target_entity, keep_dask=False):
     """
     Verify that the cutoff time is a single value or a pandas dataframe with the proper columns
-    containing no duplicate rows
+    containing no duplicate rows. If keep_dask is True, a Dask dataframe is not computed, and
+    only its numbers of rows and of unique rows are computed to check for duplicate rows.
     """
-    if isinstance(cutoff_time, dd.DataFrame):
+    if isinstance(cutoff_time, dd.DataFrame) and not keep_dask:
         msg = "cutoff_time should be a Pandas DataFrame: "\
             "computing cutoff_time, this may take a while"
         warnings.warn(msg)
         cutoff_time = cutoff_time.compute()
 
-    if isinstance(cutoff_time, pd.DataFrame):
+    if isinstance(cutoff_time, (pd.DataFrame, dd.DataFrame)):
         cutoff_time = cutoff_time.reset_index(drop=True)
 
         if "instance_id" not in cutoff_time.columns:
@@ -225,14 +288,14 @@ def _validate_cutoff_time(cutoff_time, target_entity):
                 raise AttributeError('Cutoff time DataFrame must contain a column with either the same name'
                                      ' as the target entity index or a column named "instance_id"')
             # rename to instance_id
-            cutoff_time.rename(columns={target_entity.index: "instance_id"}, inplace=True)
+            cutoff_time = cutoff_time.rename(columns={target_entity.index: "instance_id"})
 
         if "time" not in cutoff_time.columns:
             if target_entity.time_index and target_entity.time_index not in cutoff_time.columns:
                 raise AttributeError('Cutoff time DataFrame must contain a column with either the same name'
                                      ' as the target entity time_index or a column named "time"')
             # rename to time
-            cutoff_time.rename(columns={target_entity.time_index: "time"}, inplace=True)
+            cutoff_time = cutoff_time.rename(columns={target_entity.time_index: "time"})
 
         # Make sure user supplies only one valid name for instance id and time columns
         if "instance_id" in cutoff_time.columns and target_entity.index in cutoff_time.columns and \
@@ -244,8 +307,15 @@ def _validate_cutoff_time(cutoff_time, target_entity):
             raise AttributeError('Cutoff time DataFrame cannot contain both a column named "time" and a column'
                                  ' with the same name as the target entity time index')
 
-        assert (cutoff_time[['instance_id', 'time']].duplicated().sum() == 0), \
-            "Duplicated rows in cutoff time dataframe."
+        pairs = cutoff_time[['instance_id', 'time']]
+        if isinstance(pairs, dd.DataFrame):
+            # only the numbers of rows are computed, rather than collecting
+            # the cutoff times
+            num_rows, num_unique = dask.compute(pairs.shape[0], pairs.drop_duplicates().shape[0])
+            num_duplicated = num_rows - num_unique
+        else:
+            num_duplicated = pairs.duplicated().sum()
+        assert (num_duplicated == 0), "Duplicated rows in cutoff time dataframe."
     else:
         if isinstance(cutoff_time, list):
             raise TypeError("cutoff_time must be a single value or DataFrame")
@@ -68,6 +68,13 @@ class Entity(object):
         self.id = id
         self.entityset = entityset
         self.data = {'df': df, 'last_time_index': last_time_index}
+        # Maps the ids of variables to index the rows by to the index, or None
+        # if the index has not been built for the current dataframe.
+        self._row_indexes = {}
+        # Whether the time index of the dataframe is sorted, and the last time
+        # index aligned to the rows of the dataframe, or None if not computed.
+        self._time_index_sorted = None
+        self._aligned_last_time_index = None
         self.created_index = created_index
         self._verbose = verbose
 
@@ -140,6 +147,10 @@ class Entity(object):
     @df.setter
     def df(self, _df):
         self.data["df"] = _df
+        # the row positions of the old dataframe don't apply to the new one
+        self._row_indexes = dict.fromkeys(self._row_indexes)
+        self._time_index_sorted = None
+        self._aligned_last_time_index = None
 
     @property
     def last_time_index(self):
@@ -151,6 +162,7 @@ class Entity(object):
     @last_time_index.setter
     def last_time_index(self, lti):
         self.data["last_time_index"] = lti
+        self._aligned_last_time_index = None
 
     def __hash__(self):
         return id(self.id)
@@ -213,7 +225,8 @@ class Entity(object):
         self.variables[self.variables.index(variable)] = new_variable
 
     def query_by_values(self, instance_vals, variable_id=None, columns=None,
-                        time_last=None, training_window=None, include_cutoff_time=True):
+                        time_last=None, training_window=None, include_cutoff_time=True,
+                        row_limit=None):
         """Query instances that have variable with given value
 
         Args:
@@ -228,6 +241,9 @@ class Entity(object):
                 can be used when calculating features. If None, all data before cutoff time is used.
             include_cutoff_time (bool):
                 If True, data at cutoff time are included in calculating features
+            row_limit (int, optional) : Only query the first row_limit rows of
+                the dataframe. Used when the caller already knows that no later
+                rows occur before time_last. Only applies to pandas dataframes.
 
         Returns:
             pd.DataFrame : instances that match constraints with ids in order of underlying dataframe
@@ -242,20 +258,45 @@ class Entity(object):
         if training_window is not None:
             assert training_window.has_no_observations(), "Training window cannot be in observations"
 
+        entity_df = self.df
+        is_pandas = isinstance(entity_df, pd.DataFrame)
+        row_index = None
+        if is_pandas:
+            row_index = self._get_row_index(variable_id)
+        if row_limit is not None and is_pandas:
+            entity_df = entity_df.iloc[:row_limit]
+
+        # Only copy the columns which are returned or needed to filter the rows.
+        column_positions = slice(None)
+        if columns is not None and is_pandas:
+            query_columns = self._get_query_columns(columns, variable_id)
+            column_positions = entity_df.columns.get_indexer(query_columns)
+
         if instance_vals is None:
-            df = self.df.copy()
+            # The rows are selected without copying them, and only the rows
+            # and columns which are returned get copied below.
+            df = entity_df
 
         elif isinstance(instance_vals, pd.Series) and instance_vals.empty:
-            df = self.df.head(0)
+            df = entity_df.head(0)
 
         else:
             if isinstance(instance_vals, dd.Series):
-                df = self.df.merge(instance_vals.to_frame(), how="inner", on=variable_id)
+                df = entity_df.merge(instance_vals.to_frame(), how="inner", on=variable_id)
+            elif row_index is not None:
+                positions = _get_row_positions(row_index, instance_vals)
+                if row_limit is not None:
+                    positions = positions[positions < row_limit]
+                df = entity_df.iloc[positions, column_positions]
+            elif is_pandas:
+                mask = entity_df[variable_id].isin(instance_vals).values
+                df = entity_df.iloc[mask, column_positions]
             else:
-                df = self.df[self.df[variable_id].isin(instance_vals)]
+                df = entity_df[entity_df[variable_id].isin(instance_vals)]
 
-            if isinstance(self.df, pd.DataFrame):
-                df = df.set_index(self.index, drop=False)
+            if is_pandas:
+                # the rows were already copied by iloc
+                df.index = pd.Index(df[self.index], name=self.index)
 
             # ensure filtered df has same categories as original
             # workaround for issue below
@@ -271,6 +312,9 @@ class Entity(object):
 
         if columns is not None:
             df = df[columns]
+        elif instance_vals is None and is_pandas:
+            # never return the entity's own data
+            df = df.copy()
 
         return df
 
@@ -351,6 +395,44 @@ class Entity(object):
             self.entityset.add_last_time_indexes(updated_entities=[self.id])
         self.entityset.reset_data_description()
 
+    def add_row_indexes(self, variable_ids=None):
+        """
+        Index the rows of the entity by the values of variables, so that
+        query_by_values looks up the positions of the rows matching the
+        queried values instead of comparing every row to them. Each index is
+        built the first time it is used, and rebuilt when the data of the
+        entity changes. Only applies to pandas dataframes.
+
+        Args:
+            variable_ids (list[str], optional): Variables to index the rows by.
+                If None, the index and all Id variables of the entity are used.
+        """
+        if isinstance(self.df, dd.DataFrame):
+            raise ValueError("Row indexes are not supported with Dask Entities")
+
+        if variable_ids is None:
+            variable_ids = [v.id for v in self.variables
+                            if isinstance(v, (vtypes.Index, vtypes.Id))]
+
+        for variable_id in variable_ids:
+            self._get_variable(variable_id)
+            self._row_indexes.setdefault(variable_id, None)
+
+    def _get_row_index(self, variable_id):
+        """
+        Get the index of the rows by the values of the variable, or None if the
+        rows are not indexed by the variable.
+        """
+        if variable_id not in self._row_indexes:
+            return None
+
+        row_index = self._row_indexes[variable_id]
+        if row_index is None:
+            row_index = pd.Index(self.df[variable_id])
+            self._row_indexes[variable_id] = row_index
+
+        return row_index
+
     def add_interesting_values(self, max_values=5, verbose=False):
         """
         Find interesting values for categorical variables, to be used to
@@ -465,6 +547,7 @@ class Entity(object):
         self.convert_variable_type(variable_id, t, convert_data=False)
 
         self.time_index = variable_id
+        self._time_index_sorted = None
 
     def set_index(self, variable_id, unique=True):
         """
@@ -533,11 +616,15 @@ class Entity(object):
         """
         Filter a dataframe for all instances before time_last.
         If this entity does not have a time index, return the original
-        dataframe.
+        dataframe. The rows of the dataframe must be in the same order as
+        in the dataframe of the entity. The dataframe is never modified, but
+        the returned dataframe may share data with it.
         """
         if self.time_index:
             df_empty = df.empty if isinstance(df, pd.DataFrame) else False
-            if time_last is not None and not df_empty:
+            if self._can_slice_by_time(df, time_last):
+                df = self._slice_by_time(df, time_last, training_window, include_cutoff_time)
+            elif time_last is not None and not df_empty:
                 if include_cutoff_time:
                     df = df[df[self.time_index] <= time_last]
                 else:
@@ -571,11 +658,84 @@ class Entity(object):
                 if isinstance(df, dd.DataFrame):
                     for col in columns:
                         df[col] = df[col].mask(mask, np.nan)
-                else:
+                elif mask.any():
+                    # the dataframe may share its data with the entity
+                    df = df.copy()
                     df.loc[mask, columns] = np.nan
 
         return df
 
+    def _get_query_columns(self, columns, variable_id):
+        """Get the columns of the dataframe needed to return the given
+        columns from query_by_values, in the order of the dataframe."""
+        needed = set(columns) | {self.index, variable_id}
+        if self.time_index is not None:
+            needed.add(self.time_index)
+        for secondary_time_index, secondary_columns in self.secondary_time_index.items():
+            needed.add(secondary_time_index)
+            needed.update(secondary_columns)
+        return [column for column in self.df.columns if column in needed]
+
+    def _time_index_is_sorted(self):
+        """Check whether the time index of the dataframe is sorted."""
+        if self._time_index_sorted is None:
+            self._time_index_sorted = self.df[self.time_index].is_monotonic_increasing
+        return self._time_index_sorted
+
+    def _can_slice_by_time(self, df, time_last):
+        """Check whether a dataframe can be filtered by time with
+        _slice_by_time."""
+        return (time_last is not None and
+                self.time_index is not None and
+                isinstance(df, pd.DataFrame) and
+                not df.empty and
+                self._time_index_is_sorted())
+
+    def _get_aligned_last_time_index(self, df, stop):
+        """Get the last time index for the first rows of a dataframe of this
+        entity, up to position stop. The last time index aligned to the
+        dataframe of the entity itself is cached."""
+        if df is not self.df:
+            return self.last_time_index.reindex(df.index[:stop])
+        if self._aligned_last_time_index is None:
+            self._aligned_last_time_index = self.last_time_index.reindex(self.df.index)
+        return self._aligned_last_time_index.iloc[:stop]
+
+    def _slice_by_time(self, df, time_last, training_window=None, include_cutoff_time=True):
+        """
+        Filter a dataframe for all instances before time_last, like
+        _handle_time. Since the time index is sorted, the rows to keep are
+        found by searching for the positions of the time bounds rather than
+        comparing every row to them. Rows are sliced without copying them
+        where possible.
+        """
+        side = 'right' if include_cutoff_time else 'left'
+        time_values = df[self.time_index]
+        end = time_values.searchsorted(time_last, side=side)
+        if training_window is None:
+            return df.iloc[:end]
+
+        training_window = _check_timedelta(training_window)
+        time_first = time_last - training_window
+        start = min(time_values.searchsorted(time_first, side=side), end)
+        if self.last_time_index is None:
+            warnings.warn(
+                "Using training_window but last_time_index is "
+                "not set on entity %s" % (self.id)
+            )
+            return df.iloc[start:end]
+
+        # instances before the training window are kept if they have
+        # children in it
+        lti_slice = self._get_aligned_last_time_index(df, start)
+        if include_cutoff_time:
+            lti_mask = lti_slice > time_first
+        else:
+            lti_mask = lti_slice >= time_first
+        positions = np.concatenate([np.flatnonzero(lti_mask.values),
+                                    np.arange(start, end)])
+        return df.iloc[positions]
+
 
 def _create_index(index, make_index, df):
     '''Handles index creation logic base on user input'''
@@ -619,3 +779,19 @@ def _validate_entity_params(id, df, time_index):
                              "is not a string)".format(c))
     if time_index is not None and time_index not in df.columns:
         raise LookupError('Time index not found in dataframe')
+
+
+def _get_row_positions(row_index, values):
+    """
+    Get the sorted positions of the rows whose values in row_index are in
+    values, without comparing every row to the values.
+    """
+    values = pd.unique(values)
+    if row_index.is_unique:
+        positions = row_index.get_indexer(values)
+    else:
+        positions, _ = row_index.get_indexer_non_unique(values)
+
+    positions = positions[positions >= 0]
+    positions.sort()
+    return positions
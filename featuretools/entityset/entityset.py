@@ -610,7 +610,8 @@ class EntitySet(object):
                 transfer_types[v] = type(base_entity[v])
 
         # create and add new entity
-        new_entity_df = self[base_entity_id].df.copy()
+        # the base dataframe is not modified, so it is not copied
+        new_entity_df = self[base_entity_id].df
 
         if make_time_index is None and base_entity.time_index is not None:
             make_time_index = True
@@ -750,6 +751,22 @@ class EntitySet(object):
     ###########################################################################
     #  Indexing methods  ###############################################
     ###########################################################################
+    def add_row_indexes(self, entity_ids=None):
+        """
+        Index the rows of entities by their index and Id variables, so that
+        rows related to a few instances are looked up by their positions
+        instead of scanning each entity. See :meth:`.Entity.add_row_indexes`.
+
+        Args:
+            entity_ids (list[str], optional): Ids of entities to index. If None,
+                all entities are indexed.
+        """
+        if entity_ids is None:
+            entity_ids = [entity.id for entity in self.entities]
+
+        for entity_id in entity_ids:
+            self[entity_id].add_row_indexes()
+
     def add_last_time_indexes(self, updated_entities=None):
         """
         Calculates the last time index values for each entity (the last time
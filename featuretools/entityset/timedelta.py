@@ -176,6 +176,9 @@ class Timedelta(object):
         else:
             return False
 
+    def __dask_tokenize__(self):
+        return (Timedelta, self.get_arguments())
+
     def __eq__(self, other):
         if not isinstance(other, Timedelta):
             return False
@@ -633,6 +633,9 @@ class AggregationFeature(FeatureBase):
     def get_dask_aggregation(self):
         return self.primitive.get_dask_aggregation()
 
+    def get_incremental_aggregation(self):
+        return self.primitive.get_incremental_aggregation()
+
     def relationship_path_name(self):
         if self._path_is_unique:
             return self.child_entity.id
@@ -721,6 +724,17 @@ class GroupByTransformFeature(TransformFeature):
         _name = self.primitive.generate_name(base_names)
         return u"{} by {}".format(_name, self.groupby.get_name())
 
+    def get_groupby_function(self):
+        # A subclass of a primitive which only overrides get_function must be
+        # calculated with its own function rather than the groupby function
+        # inherited from the primitive it subclasses.
+        for cls in type(self.primitive).__mro__:
+            if 'get_groupby_function' in vars(cls):
+                break
+            if 'get_function' in vars(cls):
+                return None
+        return self.primitive.get_groupby_function()
+
     def generate_names(self):
         base_names = [bf.get_name() for bf in self.base_features[:-1]]
         _names = self.primitive.generate_names(base_names)
@@ -38,6 +38,47 @@ class AggregationPrimitive(PrimitiveBase):
     def get_dask_aggregation(self):
         raise NotImplementedError("Subclass must implement")
 
+    def get_incremental_aggregation(self):
+        """Returns an :class:`.IncrementalAggregation` describing how to
+        calculate this primitive by merging the results of batches of data, or
+        None if the primitive must always be calculated over all of the data."""
+        return None
+
+
+class IncrementalAggregation(object):
+    """Describes how to calculate an aggregation from batches of data by
+    keeping a mergeable state for each group.
+
+    Args:
+        chunk (callable): Takes a ``SeriesGroupBy`` of the values in a batch
+            and returns their state, a pd.DataFrame indexed by group.
+
+        combine (callable): Takes two states and returns the state of all of
+            their values. A group may only be present in one of the states.
+
+        finalize (callable): Takes a state and returns a pd.Series of the
+            aggregated values indexed by group.
+
+        subtract (callable, optional): Takes a state and the state of some of
+            its values and returns the state of the remaining values. Groups
+            with no values remaining are dropped. Only given when values can
+            be removed from a state, which allows sliding windows to be
+            calculated without recomputing the values still in the window.
+
+        accumulate (callable, optional): Takes a state whose rows are in order
+            and an array of the group each row belongs to, and returns the
+            state of each row combined with the rows before it in the same
+            group. Allows the aggregation to be calculated at many cutoff
+            times in a single pass over the data.
+    """
+
+    def __init__(self, chunk, combine, finalize, subtract=None, accumulate=None):
+        self.chunk = chunk
+        self.combine = combine
+        self.finalize = finalize
+        self.subtract = subtract
+        self.accumulate = accumulate
+
 
 def make_agg_primitive(function, input_types, return_type, name=None,
                        stack_on_self=True, stack_on=None,
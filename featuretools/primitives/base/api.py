@@ -1,6 +1,7 @@
 # flake8: noqa
 from .aggregation_primitive_base import (
     AggregationPrimitive,
+    IncrementalAggregation,
     make_agg_primitive
 )
 from .primitive_base import PrimitiveBase
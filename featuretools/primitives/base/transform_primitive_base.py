@@ -13,6 +13,13 @@ class TransformPrimitive(PrimitiveBase):
     #   (and will receive these values as input, regardless of specified instance ids)
     uses_full_entity = False
 
+    def get_groupby_function(self):
+        """Returns a function which calculates this primitive for every group
+        at once, or None if the function has to be applied to each group
+        separately. The function takes a ``SeriesGroupBy`` for each input and
+        returns values aligned with the rows of the grouped data."""
+        return None
+
     def generate_name(self, base_feature_names):
         return u"%s(%s%s)" % (
             self.name.upper(),
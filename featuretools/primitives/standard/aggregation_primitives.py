@@ -6,7 +6,8 @@ from dask import dataframe as dd
 from scipy import stats
 
 from featuretools.primitives.base.aggregation_primitive_base import (
-    AggregationPrimitive
+    AggregationPrimitive,
+    IncrementalAggregation
 )
 from featuretools.utils import convert_time_units
 from featuretools.variable_types import (
@@ -41,6 +42,19 @@ class Count(AggregationPrimitive):
     def get_dask_aggregation(self):
         return 'count'
 
+    def get_incremental_aggregation(self):
+        def chunk(s):
+            return s.count().to_frame('count')
+
+        def finalize(state):
+            return state['count']
+
+        return IncrementalAggregation(chunk=chunk,
+                                      combine=_combine_states('sum'),
+                                      finalize=finalize,
+                                      accumulate=_accumulate_states('sum'),
+                                      subtract=_subtract_states)
+
     def generate_name(self, base_feature_names, relationship_path_name,
                       parent_entity_id, where_str, use_prev_str):
         return u"COUNT(%s%s%s)" % (relationship_path_name,
@@ -69,6 +83,19 @@ class Sum(AggregationPrimitive):
     def get_dask_aggregation(self):
         return 'sum'
 
+    def get_incremental_aggregation(self):
+        def chunk(s):
+            return pd.DataFrame({'sum': s.sum(), 'count': s.size()})
+
+        def finalize(state):
+            return state['sum']
+
+        return IncrementalAggregation(chunk=chunk,
+                                      combine=_combine_states('sum'),
+                                      finalize=finalize,
+                                      accumulate=_accumulate_states('sum'),
+                                      subtract=_subtract_states)
+
 
 class Mean(AggregationPrimitive):
     """Computes the average for a list of values.
@@ -109,6 +136,22 @@ class Mean(AggregationPrimitive):
     def get_dask_aggregation(self):
         return 'mean'
 
+    def get_incremental_aggregation(self):
+        if not self.skipna:
+            return None
+
+        def chunk(s):
+            return pd.DataFrame({'sum': s.sum(), 'count': s.count()})
+
+        def finalize(state):
+            return state['sum'] / state['count']
+
+        return IncrementalAggregation(chunk=chunk,
+                                      combine=_combine_states('sum'),
+                                      finalize=finalize,
+                                      accumulate=_accumulate_states('sum'),
+                                      subtract=_subtract_states)
+
 
 class Mode(AggregationPrimitive):
     """Determines the most commonly repeated value.
@@ -154,6 +197,18 @@ class Min(AggregationPrimitive):
     def get_dask_aggregation(self):
         return 'min'
 
+    def get_incremental_aggregation(self):
+        def chunk(s):
+            return s.min().to_frame('min')
+
+        def finalize(state):
+            return state['min']
+
+        return IncrementalAggregation(chunk=chunk,
+                                      combine=_combine_states('min'),
+                                      finalize=finalize,
+                                      accumulate=_accumulate_states('min'))
+
 
 class Max(AggregationPrimitive):
     """Calculates the highest value, ignoring `NaN` values.
@@ -175,6 +230,18 @@ class Max(AggregationPrimitive):
     def get_dask_aggregation(self):
         return 'max'
 
+    def get_incremental_aggregation(self):
+        def chunk(s):
+            return s.max().to_frame('max')
+
+        def finalize(state):
+            return state['max']
+
+        return IncrementalAggregation(chunk=chunk,
+                                      combine=_combine_states('max'),
+                                      finalize=finalize,
+                                      accumulate=_accumulate_states('max'))
+
 
 class NumUnique(AggregationPrimitive):
     """Determines the number of distinct values, ignoring `NaN` values.
@@ -470,6 +537,45 @@ class Std(AggregationPrimitive):
     def get_dask_aggregation(self):
         return 'std'
 
+    def get_incremental_aggregation(self):
+        # keep the count, mean and sum of squared differences from the mean
+        # of each group, which can be merged without loss of precision
+        def chunk(s):
+            count = s.count()
+            return pd.DataFrame({'count': count,
+                                 'mean': s.mean().fillna(0),
+                                 'm2': (s.var(ddof=0) * count).fillna(0)})
+
+        def combine(state, other):
+            state, other = state.align(other, fill_value=0)
+            count = state['count'] + other['count']
+            delta = other['mean'] - state['mean']
+            mean = state['mean'] + (delta * other['count'] / count).fillna(0)
+            m2 = state['m2'] + other['m2'] + \
+                (delta ** 2 * state['count'] * other['count'] / count).fillna(0)
+            return pd.DataFrame({'count': count, 'mean': mean, 'm2': m2})
+
+        def finalize(state):
+            variance = state['m2'] / (state['count'] - 1)
+            return np.sqrt(variance.where(state['count'] > 1))
+
+        def accumulate(state, groups):
+            # running sums of the values and their squares can be added up
+            total = state['mean'] * state['count']
+            squares = state['m2'] + state['mean'] * total
+            sums = pd.DataFrame({'count': state['count'],
+                                 'total': total,
+                                 'squares': squares})
+            sums = sums.groupby(groups, sort=False).cumsum()
+            mean = (sums['total'] / sums['count']).fillna(0)
+            m2 = (sums['squares'] - mean * sums['total']).clip(lower=0)
+            return pd.DataFrame({'count': sums['count'], 'mean': mean, 'm2': m2})
+
+        return IncrementalAggregation(chunk=chunk,
+                                      combine=combine,
+                                      finalize=finalize,
+                                      accumulate=accumulate)
+
 
 class First(AggregationPrimitive):
     """Determines the first value in a list.
@@ -787,3 +893,30 @@ class Entropy(AggregationPrimitive):
             return stats.entropy(distribution, base=self.base)
 
         return pd_entropy
+
+
+def _combine_states(how):
+    """Combine states by applying a reduction to the rows of each group."""
+    def combine(state, other):
+        combined = pd.concat([state, other])
+        return combined.groupby(level=0, observed=True, sort=False).agg(how)
+
+    return combine
+
+
+def _accumulate_states(how):
+    """Accumulate states by applying a running reduction to the rows of each
+    group."""
+    def accumulate(state, groups):
+        accumulated = getattr(state.groupby(groups, sort=False), 'cum' + how)()
+        # running reductions are null at rows which only have null values
+        return accumulated.groupby(groups, sort=False).ffill()
+
+    return accumulate
+
+
+def _subtract_states(state, other):
+    """Subtract the sums in one state from another. Groups whose count drops
+    to zero have no values left and are dropped."""
+    difference = state.sub(other, fill_value=0)
+    return difference[difference['count'] > 0]
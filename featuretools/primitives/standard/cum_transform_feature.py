@@ -30,6 +30,12 @@ class CumSum(TransformPrimitive):
 
         return cum_sum
 
+    def get_groupby_function(self):
+        def cum_sum(values):
+            return values.cumsum()
+
+        return cum_sum
+
 
 class CumCount(TransformPrimitive):
     """Calculates the cumulative count.
@@ -56,6 +62,12 @@ class CumCount(TransformPrimitive):
 
         return cum_count
 
+    def get_groupby_function(self):
+        def cum_count(values):
+            return values.cumcount() + 1
+
+        return cum_count
+
 
 class CumMean(TransformPrimitive):
     """Calculates the cumulative mean.
@@ -83,6 +95,12 @@ class CumMean(TransformPrimitive):
 
         return cum_mean
 
+    def get_groupby_function(self):
+        def cum_mean(values):
+            return values.cumsum() / (values.cumcount() + 1)
+
+        return cum_mean
+
 
 class CumMin(TransformPrimitive):
     """Calculates the cumulative minimum.
@@ -110,6 +128,12 @@ class CumMin(TransformPrimitive):
 
         return cum_min
 
+    def get_groupby_function(self):
+        def cum_min(values):
+            return values.cummin()
+
+        return cum_min
+
 
 class CumMax(TransformPrimitive):
     """Calculates the cumulative maximum.
@@ -136,3 +160,9 @@ class CumMax(TransformPrimitive):
             return values.cummax()
 
         return cum_max
+
+    def get_groupby_function(self):
+        def cum_max(values):
+            return values.cummax()
+
+        return cum_max
@@ -97,6 +97,11 @@ class TimeSincePrevious(TransformPrimitive):
             return convert_time_units(values.diff().apply(lambda x: x.total_seconds()), self.unit)
         return pd_diff
 
+    def get_groupby_function(self):
+        def pd_diff(values):
+            return convert_time_units(values.diff().dt.total_seconds(), self.unit)
+        return pd_diff
+
 
 class Day(TransformPrimitive):
     """Determines the day of the month from a datetime.
@@ -461,6 +466,11 @@ class Diff(TransformPrimitive):
             return values.diff()
         return pd_diff
 
+    def get_groupby_function(self):
+        def pd_diff(values):
+            return values.diff()
+        return pd_diff
+
 
 class Negate(TransformPrimitive):
     """Negates a numeric value.
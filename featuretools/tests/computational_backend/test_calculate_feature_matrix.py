@@ -16,14 +16,25 @@ from distributed.utils_test import cluster
 from tqdm import tqdm
 
 import featuretools as ft
-from featuretools import EntitySet, Timedelta, calculate_feature_matrix, dfs
+from featuretools import (
+    ComputeSession,
+    EntitySet,
+    Timedelta,
+    calculate_feature_matrix,
+    dfs
+)
 from featuretools.computational_backends import utils
 from featuretools.computational_backends.calculate_feature_matrix import (
+    ADAPTIVE_INITIAL_CHUNK_SIZE,
     FEATURE_CALCULATION_PERCENTAGE,
+    _AdaptiveChunker,
     _chunk_dataframe_groups,
     _handle_chunk_size,
     scatter_warning
 )
+from featuretools.computational_backends.feature_set_calculator import (
+    FeatureSetCalculator
+)
 from featuretools.computational_backends.utils import (
     bin_cutoff_times,
     create_client_and_cluster,
@@ -341,10 +352,10 @@ def test_saveprogress(es, tmpdir):
     assert len(files) == 17
     list_df = []
     for file_ in files:
-        df = pd.read_csv(file_, index_col="id", header=0)
+        df = pd.read_parquet(file_)
+        assert df.index.name == 'id'
         list_df.append(df)
     merged_df = pd.concat(list_df)
-    merged_df.set_index(pd.DatetimeIndex(times), inplace=True, append=True)
     fm_no_save = calculate_feature_matrix([property_feature],
                                           es,
                                           cutoff_time=cutoff_time)
@@ -354,6 +365,68 @@ def test_saveprogress(es, tmpdir):
     shutil.rmtree(save_progress)
 
 
+def test_saveprogress_resumes(pd_es, tmpdir, monkeypatch):
+    times = [datetime(2011, 4, 9, 10, 30, i * 6) for i in range(5)]
+    cutoff_time = pd.DataFrame({'time': times, 'instance_id': range(5)})
+    features = [ft.Feature(pd_es['log']['value']) > 10,
+                ft.Feature(pd_es['log']['product_id'])]
+    save_progress = str(tmpdir)
+    fm_save = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                       save_progress=save_progress)
+    assert len(os.listdir(save_progress)) == 5
+
+    # remove one of the saved parts as if the earlier run crashed before it
+    os.remove(os.path.join(save_progress, sorted(os.listdir(save_progress))[0]))
+    calculated = []
+    run = FeatureSetCalculator.run
+
+    def run_and_count(self, instance_ids, *args, **kwargs):
+        calculated.append(instance_ids)
+        return run(self, instance_ids, *args, **kwargs)
+
+    monkeypatch.setattr(FeatureSetCalculator, 'run', run_and_count)
+    fm_resumed = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                          save_progress=save_progress)
+    assert len(calculated) == 1
+    pd.testing.assert_frame_equal(fm_resumed, fm_save)
+
+    # parts saved for different data are not reused
+    df = pd_es['log'].df.copy()
+    df['value'] = df['value'] + 100
+    pd_es['log'].update_data(df, already_sorted=True)
+    calculated.clear()
+    fm_changed = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                          save_progress=save_progress)
+    assert len(calculated) == 5
+    assert fm_changed[features[0].get_name()].all()
+
+
+def test_saveprogress_skips_approximate(pd_es, tmpdir, monkeypatch):
+    agg_feat = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)
+    dfeat = DirectFeature(agg_feat, pd_es['log'])
+    times = [datetime(2011, 4, 9, 10, 31, 19), datetime(2011, 4, 9, 11, 0, 0)]
+    cutoff_time = pd.DataFrame({'time': times, 'instance_id': [0, 2]})
+    save_progress = str(tmpdir)
+    fm_save = calculate_feature_matrix([dfeat], pd_es, cutoff_time=cutoff_time,
+                                       approximate=Timedelta(10, 's'),
+                                       save_progress=save_progress)
+
+    calculated = []
+    run = FeatureSetCalculator.run
+
+    def run_and_count(self, instance_ids, *args, **kwargs):
+        calculated.append(instance_ids)
+        return run(self, instance_ids, *args, **kwargs)
+
+    monkeypatch.setattr(FeatureSetCalculator, 'run', run_and_count)
+    fm_resumed = calculate_feature_matrix([dfeat], pd_es, cutoff_time=cutoff_time,
+                                          approximate=Timedelta(10, 's'),
+                                          save_progress=save_progress)
+    # neither the approximated features nor the feature matrix are calculated
+    assert calculated == []
+    pd.testing.assert_frame_equal(fm_resumed, fm_save)
+
+
 def test_cutoff_time_correctly(es):
     if any(isinstance(entity.df, dd.DataFrame) for entity in es.entities):
         pytest.xfail('Dask result not ordered')
@@ -392,6 +465,10 @@ def test_cutoff_time_binning():
     for i in binned_cutoff_times.index:
         assert binned_cutoff_times['time'][i] == labels[i]
 
+    binned_cutoff_times = bin_cutoff_times(dd.from_pandas(cutoff_time, npartitions=2),
+                                           Timedelta(25, 'h'))
+    assert binned_cutoff_times['time'].compute().tolist() == labels
+
     error_text = "Unit is relative"
     with pytest.raises(ValueError, match=error_text):
         binned_cutoff_times = bin_cutoff_times(cutoff_time, Timedelta(1, 'mo'))
@@ -730,15 +807,28 @@ def test_training_window_recent_time_index(pd_es):
     assert (feature_matrix[dagg.get_name()] == dagg_values).values.all()
 
 
-def test_approximate_fails_dask(dask_es):
-    agg_feat = ft.Feature(dask_es['log']['id'],
-                          parent_entity=dask_es['sessions'],
-                          primitive=Count)
-    error_text = "Using approximate is not supported with Dask Entities"
-    with pytest.raises(ValueError, match=error_text):
-        calculate_feature_matrix([agg_feat],
-                                 dask_es,
-                                 approximate=Timedelta(1, 'week'))
+def test_approximate_dask(pd_es, dask_es):
+    def make_features(es):
+        agg_feat = ft.Feature(es['log']['id'], parent_entity=es['sessions'], primitive=Count)
+        agg_feat2 = ft.Feature(agg_feat, parent_entity=es['customers'], primitive=Sum)
+        return [DirectFeature(agg_feat2, es['sessions']), agg_feat]
+
+    cutoff_time = pd.DataFrame({
+        'time': [datetime(2011, 4, 9, 10, 31, 19), datetime(2011, 4, 9, 11, 0, 0),
+                 datetime(2011, 4, 10, 11, 0, 0), datetime(2011, 4, 10, 11, 0, 0)],
+        'instance_id': [0, 2, 0, 5],
+        'label': [0, 1, 2, 3]
+    })
+    expected = calculate_feature_matrix(make_features(pd_es),
+                                        pd_es,
+                                        approximate=Timedelta(1, 'day'),
+                                        cutoff_time=cutoff_time)
+    feature_matrix = calculate_feature_matrix(make_features(dask_es),
+                                              dask_es,
+                                              approximate=Timedelta(1, 'day'),
+                                              cutoff_time=cutoff_time)
+    feature_matrix = feature_matrix.compute().set_index('id').sort_values('label')
+    pd.testing.assert_frame_equal(feature_matrix[expected.columns], expected, check_dtype=False)
 
 
 def test_approximate_multiple_instances_per_cutoff_time(pd_es):
@@ -969,6 +1059,45 @@ def test_approximate_time_split_returns_the_same_result(pd_es):
             assert (pd.isnull(i1) and pd.isnull(i2)) or (i1 == i2)
 
 
+def test_approximate_calculated_once_for_all_chunks(pd_es, monkeypatch):
+    agg_feat = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)
+    agg_feat2 = ft.Feature(agg_feat, parent_entity=pd_es['customers'], primitive=Sum)
+    dfeat = DirectFeature(agg_feat2, pd_es['sessions'])
+    # the cutoff times are at the start of their buckets, so the approximate
+    # values are the same as the exact values
+    cutoff_time = pd.DataFrame({'instance_id': [0, 1, 2, 3, 4, 5, 0, 3],
+                                'time': pd.to_datetime(['2011-04-09 10:31:00', '2011-04-09 10:32:00',
+                                                        '2011-04-09 10:40:00', '2011-04-10 10:40:00',
+                                                        '2011-04-10 10:41:00', '2011-04-10 11:10:00',
+                                                        '2011-04-10 11:10:00', '2011-04-09 10:31:00'])})
+    expected = calculate_feature_matrix([dfeat, agg_feat], pd_es, cutoff_time=cutoff_time)
+
+    fm = calculate_feature_matrix([dfeat, agg_feat], pd_es, cutoff_time=cutoff_time,
+                                  approximate='1 minute', chunk_size=1)
+    pd.testing.assert_frame_equal(fm, expected)
+
+    fm = calculate_feature_matrix([dfeat, agg_feat], pd_es, cutoff_time=cutoff_time,
+                                  approximate='1 minute', chunk_size=1, n_jobs=2,
+                                  backend='processes')
+    pd.testing.assert_frame_equal(fm, expected)
+
+    clusters = []
+    Client, LocalCluster = utils.get_client_cluster()
+
+    def get_counting_client_cluster():
+        def create_cluster(*args, **kwargs):
+            clusters.append(LocalCluster(*args, **kwargs))
+            return clusters[-1]
+        return Client, create_cluster
+
+    monkeypatch.setattr(utils, "get_client_cluster", get_counting_client_cluster)
+    fm = calculate_feature_matrix([dfeat, agg_feat], pd_es, cutoff_time=cutoff_time,
+                                  approximate='1 minute', chunk_size=1, n_jobs=2)
+    pd.testing.assert_frame_equal(fm, expected)
+    # the approximate features and the chunks are calculated on one cluster
+    assert len(clusters) == 1
+
+
 def test_approximate_returns_correct_empty_default_values(pd_es):
     agg_feat = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['customers'], primitive=Count)
     dfeat = DirectFeature(agg_feat, pd_es['sessions'])
@@ -1258,6 +1387,198 @@ def test_dask_persisted_es(pd_es, capsys):
         assert (feature_matrix[property_feature.get_name()] == labels).values.all()
 
 
+def test_compute_session_reuses_scattered_es(pd_es, capsys):
+    cutoff_time = pd.DataFrame({'time': [datetime(2011, 4, 9, 10, 30, i * 6) for i in range(5)],
+                                'instance_id': range(5)})
+    property_feature = IdentityFeature(pd_es['log']['value']) > 10
+    labels = [False] * 3 + [True] * 2
+
+    with cluster() as (scheduler, [a, b]):
+        with ComputeSession(pd_es, dask_kwargs={'cluster': scheduler['address']}) as session:
+            for _ in range(2):
+                feature_matrix = calculate_feature_matrix([property_feature],
+                                                          entityset=pd_es,
+                                                          cutoff_time=cutoff_time,
+                                                          verbose=True,
+                                                          session=session)
+                assert feature_matrix[property_feature.get_name()].tolist() == labels
+            captured = capsys.readouterr()
+            assert captured[0].count("Using EntitySet scattered by the session") == 2
+
+            # the changed entityset is scattered in place of the old one
+            pd_es['log'].df.loc[0, 'value'] = 100
+            feature_matrix = calculate_feature_matrix([property_feature],
+                                                      entityset=pd_es,
+                                                      cutoff_time=cutoff_time,
+                                                      verbose=True,
+                                                      session=session)
+            assert feature_matrix[property_feature.get_name()].tolist() == [True] + labels[1:]
+            captured = capsys.readouterr()
+            assert "Using EntitySet scattered by the session" not in captured[0]
+
+
+def test_compute_session_checks_worker_memory(pd_es, monkeypatch):
+    total_memory = psutil.virtual_memory().total
+    monkeypatch.setattr(utils, "get_client_cluster",
+                        get_mock_client_cluster)
+    session = ComputeSession(n_jobs=1)
+
+    # an entityset used after the session is created must fit in each worker
+    monkeypatch.setattr(type(pd_es), "__sizeof__", lambda self: total_memory * 2)
+    with pytest.raises(ValueError, match="Insufficient memory"):
+        session.scatter_entityset(pd_es)
+
+
+def test_partition_entityset(pd_es, capsys):
+    count = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)
+    customer_sum = ft.Feature(count, parent_entity=pd_es['customers'], primitive=Sum)
+    features = [count, DirectFeature(customer_sum, pd_es['sessions'])]
+    cutoff_time = pd.DataFrame({
+        'instance_id': [0, 3, 0, 5, 1, 2],
+        'time': [datetime(2011, 4, 9, 10, 31), datetime(2011, 4, 10, 11),
+                 datetime(2011, 6, 1), datetime(2011, 4, 10, 11), datetime(2011, 6, 1),
+                 datetime(2011, 4, 9, 10, 31)],
+        'label': range(6)
+    })
+
+    with cluster() as (scheduler, [a, b]):
+        dkwargs = {'cluster': scheduler['address']}
+        for approximate in [None, '1 day']:
+            expected = calculate_feature_matrix(features,
+                                                pd_es,
+                                                cutoff_time=cutoff_time,
+                                                approximate=approximate)
+            feature_matrix = calculate_feature_matrix(features,
+                                                      pd_es,
+                                                      cutoff_time=cutoff_time,
+                                                      chunk_size=2,
+                                                      dask_kwargs=dkwargs,
+                                                      partition_entityset=True,
+                                                      approximate=approximate,
+                                                      verbose=True)
+            pd.testing.assert_frame_equal(feature_matrix, expected)
+    captured = capsys.readouterr()
+    assert "EntitySet partitioned into 3 chunks" in captured[0]
+
+
+def test_partition_entityset_fails_dask(dask_es):
+    feature = ft.Feature(dask_es['log']['id'], parent_entity=dask_es['sessions'], primitive=Count)
+    error_text = "Using partition_entityset is not supported with Dask Entities"
+    with pytest.raises(ValueError, match=error_text):
+        calculate_feature_matrix([feature], dask_es, partition_entityset=True)
+
+
+def test_compute_session_errors(pd_es):
+    property_feature = IdentityFeature(pd_es['log']['value']) > 10
+    session = object()
+    error_text = "dask_kwargs cannot be used with a session"
+    with pytest.raises(ValueError, match=error_text):
+        calculate_feature_matrix([property_feature], pd_es, session=session,
+                                 dask_kwargs={})
+
+    error_text = "The 'processes' backend cannot be used with a session"
+    with pytest.raises(ValueError, match=error_text):
+        calculate_feature_matrix([property_feature], pd_es, session=session,
+                                 backend='processes')
+
+
+def _streaming_cutoff_time():
+    times = list([datetime(2011, 4, 10, 10, 41, i * 3) for i in range(3)] +
+                 [datetime(2011, 4, 9, 10, 30, i * 6) for i in range(5)] +
+                 [datetime(2011, 4, 9, 10, 31, i * 9) for i in range(4)] +
+                 [datetime(2011, 4, 9, 10, 40, 0)] +
+                 [datetime(2011, 4, 10, 10, 40, i) for i in range(2)] +
+                 [datetime(2011, 4, 10, 11, 10, i * 3) for i in range(2)])
+    return pd.DataFrame({'time': times, 'instance_id': range(16, -1, -1)})
+
+
+def test_output_callback(pd_es):
+    cutoff_time = _streaming_cutoff_time()
+    session_total = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'],
+                               primitive=Sum)
+    features = [IdentityFeature(pd_es['log']['value']) > 10,
+                ft.Feature(session_total, entity=pd_es['log'])]
+
+    expected = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                        cutoff_time_in_index=True)
+
+    chunks = []
+    result = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                      cutoff_time_in_index=True, chunk_size=4,
+                                      output=chunks.append)
+    assert result is None
+    assert all(len(chunk) <= 4 for chunk in chunks)
+
+    streamed = pd.concat(chunks)
+    # chunks are written in order of cutoff time
+    assert streamed.index.get_level_values('time').is_monotonic_increasing
+    pd.testing.assert_frame_equal(streamed, expected.loc[streamed.index])
+    assert len(streamed) == len(expected)
+
+
+def test_output_callback_joined_cutoff_times(pd_es, monkeypatch):
+    features = [ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)]
+    times = pd.date_range('2011-04-09 10:30:00', periods=30, freq='20s')
+    cutoff_time = pd.DataFrame({'instance_id': [i % 6 for i in range(30)], 'time': times})
+    expected = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                        cutoff_time_in_index=True)
+
+    chunks = []
+    with monkeypatch.context() as m:
+        # the features are calculated for many cutoff times at once
+        m.setattr(FeatureSetCalculator, 'run', None)
+        result = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                          cutoff_time_in_index=True, chunk_size=5,
+                                          output=chunks.append)
+    assert result is None
+    assert [len(chunk) for chunk in chunks] == [5] * 6
+
+    streamed = pd.concat(chunks)
+    assert streamed.index.get_level_values('time').is_monotonic_increasing
+    pd.testing.assert_frame_equal(streamed, expected.loc[streamed.index])
+
+
+def test_output_parquet(pd_es, tmpdir):
+    cutoff_time = _streaming_cutoff_time()
+    property_feature = IdentityFeature(pd_es['log']['value']) > 10
+    expected = calculate_feature_matrix([property_feature], pd_es, cutoff_time=cutoff_time)
+
+    output = os.path.join(str(tmpdir), 'feature_matrix')
+    calculate_feature_matrix([property_feature], pd_es, cutoff_time=cutoff_time, output=output)
+
+    files = sorted(os.listdir(output))
+    assert files[0] == 'part-00000.parquet'
+    streamed = pd.concat([pd.read_parquet(os.path.join(output, f)) for f in files])
+    assert streamed.index.name == expected.index.name
+    pd.testing.assert_frame_equal(streamed, expected.loc[streamed.index], check_dtype=False)
+
+
+def test_output_parallel_in_cutoff_order(pd_es):
+    cutoff_time = _streaming_cutoff_time()
+    property_feature = IdentityFeature(pd_es['log']['value']) > 10
+    expected = calculate_feature_matrix([property_feature], pd_es, cutoff_time=cutoff_time,
+                                        cutoff_time_in_index=True)
+
+    chunks = []
+    with cluster() as (scheduler, [a, b]):
+        dkwargs = {'cluster': scheduler['address']}
+        calculate_feature_matrix([property_feature], pd_es, cutoff_time=cutoff_time,
+                                 cutoff_time_in_index=True, chunk_size=3,
+                                 dask_kwargs=dkwargs, output=chunks.append)
+
+    streamed = pd.concat(chunks)
+    assert streamed.index.get_level_values('time').is_monotonic_increasing
+    pd.testing.assert_frame_equal(streamed, expected.loc[streamed.index])
+    assert len(streamed) == len(expected)
+
+
+def test_output_fails_dask(dask_es):
+    property_feature = IdentityFeature(dask_es['log']['value']) > 10
+    error_text = "Using output is not supported with Dask Entities"
+    with pytest.raises(ValueError, match=error_text):
+        calculate_feature_matrix([property_feature], dask_es, output=lambda chunk: None)
+
+
 class TestCreateClientAndCluster(object):
     def test_user_cluster_as_string(self, monkeypatch):
         monkeypatch.setattr(utils, "get_client_cluster",
@@ -1351,10 +1672,20 @@ def test_warning_not_enough_chunks(pd_es, capsys):
                                  chunk_size=.5,
                                  verbose=True,
                                  dask_kwargs=dkwargs)
+        captured = capsys.readouterr()
+        pattern = r'Fewer chunks \([0-9]+\), than workers \([0-9]+\) consider reducing the chunk size'
+        assert re.search(pattern, captured.out) is not None
 
-    captured = capsys.readouterr()
-    pattern = r'Fewer chunks \([0-9]+\), than workers \([0-9]+\) consider reducing the chunk size'
-    assert re.search(pattern, captured.out) is not None
+        # adaptive chunks warn too if there are fewer cutoff times than workers
+        cutoff_time = pd.DataFrame({'instance_id': [0, 1],
+                                    'time': [datetime(2011, 4, 9, 10, 31)] * 2})
+        calculate_feature_matrix([property_feature],
+                                 entityset=pd_es,
+                                 cutoff_time=cutoff_time,
+                                 verbose=True,
+                                 dask_kwargs=dkwargs)
+        captured = capsys.readouterr()
+        assert re.search(pattern, captured.out) is not None
 
 
 def test_n_jobs():
@@ -1654,6 +1985,68 @@ def test_handle_chunk_size():
         _handle_chunk_size(-1, total_size)
 
 
+def test_adaptive_chunker():
+    cutoff_time = pd.DataFrame({'instance_id': list(range(300, 0, -1)),
+                                'time': [i // 2 for i in range(300)]})
+    chunker = _AdaptiveChunker(cutoff_time, 'time', num_workers=2, target_seconds=1)
+
+    # the first chunk coalesces the cutoff times of many times
+    chunk = chunker.next_chunk()
+    assert chunk.shape[0] == ADAPTIVE_INITIAL_CHUNK_SIZE
+    assert chunk['time'].nunique() == ADAPTIVE_INITIAL_CHUNK_SIZE / 2
+    assert chunk['instance_id'].tolist()[:2] == [299, 300]
+
+    # at 0.02 seconds per cutoff time, a chunk of 50 takes 1 second
+    chunker.add_timing(100, 2)
+    assert chunker.next_chunk().shape[0] == 50
+
+    # no chunk is larger than an equal share of the rest between the workers,
+    # or smaller than an equal share of the first chunk, and a smaller rest
+    # is added to the last chunk
+    chunker.add_timing(850, 0)
+    assert chunker.chunk_size() == 75
+    assert chunker.min_chunk_size == 50
+    sizes = []
+    chunk = chunker.next_chunk()
+    while chunk is not None:
+        sizes.append(chunk.shape[0])
+        chunk = chunker.next_chunk()
+    assert sizes == [75, 75]
+
+    instance_ids = pd.Series(range(10))
+    chunker = _AdaptiveChunker((datetime(2011, 4, 9), instance_ids), 'time', num_workers=2)
+    time_last, ids = chunker.next_chunk()
+    assert time_last == datetime(2011, 4, 9)
+    assert ids.tolist() == list(range(5))
+
+
+def test_adaptive_chunks_match_fixed_chunks(pd_es):
+    value = pd_es['log']['value']
+    features = [ft.Feature(value, parent_entity=pd_es['sessions'], primitive=Sum),
+                ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)]
+    times = pd.date_range('2011-04-09 10:30:00', periods=30, freq='20s')
+    cutoff_time = pd.DataFrame({'instance_id': [i % 6 for i in range(30)], 'time': times})
+    expected = calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time)
+
+    chunks = []
+    with cluster() as (scheduler, [a, b]):
+        dkwargs = {'cluster': scheduler['address']}
+        feature_matrix = calculate_feature_matrix(features, pd_es,
+                                                  cutoff_time=cutoff_time,
+                                                  dask_kwargs=dkwargs)
+        pd.testing.assert_frame_equal(feature_matrix, expected)
+
+        calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                 dask_kwargs=dkwargs, output=chunks.append,
+                                 cutoff_time_in_index=True)
+
+    # the cutoff times are coalesced into fewer chunks than times, which are
+    # written in order of time
+    assert len(chunks) < len(times)
+    chunk_times = pd.concat(chunks).index.get_level_values('time')
+    assert chunk_times.is_monotonic_increasing
+
+
 def test_chunk_dataframe_groups():
     df = pd.DataFrame({
         "group": [1, 1, 1, 1, 2, 2, 3]
@@ -1744,6 +2137,61 @@ def test_calls_progress_callback_cluster(pd_mock_customer):
     assert np.isclose(mock_progress_callback.total_progress_percent, 100.0)
 
 
+def test_processes_backend(pd_mock_customer, tmpdir):
+    class MockProgressCallback:
+        def __init__(self):
+            self.total_update = 0
+            self.total_progress_percent = 0
+
+        def __call__(self, update, progress_percent, time_elapsed):
+            self.total_update += update
+            self.total_progress_percent = progress_percent
+
+    mock_progress_callback = MockProgressCallback()
+
+    es = pd_mock_customer
+    trans_per_session = ft.Feature(es["transactions"]["transaction_id"], parent_entity=es["sessions"], primitive=Count)
+    trans_per_customer = ft.Feature(es["transactions"]["transaction_id"], parent_entity=es["customers"], primitive=Count)
+    features = [trans_per_session, ft.Feature(trans_per_customer, entity=es["sessions"])]
+    cutoff_time = pd.DataFrame({"instance_id": [1, 2, 3, 4, 5, 1],
+                                "time": pd.to_datetime(["2014-01-01 04:00:00", "2014-01-01 01:00:00",
+                                                        "2014-01-01 02:00:00", "2014-01-01 03:00:00",
+                                                        "2014-01-01 02:00:00", "2014-01-01 01:00:00"])})
+    expected = ft.calculate_feature_matrix(features, es, cutoff_time=cutoff_time)
+    fm = ft.calculate_feature_matrix(features, es, cutoff_time=cutoff_time, n_jobs=2,
+                                     chunk_size=1, backend='processes',
+                                     progress_callback=mock_progress_callback)
+    pd.testing.assert_frame_equal(fm, expected)
+    assert np.isclose(mock_progress_callback.total_update, 100.0)
+    assert np.isclose(mock_progress_callback.total_progress_percent, 100.0)
+
+    chunks = []
+    ft.calculate_feature_matrix(features, es, cutoff_time=cutoff_time, n_jobs=2,
+                                chunk_size=1, backend='processes', output=chunks.append,
+                                cutoff_time_in_index=True)
+    times = [chunk.index.get_level_values('time')[0] for chunk in chunks]
+    assert times == sorted(times)
+    expected = ft.calculate_feature_matrix(features, es, cutoff_time=cutoff_time,
+                                           cutoff_time_in_index=True)
+    pd.testing.assert_frame_equal(pd.concat(chunks).sort_index(), expected.sort_index())
+
+
+def test_processes_backend_errors(pd_es, dask_es):
+    features = [ft.Feature(pd_es['log']['value'])]
+    error_text = "Unknown backend 'threads', must be 'distributed' or 'processes'"
+    with pytest.raises(ValueError, match=error_text):
+        calculate_feature_matrix(features, pd_es, backend='threads')
+
+    error_text = "dask_kwargs can only be used with the 'distributed' backend"
+    with pytest.raises(ValueError, match=error_text):
+        calculate_feature_matrix(features, pd_es, backend='processes', dask_kwargs={})
+
+    features = [ft.Feature(dask_es['log']['value'])]
+    error_text = "Using the processes backend is not supported with Dask Entities"
+    with pytest.raises(ValueError, match=error_text):
+        calculate_feature_matrix(features, dask_es, n_jobs=2, backend='processes')
+
+
 def test_closes_tqdm(es):
     class ErrorPrim(TransformPrimitive):
         '''A primitive whose function raises an error'''
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from featuretools.computational_backends.column_store import ColumnStore
+
+
+def test_column_store_adds_columns_without_changing_df():
+    df = pd.DataFrame({'id': [3, 1, 2], 'value': [1.0, 2.0, 3.0]}, index=[3, 1, 2])
+    store = ColumnStore(df)
+    store['scalar'] = 0
+    store['array'] = np.array([4, 5, 6])
+    store['series'] = pd.Series([10, 20], index=[1, 2])
+    store = store.assign(value=[7.0, 8.0, 9.0])
+
+    assert list(df.columns) == ['id', 'value']
+    assert list(store.columns) == ['id', 'value', 'scalar', 'array', 'series']
+    assert 'series' in store
+    assert store.shape == (3, 5)
+    assert not store.empty
+
+    expected = pd.DataFrame({'id': [3, 1, 2],
+                             'value': [7.0, 8.0, 9.0],
+                             'scalar': [0, 0, 0],
+                             'array': [4, 5, 6],
+                             'series': [np.nan, 10, 20]},
+                            index=[3, 1, 2])
+    frame = store.to_frame()
+    # the replaced column keeps its position
+    assert list(frame.columns) == list(store.columns)
+    pd.testing.assert_frame_equal(frame, expected)
+    pd.testing.assert_frame_equal(store[['series', 'id']], expected[['series', 'id']])
+
+
+def test_column_store_fillna():
+    df = pd.DataFrame({'value': [1.0, np.nan]})
+    store = ColumnStore(df)
+    store['new'] = [np.nan, 2.0]
+    store.fillna({'value': 0, 'new': 5, 'missing': 1})
+
+    assert store['value'].tolist() == [1.0, 0.0]
+    assert store['new'].tolist() == [5.0, 2.0]
+    assert 'missing' not in store
+
+
+def test_column_store_without_new_columns():
+    df = pd.DataFrame({'value': [1.0, 2.0]})
+    assert ColumnStore(df).to_frame() is df
+    assert ColumnStore(df.iloc[:0]).empty
@@ -0,0 +1,58 @@
+import pickle
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import featuretools as ft
+from featuretools import Timedelta
+from featuretools.computational_backends.feature_set import FeatureSet
+from featuretools.primitives import Count
+
+
+def test_compiled_features_are_planned_once(pd_es, monkeypatch):
+    agg_feat = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)
+    features = [ft.Feature(agg_feat, pd_es['log']), ft.Feature(pd_es['log']['value'])]
+    cutoff_time = pd.DataFrame({'instance_id': [0, 1, 2],
+                                'time': [datetime(2011, 4, 9, 10, 31, 0),
+                                         datetime(2011, 4, 9, 10, 40, 0),
+                                         datetime(2011, 4, 10, 10, 40, 0)]})
+    compiled = ft.compile_features(features, pd_es.metadata)
+    # compiled features can be sent to other processes
+    compiled = pickle.loads(pickle.dumps(compiled))
+
+    expected = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                           approximate=Timedelta(10, 's'))
+    ft.calculate_feature_matrix(compiled, pd_es, cutoff_time=cutoff_time,
+                                approximate=Timedelta(10, 's'))
+
+    built = []
+    build_feature_trie = FeatureSet._build_feature_trie
+
+    def build_and_count(self):
+        built.append(self.target_feature_names)
+        return build_feature_trie(self)
+
+    monkeypatch.setattr(FeatureSet, '_build_feature_trie', build_and_count)
+    fm = ft.calculate_feature_matrix(compiled, pd_es, cutoff_time=cutoff_time,
+                                     approximate=Timedelta(10, 's'))
+    pd.testing.assert_frame_equal(fm, expected)
+    # only the features approximated at each cutoff time are planned again
+    names = {f.unique_name() for f in features}
+    assert len(built) > 0
+    assert all(target_feature_names != names for target_feature_names in built)
+
+
+def test_compiled_features_check_entityset(pd_es):
+    features = [ft.Feature(pd_es['log']['value'])]
+    compiled = ft.compile_features(features, pd_es)
+    ft.calculate_feature_matrix(compiled, pd_es, instance_ids=[0, 1])
+
+    other_es = ft.demo.load_mock_customer(return_entityset=True)
+    error_text = "Features were compiled for an entityset with different metadata"
+    with pytest.raises(ValueError, match=error_text):
+        ft.calculate_feature_matrix(compiled, other_es, instance_ids=[0, 1])
+
+    error_text = "features must be a non-empty list of features"
+    with pytest.raises(AssertionError, match=error_text):
+        ft.compile_features([])
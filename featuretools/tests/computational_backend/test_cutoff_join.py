@@ -0,0 +1,282 @@
+import importlib
+import warnings
+
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+import pytest
+
+import featuretools as ft
+from featuretools.computational_backends import cutoff_join
+from featuretools.computational_backends.calculate_feature_matrix import (
+    FEATURE_CALCULATION_PERCENTAGE
+)
+from featuretools.computational_backends.cutoff_join import (
+    can_join_cutoff_times,
+    can_join_dask_cutoff_times,
+    join_cutoff_times
+)
+from featuretools.computational_backends.feature_set import FeatureSet
+from featuretools.computational_backends.feature_set_calculator import (
+    FeatureSetCalculator
+)
+from featuretools.primitives import (
+    All,
+    Any,
+    Count,
+    Max,
+    Mean,
+    Median,
+    Min,
+    NMostCommon,
+    NumTrue,
+    NumUnique,
+    PercentTrue,
+    Std,
+    Sum
+)
+
+
+def _calculate_joined(features, es, cutoff_time, monkeypatch, **kwargs):
+    """Calculate the features with the cutoff times joined, checking that
+    the calculator is not run for each cutoff time, and separately at each
+    cutoff time."""
+    expected = pd.concat([ft.calculate_feature_matrix(features, es, cutoff_time=cutoff_time.iloc[[i]],
+                                                      **kwargs)
+                          for i in range(len(cutoff_time))])
+    with monkeypatch.context() as m:
+        m.setattr(FeatureSetCalculator, 'run', None)
+        fm = ft.calculate_feature_matrix(features, es, cutoff_time=cutoff_time,
+                                         incremental_aggregations=True, **kwargs)
+    return fm, expected
+
+
+@pytest.mark.parametrize("include_cutoff_time", [True, False])
+def test_join_cutoff_times_matches_calculator(pd_es, monkeypatch, include_cutoff_time):
+    value = pd_es['log']['value']
+    sessions = pd_es['sessions']
+    features = [ft.Feature(value, parent_entity=sessions, primitive=primitive)
+                for primitive in [Sum, Mean, Min, Max, Std]]
+    features.append(ft.Feature(pd_es['log']['id'], parent_entity=sessions, primitive=Count))
+    features.append(ft.Feature(value, parent_entity=sessions, primitive=Sum,
+                               where=ft.Feature(pd_es['log']['purchased'])))
+    features += [ft.Feature(value, parent_entity=sessions, primitive=primitive,
+                            use_previous='10 seconds')
+                 for primitive in [Sum, Mean]]
+    features.append(ft.Feature(pd_es['log']['id'], parent_entity=sessions, primitive=Count,
+                               use_previous='1 day'))
+    features.append(ft.Feature(sessions['device_type']))
+    assert can_join_cutoff_times(FeatureSet(features), pd_es)
+
+    times = list(pd.date_range('2011-04-09 10:30:00', '2011-04-09 10:31:30', freq='6s'))
+    times += list(pd.date_range('2011-04-10 10:39:59', '2011-04-10 11:11:00', periods=6))
+    cutoff_time = pd.DataFrame({'instance_id': [i % 6 for i in range(len(times))] + [0, 4, 5],
+                                'time': times + times[-3:],
+                                'label': range(len(times) + 3)})
+    fm, expected = _calculate_joined(features, pd_es, cutoff_time, monkeypatch,
+                                     include_cutoff_time=include_cutoff_time,
+                                     cutoff_time_in_index=True)
+    pd.testing.assert_frame_equal(fm, expected)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {'chunk_size': 1}, {'include_cutoff_time': False}])
+def test_join_cutoff_times_boolean_dtypes(pd_es, monkeypatch, kwargs):
+    purchased = pd_es['log']['purchased']
+    features = [ft.Feature(purchased, parent_entity=pd_es['sessions'], primitive=primitive)
+                for primitive in [Any, All, NumTrue, PercentTrue]]
+    features.append(ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'],
+                               primitive=Sum, where=ft.Feature(purchased)))
+    assert can_join_cutoff_times(FeatureSet(features), pd_es)
+
+    # some of the instances don't exist yet at their cutoff times
+    times = list(pd.date_range('2011-04-09 10:30:00', '2011-04-09 10:31:30', freq='6s'))
+    cutoff_time = pd.DataFrame({'instance_id': [i % 6 for i in range(len(times))],
+                                'time': times})
+    fm, expected = _calculate_joined(features, pd_es, cutoff_time, monkeypatch, **kwargs)
+    pd.testing.assert_frame_equal(fm, expected)
+
+
+def test_join_cutoff_times_target_variables(pd_es, monkeypatch):
+    cohorts = pd_es['cohorts']
+    features = [ft.Feature(cohorts['cohort_name']),
+                ft.Feature(pd_es['customers']['age'], parent_entity=cohorts, primitive=Sum),
+                ft.Feature(pd_es['customers']['id'], parent_entity=cohorts, primitive=Count)]
+    cutoff_time = pd.DataFrame({
+        'instance_id': [0, 1, 0, 1, 0, 1, 7],
+        'time': pd.to_datetime(['2011-04-05', '2011-04-05', '2011-04-08',
+                                '2011-04-08', '2011-04-09', '2011-04-09', '2011-04-09'])
+    })
+    fm, expected = _calculate_joined(features, pd_es, cutoff_time, monkeypatch)
+    pd.testing.assert_frame_equal(fm, expected)
+
+
+def test_join_cutoff_times_secondary_time_index(pd_es):
+    customers = pd_es['customers']
+    feature_set = FeatureSet([ft.Feature(customers[variable])
+                              for variable in ['age', 'cancel_date', 'cancel_reason']])
+    ids = [0, 1, 2, 0, 1, 2]
+    times = pd.to_datetime(['2011-04-08', '2011-04-08', '2011-04-08',
+                            '2011-10-01', '2011-10-10', '2012-02-01'])
+    fm = join_cutoff_times(feature_set, pd_es, ids, times.values)
+    expected = pd.concat([FeatureSetCalculator(pd_es, feature_set, time).run(np.array([ids[i]]))
+                          for i, time in enumerate(times)])
+    fm.index = expected.index
+    pd.testing.assert_frame_equal(fm, expected, check_categorical=False)
+
+
+@pytest.mark.parametrize("incremental_aggregations", [True, False])
+def test_join_cutoff_times_tagged_rows(pd_es, monkeypatch, incremental_aggregations):
+    value = pd_es['log']['value']
+    sessions = pd_es['sessions']
+    features = [ft.Feature(value, parent_entity=sessions, primitive=Median),
+                ft.Feature(pd_es['log']['product_id'], parent_entity=sessions,
+                           primitive=NumUnique),
+                ft.Feature(value, parent_entity=sessions, primitive=Max,
+                           use_previous='1 day'),
+                ft.Feature(value, parent_entity=sessions, primitive=Sum,
+                           use_previous='2 observations'),
+                ft.Feature(value, parent_entity=sessions, primitive=Median,
+                           where=ft.Feature(pd_es['log']['purchased'])),
+                ft.Feature(value, parent_entity=sessions, primitive=Sum),
+                ft.Feature(pd_es['log']['id'], parent_entity=sessions, primitive=Count)]
+    assert can_join_cutoff_times(FeatureSet(features), pd_es, incremental_aggregations)
+
+    times = list(pd.date_range('2011-04-09 10:30:00', '2011-04-09 10:31:30', freq='6s'))
+    times += list(pd.date_range('2011-04-10 10:39:59', '2011-04-10 11:11:00', periods=6))
+    cutoff_time = pd.DataFrame({'instance_id': [i % 6 for i in range(len(times))] + [0, 4, 5],
+                                'time': times + times[-3:]})
+    expected = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time)
+    with monkeypatch.context() as m:
+        m.setattr(FeatureSetCalculator, 'run', None)
+        fm = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                         incremental_aggregations=incremental_aggregations)
+    pd.testing.assert_frame_equal(fm, expected)
+
+
+def test_join_cutoff_times_tagged_rows_batches(pd_es, monkeypatch):
+    features = [ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'],
+                           primitive=Median)]
+    feature_set = FeatureSet(features)
+    ids = [0, 1, 0, 1, 5, 0]
+    times = pd.to_datetime(['2011-04-09 10:30:06', '2011-04-09 10:30:30', '2011-04-09 10:31:00',
+                            '2011-04-09 10:41:00', '2011-04-10 11:11:00', '2011-04-09 10:30:00'])
+    expected = join_cutoff_times(feature_set, pd_es, ids, times.values)
+    monkeypatch.setattr(cutoff_join, 'MAX_TAGGED_ROWS', 2)
+    fm = join_cutoff_times(feature_set, pd_es, ids, times.values)
+    pd.testing.assert_frame_equal(fm, expected)
+
+
+def test_can_join_cutoff_times(pd_es, dask_es):
+    value = pd_es['log']['value']
+    assert can_join_cutoff_times(FeatureSet([ft.Feature(value, parent_entity=pd_es['sessions'],
+                                                        primitive=Sum)]), pd_es)
+    # calculated by tagging each row with the pairs which use it
+    assert can_join_cutoff_times(FeatureSet([ft.Feature(value, parent_entity=pd_es['sessions'],
+                                                        primitive=Median)]), pd_es)
+    for feature in [ft.Feature(value, parent_entity=pd_es['customers'], primitive=Sum),
+                    ft.Feature(pd_es['sessions']['customer_id'], pd_es['log']),
+                    ft.Feature(pd_es['log']['product_id'], parent_entity=pd_es['sessions'],
+                               primitive=NMostCommon)]:
+        assert not can_join_cutoff_times(FeatureSet([feature]), pd_es)
+
+    feature = ft.Feature(dask_es['log']['value'], parent_entity=dask_es['sessions'], primitive=Sum)
+    assert not can_join_cutoff_times(FeatureSet([feature]), dask_es)
+
+
+def _calculate_dask_each_cutoff_time(features, es, cutoff_time, monkeypatch):
+    """Calculate the features of Dask entities separately at each cutoff time."""
+    cfm_module = importlib.import_module('featuretools.computational_backends.calculate_feature_matrix')
+    with monkeypatch.context() as m:
+        m.setattr(cfm_module, 'can_join_dask_cutoff_times', lambda *args: False)
+        fm = ft.calculate_feature_matrix(features, es, cutoff_time=cutoff_time)
+    return fm.compute().sort_values('label').reset_index(drop=True)
+
+
+def test_join_dask_cutoff_times_matches_calculator(dask_es, monkeypatch):
+    value = dask_es['log']['value']
+    sessions = dask_es['sessions']
+    features = [ft.Feature(value, parent_entity=sessions, primitive=primitive)
+                for primitive in [Sum, Mean, Min, Max, Std]]
+    features += [ft.Feature(dask_es['log']['id'], parent_entity=sessions, primitive=Count),
+                 ft.Feature(dask_es['log']['product_id'], parent_entity=sessions,
+                            primitive=NumUnique),
+                 ft.Feature(dask_es['log']['purchased'], parent_entity=sessions, primitive=NumTrue),
+                 ft.Feature(value, parent_entity=sessions, primitive=Max,
+                            where=ft.Feature(dask_es['log']['purchased'])),
+                 ft.Feature(value, parent_entity=sessions, primitive=Mean,
+                            use_previous='10 seconds'),
+                 ft.Feature(sessions['device_type'])]
+    assert can_join_dask_cutoff_times(FeatureSet(features), dask_es)
+
+    times = list(pd.date_range('2011-04-09 10:30:00', '2011-04-09 10:31:30', freq='6s'))
+    times += list(pd.date_range('2011-04-10 10:39:59', '2011-04-10 11:11:00', periods=6))
+    cutoff_time = pd.DataFrame({'instance_id': [i % 6 for i in range(len(times))],
+                                'time': times,
+                                'label': range(len(times))})
+    fm = ft.calculate_feature_matrix(features, dask_es, cutoff_time=cutoff_time)
+    assert isinstance(fm, dd.DataFrame)
+    fm = fm.compute().sort_values('label').reset_index(drop=True)
+    expected = _calculate_dask_each_cutoff_time(features, dask_es, cutoff_time, monkeypatch)
+    pd.testing.assert_frame_equal(fm, expected)
+
+
+def test_join_dask_cutoff_times_lazy_cutoff_time(dask_es, monkeypatch, tmpdir):
+    customers = dask_es['customers']
+    features = [ft.Feature(customers['age']),
+                ft.Feature(customers['cancel_reason']),
+                ft.Feature(dask_es['sessions']['id'], parent_entity=customers, primitive=Count)]
+    cutoff_time = pd.DataFrame({
+        'instance_id': [0, 1, 2, 0, 1, 2, 1],
+        'time': pd.to_datetime(['2011-04-08', '2011-04-08', '2011-04-08', '2011-10-01',
+                                '2011-10-10', '2012-02-01', '2010-01-01']),
+        'label': range(7)
+    })
+    with warnings.catch_warnings():
+        warnings.filterwarnings('error', message='cutoff_time should be a Pandas DataFrame')
+        fm = ft.calculate_feature_matrix(features, dask_es,
+                                         cutoff_time=dd.from_pandas(cutoff_time, npartitions=2))
+
+    expected = _calculate_dask_each_cutoff_time(features, dask_es, cutoff_time, monkeypatch)
+    pd.testing.assert_frame_equal(fm.compute().sort_values('label').reset_index(drop=True),
+                                  expected)
+
+    # the categorical instance ids are written to parquet as integers
+    path = str(tmpdir.join('feature_matrix'))
+    fm.to_parquet(path)
+    fm = pd.read_parquet(path).sort_values('label').reset_index(drop=True)
+    pd.testing.assert_frame_equal(fm, expected.astype({'id': 'int64'}))
+
+
+def test_join_dask_cutoff_times_lazy_cutoff_time_validated(dask_es):
+    features = [ft.Feature(dask_es['sessions']['id'], parent_entity=dask_es['customers'],
+                           primitive=Count)]
+    cutoff_time = pd.DataFrame({'instance_id': [0, 1, 0],
+                                'time': pd.to_datetime(['2011-04-08', '2011-04-08', '2011-04-08'])})
+    with pytest.raises(AssertionError, match='Duplicated rows in cutoff time dataframe.'):
+        ft.calculate_feature_matrix(features, dask_es,
+                                    cutoff_time=dd.from_pandas(cutoff_time, npartitions=2))
+
+    # progress is reported for every cutoff time once the lazy graph is built
+    progress = []
+    cutoff_time = cutoff_time.assign(instance_id=[0, 1, 2])
+    ft.calculate_feature_matrix(features, dask_es,
+                                cutoff_time=dd.from_pandas(cutoff_time, npartitions=2),
+                                progress_callback=lambda *args: progress.append(args))
+    updates, percents, _ = zip(*progress)
+    assert np.isclose(percents[0], FEATURE_CALCULATION_PERCENTAGE * 100)
+    assert np.isclose(percents[-1], 100)
+    assert np.isclose(sum(updates), 100)
+
+
+def test_can_join_dask_cutoff_times(pd_es, dask_es):
+    value = dask_es['log']['value']
+    assert can_join_dask_cutoff_times(FeatureSet([ft.Feature(value, parent_entity=dask_es['sessions'],
+                                                             primitive=Sum)]), dask_es)
+    for feature in [ft.Feature(value, parent_entity=dask_es['customers'], primitive=Sum),
+                    ft.Feature(value, parent_entity=dask_es['sessions'], primitive=Sum,
+                               use_previous='2 observations'),
+                    ft.Feature(dask_es['sessions']['customer_id'], dask_es['log'])]:
+        assert not can_join_dask_cutoff_times(FeatureSet([feature]), dask_es)
+
+    feature = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)
+    assert not can_join_dask_cutoff_times(FeatureSet([feature]), pd_es)
@@ -0,0 +1,116 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+import featuretools as ft
+from featuretools import Timedelta
+from featuretools.computational_backends.feature_cache import FeatureCache
+from featuretools.computational_backends.feature_set_calculator import (
+    FeatureSetCalculator
+)
+from featuretools.primitives import Count, Mean, Sum
+
+
+def count_calculated_features(monkeypatch):
+    calculated = []
+    run = FeatureSetCalculator.run
+
+    def run_and_count(self, *args, **kwargs):
+        calculated.extend(f.get_name() for f in self.feature_set.target_features)
+        return run(self, *args, **kwargs)
+
+    monkeypatch.setattr(FeatureSetCalculator, 'run', run_and_count)
+    return calculated
+
+
+def test_cfm_calculates_only_new_features(pd_es, tmpdir, monkeypatch):
+    value = pd_es['log']['value']
+    features = [ft.Feature(value, parent_entity=pd_es['customers'], primitive=primitive)
+                for primitive in [Sum, Mean]]
+    features.append(ft.Feature(pd_es['customers']['age']))
+    cutoff_time = pd.DataFrame({'instance_id': [0, 1, 2, 0],
+                                'time': pd.to_datetime(['2011-04-09 10:31', '2011-04-09 10:40',
+                                                        '2011-04-10', '2011-04-11'])})
+    feature_cache = str(tmpdir)
+    ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                feature_cache=feature_cache)
+
+    count = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['customers'], primitive=Count)
+    calculated = count_calculated_features(monkeypatch)
+    fm = ft.calculate_feature_matrix(features + [count], pd_es, cutoff_time=cutoff_time,
+                                     feature_cache=feature_cache)
+    assert set(calculated) == {count.get_name()}
+
+    expected = ft.calculate_feature_matrix(features + [count], pd_es, cutoff_time=cutoff_time)
+    pd.testing.assert_frame_equal(fm, expected)
+
+    # values cached for other cutoff times are not reused
+    calculated.clear()
+    cutoff_time['time'] = cutoff_time['time'] + pd.Timedelta('1h')
+    ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                feature_cache=feature_cache)
+    assert len(calculated) > 0
+
+
+def test_cfm_feature_cache_reused_across_chunks(pd_es, tmpdir, monkeypatch):
+    features = [ft.Feature(pd_es['log']['value'], parent_entity=pd_es['customers'],
+                           primitive=Sum)]
+    time = pd.Timestamp('2011-04-10')
+    cutoff_time = pd.DataFrame({'instance_id': [0, 1], 'time': [time, time]})
+    feature_cache = str(tmpdir)
+    ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                feature_cache=feature_cache, chunk_size=1)
+
+    calculated_ids = []
+    run = FeatureSetCalculator.run
+
+    def run_and_record(self, instance_ids, *args, **kwargs):
+        calculated_ids.extend(instance_ids)
+        return run(self, instance_ids, *args, **kwargs)
+
+    monkeypatch.setattr(FeatureSetCalculator, 'run', run_and_record)
+    cutoff_time = pd.DataFrame({'instance_id': [0, 1, 2], 'time': [time] * 3})
+    fm = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                     feature_cache=feature_cache)
+    # only the instance which was not calculated by the smaller chunks is
+    assert calculated_ids == [2]
+
+    monkeypatch.undo()
+    expected = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time)
+    pd.testing.assert_frame_equal(fm, expected)
+
+
+def test_cfm_feature_cache_with_approximate(pd_es, tmpdir, monkeypatch):
+    agg_feat = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)
+    dfeat = ft.Feature(agg_feat, pd_es['log'])
+    times = [datetime(2011, 4, 9, 10, 31, 19), datetime(2011, 4, 9, 11, 0, 0)]
+    cutoff_time = pd.DataFrame({'time': times, 'instance_id': [0, 2]})
+    cached = ft.calculate_feature_matrix([dfeat], pd_es, cutoff_time=cutoff_time,
+                                         approximate=Timedelta(10, 's'),
+                                         feature_cache=FeatureCache(str(tmpdir)))
+
+    calculated = count_calculated_features(monkeypatch)
+    fm = ft.calculate_feature_matrix([dfeat], pd_es, cutoff_time=cutoff_time,
+                                     approximate=Timedelta(10, 's'),
+                                     feature_cache=FeatureCache(str(tmpdir)))
+    assert calculated == []
+    pd.testing.assert_frame_equal(fm, cached)
+
+
+def test_evicts_least_recently_used(tmpdir):
+    values = pd.DataFrame({'a': range(100)})
+    cache = FeatureCache(str(tmpdir))
+    for i, key in enumerate(['first', 'second', 'third']):
+        cache.set(key, values)
+        file_path = os.path.join(str(tmpdir), 'ft_{}.pkl'.format(key))
+        os.utime(file_path, (i, i))
+    size = os.path.getsize(file_path)
+
+    # using the first values makes the second values the least recently used
+    pd.testing.assert_frame_equal(cache.get('first'), values)
+    cache.max_size = 2 * size
+    cache.evict()
+    assert cache.get('second') is None
+    assert cache.get('first') is not None
+    assert cache.get('third') is not None
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import featuretools as ft
+from featuretools.primitives import Count, Mean, Negate, Sum
+
+
+def test_scorer_matches_calculate_feature_matrix(pd_es):
+    agg = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)
+    features = [agg,
+                ft.Feature(agg, parent_entity=pd_es['customers'], primitive=Mean),
+                ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count),
+                ft.Feature(agg, primitive=Negate),
+                ft.Feature(pd_es['customers']['age'], pd_es['sessions'])]
+    features[1] = ft.Feature(features[1], pd_es['sessions'])
+    scorer = ft.FeatureScorer(features, pd_es)
+
+    for ids, time in [([0], datetime(2011, 4, 9, 10, 31)),
+                      ([5, 1], datetime(2011, 4, 10, 11)),
+                      ([3], None)]:
+        fm = scorer.score(ids, time)
+        expected = ft.calculate_feature_matrix(features, pd_es, instance_ids=ids,
+                                               cutoff_time=time or datetime.now())
+        pd.testing.assert_frame_equal(fm, expected,
+                                      check_dtype=False)
+
+
+def test_scorer_default_time_excludes_future_data(pd_es):
+    df = pd_es['log'].df.copy()
+    future_row = df['value'].idxmax()
+    df.loc[future_row, 'datetime'] = pd.Timestamp('2100-01-01')
+    pd_es['log'].update_data(df)
+    session_id = df.loc[future_row, 'session_id']
+
+    feature = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)
+    scorer = ft.FeatureScorer([feature], pd_es)
+    fm = scorer.score([session_id])
+    session_values = df.loc[df['session_id'] == session_id, 'value']
+    assert fm[feature.get_name()].tolist() == [session_values.drop(future_row).sum()]
+
+
+def test_scorer_rebuilds_index_on_update(pd_es):
+    features = [ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)]
+    scorer = ft.FeatureScorer(features, pd_es)
+    df = pd_es['log'].df.copy()
+    df['session_id'] = 0
+    pd_es['log'].update_data(df, already_sorted=True)
+
+    fm = scorer.score([0, 1], datetime(2012, 1, 1))
+    assert fm[features[0].get_name()].tolist() == [df['value'].sum(), 0]
+
+
+def test_scorer_does_not_support_dask(dask_es):
+    features = [ft.Feature(dask_es['log']['value'])]
+    with pytest.raises(ValueError, match="FeatureScorer does not support Dask Entities"):
+        ft.FeatureScorer(features, dask_es)
@@ -131,3 +131,55 @@ def test_feature_trie_ignores_approximate_features(es):
     assert trie.value == (False, set(), {direct.unique_name(), agg.unique_name()})
     assert trie.get_node(agg.relationship_path).value == \
         (False, set(), {value.unique_name()})
+
+
+def test_group_features_by_use_previous(pd_es):
+    value = pd_es['log']['value']
+    features = [ft.Feature(value, parent_entity=pd_es['sessions'], primitive=ft.primitives.Sum,
+                           use_previous=use_previous)
+                for use_previous in [None, '1 day', '7 days']]
+    last_three = ft.Feature(value, parent_entity=pd_es['sessions'], primitive=ft.primitives.Sum,
+                            use_previous='3 observations')
+    feature_set = FeatureSet(features + [last_three])
+
+    names = [f.unique_name() for f in features + [last_three]]
+    groups = [{f.unique_name() for f in group} for group in feature_set.group_features(names)]
+
+    # time based windows are calculated together
+    assert {f.unique_name() for f in features} in groups
+    assert {last_three.unique_name()} in groups
+
+
+def test_execution_plan(pd_es):
+    value = ft.Feature(pd_es['log']['value'])
+    negated = ft.Feature(value, primitive=ft.primitives.Negate)
+    total = ft.Feature(negated, parent_entity=pd_es['sessions'], primitive=ft.primitives.Sum)
+    cumulative = ft.Feature(total, primitive=ft.primitives.CumSum)
+    feature_set = FeatureSet([total, cumulative])
+    plan = feature_set.execution_plan
+
+    def names(groups):
+        return [[f.unique_name() for f in group] for group in groups]
+
+    assert plan.value[0]
+    assert names(plan.value[1]) == [[total.unique_name()], [cumulative.unique_name()]]
+    assert names(plan.value[2]) == []
+    child_node = plan.get_node(total.relationship_path)
+    assert names(child_node.value[1]) == [[value.unique_name()], [negated.unique_name()]]
+    assert feature_set.num_features == 4
+
+    # the plan is only built once
+    assert feature_set.execution_plan is plan
+    assert feature_set.build_execution_plan() is plan
+
+
+def test_get_subset_reuses_feature_sets(es):
+    features = [ft.Feature(es['log']['value'], parent_entity=es['sessions'],
+                           primitive=ft.primitives.Sum),
+                ft.Feature(es['sessions']['device_type'])]
+    feature_set = FeatureSet(features)
+    assert feature_set.get_subset(features) is feature_set
+
+    subset = feature_set.get_subset(features[:1])
+    assert [f.unique_name() for f in subset.target_features] == [features[0].unique_name()]
+    assert feature_set.get_subset(features[:1]) is subset
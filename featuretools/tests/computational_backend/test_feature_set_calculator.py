@@ -21,6 +21,7 @@ from featuretools.primitives import (  # NMostCommon,
     EqualScalar,
     GreaterThanEqualToScalar,
     GreaterThanScalar,
+    Last,
     LessThanEqualToScalar,
     LessThanScalar,
     Mean,
@@ -217,6 +218,46 @@ def test_make_agg_feat_using_prev_n_events(es):
     assert v2 == 10
 
 
+def test_make_agg_feat_using_prev_n_events_multiple_instances(pd_es):
+    value = pd_es['log']['value']
+    features = [ft.Feature(value, parent_entity=pd_es['sessions'], primitive=primitive,
+                           use_previous=Timedelta(2, 'observations'))
+                for primitive in [Sum, Last]]
+    feature_set = FeatureSet(features)
+    time_last = datetime(2011, 4, 10, 10, 40, 1)
+    calculator = FeatureSetCalculator(pd_es, time_last=time_last, feature_set=feature_set)
+    df = calculator.run(np.array([0, 1, 2, 3, 4, 5]))
+
+    log_df = pd_es['log'].df
+    log_df = log_df[log_df['datetime'] <= time_last]
+    last_two = log_df.groupby('session_id')['value'].apply(lambda s: s.iloc[-2:])
+    last_two = last_two.groupby(level=0)
+    expected_sum = last_two.sum().reindex(df.index).fillna(0)
+    expected_last = last_two.last().reindex(df.index)
+    pd.testing.assert_series_equal(df[features[0].get_name()], expected_sum,
+                                   check_names=False, check_dtype=False)
+    pd.testing.assert_series_equal(df[features[1].get_name()], expected_last,
+                                   check_names=False, check_dtype=False)
+
+
+def test_agg_feats_sharing_use_previous_windows(pd_es):
+    value = pd_es['log']['value']
+    features = [ft.Feature(value, parent_entity=pd_es['sessions'], primitive=primitive,
+                           use_previous=use_previous)
+                for primitive in [Sum, Mean, Min, Last]
+                for use_previous in [None, '30 seconds', '1 minute', '1 day']]
+    feature_set = FeatureSet(features)
+    ids = np.array([0, 1, 2, 3, 4, 5])
+
+    for time_last in [datetime(2011, 4, 9, 10, 31, 0), datetime(2011, 4, 10, 10, 41)]:
+        expected = FeatureSetCalculator(pd_es, feature_set, time_last).run(ids)
+        calculator = FeatureSetCalculator(pd_es, feature_set, time_last,
+                                          incremental_aggregations=True)
+        df = calculator.run(ids)
+        pd.testing.assert_frame_equal(df, expected[df.columns], check_dtype=False)
+        assert set(df.columns) == set(expected.columns)
+
+
 def test_make_agg_feat_multiple_dtypes(es):
     if any(isinstance(entity.df, dd.DataFrame) for entity in es.entities):
         pytest.xfail('Currently no dask compatible agg prims that use multiple dtypes')
@@ -1100,3 +1141,57 @@ def test_precalculated_features(pd_es):
     # Calculating without precalculated features should error.
     with pytest.raises(RuntimeError, match=error_msg):
         FeatureSetCalculator(pd_es, feature_set=FeatureSet([direct])).run(instance_ids)
+
+
+def test_threads_match_single_thread(es):
+    features = [ft.Feature(es['customers']['age']),
+                ft.Feature(es['cohorts']['cohort_name'], es['customers']),
+                ft.Feature(es['sessions']['id'], parent_entity=es['customers'], primitive=Count),
+                ft.Feature(es['log']['value'], parent_entity=es['customers'], primitive=Sum),
+                ft.Feature(es['log']['value'], parent_entity=es['sessions'], primitive=Mean)]
+    features.append(ft.Feature(features[-1], parent_entity=es['customers'], primitive=Min))
+    feature_set = FeatureSet(features)
+    instance_ids = np.array([0, 1, 2])
+    time_last = datetime(2011, 4, 10)
+    expected = FeatureSetCalculator(es, feature_set, time_last).run(instance_ids)
+
+    class MockProgressCallback:
+        def __init__(self):
+            self.total = 0
+
+        def __call__(self, update):
+            self.total += update
+
+    mock_progress_callback = MockProgressCallback()
+    calculator = FeatureSetCalculator(es, feature_set, time_last, n_threads=4)
+    df = calculator.run(instance_ids, mock_progress_callback)
+
+    if isinstance(df, dd.DataFrame):
+        df = df.compute().set_index('id').sort_index()
+        expected = expected.compute().set_index('id').sort_index()
+    pd.testing.assert_frame_equal(df, expected)
+    assert np.isclose(mock_progress_callback.total, 1)
+
+
+def test_calculators_of_chunk_share_thread_pool(pd_es, monkeypatch):
+    executors = []
+    run = FeatureSetCalculator.run
+
+    def run_and_record(self, *args, **kwargs):
+        executors.append(self._shared_executor)
+        return run(self, *args, **kwargs)
+
+    monkeypatch.setattr(FeatureSetCalculator, 'run', run_and_record)
+    features = [ft.Feature(pd_es['log']['value'], parent_entity=pd_es['customers'], primitive=Sum),
+                ft.Feature(pd_es['sessions']['id'], parent_entity=pd_es['customers'], primitive=Count)]
+    cutoff_time = pd.DataFrame({'instance_id': [0, 1, 2],
+                                'time': pd.to_datetime(['2011-04-09', '2011-04-10', '2011-04-11'])})
+    fm = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time, n_threads=2)
+
+    assert len(executors) == 3
+    assert executors[0] is not None
+    assert all(executor is executors[0] for executor in executors)
+
+    monkeypatch.undo()
+    expected = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time)
+    pd.testing.assert_frame_equal(fm, expected)
@@ -0,0 +1,56 @@
+import pandas as pd
+
+import featuretools as ft
+from featuretools.computational_backends.calculate_feature_matrix import (
+    _chunk_instances
+)
+from featuretools.computational_backends.partition import (
+    get_entityset_partition
+)
+from featuretools.primitives import Count, CumCount, Sum
+
+
+def test_get_entityset_partition(pd_es):
+    pd_es.add_last_time_indexes()
+    count = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)
+    customer_sum = ft.Feature(count, parent_entity=pd_es['customers'], primitive=Sum)
+    features = [count, ft.Feature(customer_sum, pd_es['sessions'])]
+    feature_set, _ = ft.compile_features(features, pd_es).get_feature_set()
+
+    partition = get_entityset_partition(pd_es, feature_set, [0, 3])
+    # the sessions of the customers of the sessions are needed for the sum
+    customer_ids = pd_es['sessions'].df.loc[[0, 3], 'customer_id']
+    session_ids = pd_es['sessions'].df.index[pd_es['sessions'].df['customer_id'].isin(customer_ids)]
+    assert set(partition['sessions'].df.index) == set(session_ids)
+    assert set(partition['log'].df['session_id']) == set(session_ids)
+    assert set(partition['customers'].df.index) == set(customer_ids)
+    assert partition['stores'].df.empty
+    assert partition['log'].last_time_index.index.equals(partition['log'].df.index)
+
+    cutoff_time = pd.DataFrame({
+        'instance_id': [0, 3, 0],
+        'time': pd.to_datetime(['2011-04-09 10:31', '2011-04-10 11:00', '2011-06-01'])
+    })
+    expected = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time)
+    feature_matrix = ft.calculate_feature_matrix(features, partition, cutoff_time=cutoff_time)
+    pd.testing.assert_frame_equal(feature_matrix, expected)
+
+
+def test_get_entityset_partition_full_entity(pd_es):
+    feature = ft.Feature(pd_es['log']['product_id'], primitive=CumCount)
+    feature_set, _ = ft.compile_features([feature], pd_es).get_feature_set()
+
+    partition = get_entityset_partition(pd_es, feature_set, [0])
+    assert partition['log'].df.equals(pd_es['log'].df)
+    assert partition['sessions'].df.empty
+
+
+def test_chunk_instances():
+    cutoff_time = pd.DataFrame({'instance_id': [3, 1, 3, 2, 1, 4, 5],
+                                'time': range(7)})
+    chunks = list(_chunk_instances(cutoff_time, 3))
+    assert [chunk['instance_id'].tolist() for chunk in chunks] == [[3, 1, 3, 1], [2, 4], [5]]
+
+    instance_ids = pd.Series([1, 2, 3])
+    chunks = list(_chunk_instances((0, instance_ids), 2))
+    assert [(time, ids.tolist()) for time, ids in chunks] == [(0, [1, 2]), (0, [3])]
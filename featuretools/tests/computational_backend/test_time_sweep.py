@@ -0,0 +1,179 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import featuretools as ft
+from featuretools.computational_backends.feature_set import FeatureSet
+from featuretools.computational_backends.feature_set_calculator import (
+    FeatureSetCalculator
+)
+from featuretools.computational_backends.time_sweep import TimeSweep
+from featuretools.primitives import Count, Max, Mean, Median, Std, Sum
+
+
+def test_row_limit_matches_time_mask(pd_es):
+    sweep = TimeSweep(pd_es)
+    times = pd_es['log'].df['datetime']
+    for time_last in [datetime(2011, 4, 9, 10, 30, 0),
+                      datetime(2011, 4, 9, 10, 31, 30),
+                      datetime(2011, 4, 10, 10, 41, 0),
+                      datetime(2012, 1, 1)]:
+        sweep.advance(time_last)
+        assert sweep.row_limit('log') == (times <= time_last).sum()
+
+
+def test_row_limit_excludes_cutoff_time(pd_es):
+    sweep = TimeSweep(pd_es, include_cutoff_time=False)
+    time_last = datetime(2011, 4, 9, 10, 31, 0)
+    sweep.advance(time_last)
+    times = pd_es['log'].df['datetime']
+    assert sweep.row_limit('log') == (times < time_last).sum()
+
+
+def test_advancing_backwards_resets(pd_es):
+    sweep = TimeSweep(pd_es)
+    sweep.advance(datetime(2012, 1, 1))
+    assert sweep.row_limit('log') == pd_es['log'].shape[0]
+    sweep.advance(datetime(2011, 4, 9, 10, 30, 0))
+    assert sweep.row_limit('log') == 1
+
+
+def test_unsweepable_entities(pd_es, dask_es):
+    sweep = TimeSweep(pd_es)
+    sweep.advance(datetime(2011, 4, 9, 10, 30, 0))
+    # no time index
+    assert sweep.row_limit('stores') is None
+
+    df = pd_es['log'].df.copy()
+    df.loc[df.index[0], 'datetime'] = np.nan
+    pd_es['log'].update_data(df, already_sorted=True, recalculate_last_time_indexes=False)
+    assert TimeSweep(pd_es).row_limit('log') is None
+
+    sweep = TimeSweep(dask_es)
+    sweep.advance(datetime(2011, 4, 9, 10, 30, 0))
+    assert sweep.row_limit('log') is None
+
+
+def test_calculator_with_sweep(pd_es):
+    count = ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count)
+    total = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)
+    customer_total = ft.Feature(total, parent_entity=pd_es['customers'], primitive=Sum)
+    feature_set = FeatureSet([count, total, ft.Feature(customer_total, entity=pd_es['sessions'])])
+
+    sweep = TimeSweep(pd_es)
+    ids = np.array([0, 1, 2, 3, 4, 5])
+    for time_last in pd.date_range('2011-04-09 10:30:00', '2011-04-10 11:00:00', periods=7):
+        expected = FeatureSetCalculator(pd_es, feature_set, time_last).run(ids)
+
+        sweep.advance(time_last)
+        calculator = FeatureSetCalculator(pd_es, feature_set, time_last, time_sweep=sweep)
+        pd.testing.assert_frame_equal(calculator.run(ids), expected)
+
+
+def test_can_aggregate(pd_es):
+    sweep = TimeSweep(pd_es, incremental_aggregations=True)
+    sweep.advance(datetime(2011, 4, 10))
+    total = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)
+    assert sweep.can_aggregate(total)
+    assert not sweep.can_aggregate(total, training_window='1 day')
+    assert not TimeSweep(pd_es).can_aggregate(total)
+
+    median = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Median)
+    assert not sweep.can_aggregate(median)
+
+    windowed = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'],
+                          primitive=Sum, use_previous='1 day')
+    assert sweep.can_aggregate(windowed)
+
+    # values can't be removed from the state of max
+    windowed_max = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'],
+                              primitive=Max, use_previous='1 day')
+    assert not sweep.can_aggregate(windowed_max)
+
+    last_rows = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'],
+                           primitive=Sum, use_previous='3 observations')
+    assert not sweep.can_aggregate(last_rows)
+
+    # the base feature depends on the cutoff time through another aggregation
+    stacked = ft.Feature(total, parent_entity=pd_es['customers'], primitive=Sum)
+    assert not sweep.can_aggregate(stacked)
+
+    # the base feature comes from a different entity
+    grandchild = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['customers'], primitive=Sum)
+    assert not sweep.can_aggregate(grandchild)
+
+
+def test_aggregate_folds_in_new_rows(pd_es):
+    sweep = TimeSweep(pd_es, incremental_aggregations=True)
+    total = ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'], primitive=Sum)
+    log_df = pd_es['log'].df
+    for time_last in pd.date_range('2011-04-09 10:30:00', '2011-04-10 11:00:00', periods=5):
+        sweep.advance(time_last)
+        rows = log_df[log_df['datetime'] <= time_last]
+        expected = rows['value'].groupby(rows['session_id']).sum()
+        actual = sweep.aggregate(total).sort_index()
+        pd.testing.assert_series_equal(actual, expected, check_names=False)
+
+
+def test_calculator_with_incremental_aggregations(pd_es):
+    value = pd_es['log']['value']
+    features = [ft.Feature(value, parent_entity=pd_es['sessions'], primitive=primitive)
+                for primitive in [Sum, Mean, Max, Std]]
+    features.append(ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'], primitive=Count))
+    features.append(ft.Feature(value, parent_entity=pd_es['sessions'], primitive=Sum,
+                               where=ft.Feature(pd_es['log']['purchased'])))
+    feature_set = FeatureSet(features)
+
+    sweep = TimeSweep(pd_es, incremental_aggregations=True)
+    ids = np.array([0, 1, 2, 3, 4, 5])
+    for time_last in pd.date_range('2011-04-09 10:30:00', '2011-04-10 11:00:00', periods=7):
+        expected = FeatureSetCalculator(pd_es, feature_set, time_last).run(ids)
+
+        sweep.advance(time_last)
+        calculator = FeatureSetCalculator(pd_es, feature_set, time_last, time_sweep=sweep)
+        pd.testing.assert_frame_equal(calculator.run(ids), expected, check_dtype=False)
+
+
+def test_cfm_incremental_aggregations(pd_es):
+    value = pd_es['log']['value']
+    features = [ft.Feature(value, parent_entity=pd_es['customers'], primitive=primitive)
+                for primitive in [Sum, Mean, Std]]
+    features.append(ft.Feature(pd_es['log']['id'], parent_entity=pd_es['customers'], primitive=Count))
+    features += [ft.Feature(value, parent_entity=pd_es['customers'], primitive=primitive,
+                            use_previous='1 day')
+                 for primitive in [Sum, Mean, Max]]
+    cutoff_time = pd.DataFrame({
+        'instance_id': [0, 1, 2, 0, 1, 2, 0],
+        'time': pd.to_datetime(['2011-04-08', '2011-04-09 10:31', '2011-04-09 10:40',
+                                '2011-04-10', '2011-04-10 11:00', '2011-04-11', '2011-04-12'])
+    })
+    expected = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time)
+    fm = ft.calculate_feature_matrix(features, pd_es, cutoff_time=cutoff_time,
+                                     incremental_aggregations=True)
+    pd.testing.assert_frame_equal(fm, expected, check_dtype=False)
+
+
+def test_aggregate_sliding_window(pd_es):
+    sweep = TimeSweep(pd_es, incremental_aggregations=True)
+    log_df = pd_es['log'].df
+    sessions = pd_es['sessions'].df.index
+    features = [ft.Feature(pd_es['log']['id'], parent_entity=pd_es['sessions'],
+                           primitive=Count, use_previous='1 minute')]
+    features += [ft.Feature(pd_es['log']['value'], parent_entity=pd_es['sessions'],
+                            primitive=primitive, use_previous='1 minute')
+                 for primitive in [Sum, Mean]]
+    cutoff_times = pd.date_range('2011-04-09 10:30:00', '2011-04-09 10:45:00', periods=40).append(
+        pd.date_range('2011-04-10 10:39:00', '2011-04-10 10:42:00', periods=20))
+    for time_last in cutoff_times:
+        sweep.advance(time_last)
+        window = (log_df['datetime'] <= time_last) & \
+            (log_df['datetime'] >= time_last - pd.Timedelta('1 minute'))
+        rows = log_df[window]
+        for feature in features:
+            variable = feature.base_features[0].get_name()
+            expected = rows[variable].groupby(rows['session_id']).agg(feature.get_function())
+            expected = expected.reindex(sessions).fillna(feature.default_value)
+            actual = sweep.aggregate(feature).reindex(sessions).fillna(feature.default_value)
+            pd.testing.assert_series_equal(actual, expected,
+                                           check_names=False, check_dtype=False)
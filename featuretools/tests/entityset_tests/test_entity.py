@@ -147,6 +147,95 @@ def test_query_by_values_returns_rows_in_given_order():
     assert np.array_equal(query['id'], [1, 3, 4, 5])
 
 
+def test_query_by_values_with_row_indexes(pd_es):
+    log = pd_es['log']
+    time_last = datetime(2011, 4, 9, 10, 40, 0)
+    queries = [(values, variable_id, row_limit)
+               for values in [[0, 1], [1, 1, 5], [4], [100], []]
+               for variable_id in ['session_id', 'id']
+               for row_limit in [None, 8]]
+    expected = [log.query_by_values(values, variable_id=variable_id,
+                                    time_last=time_last, row_limit=row_limit)
+                for values, variable_id, row_limit in queries]
+
+    pd_es.add_row_indexes()
+    assert log._get_row_index('session_id') is not None
+    assert log._get_row_index('value') is None
+    for (values, variable_id, row_limit), df in zip(queries, expected):
+        result = log.query_by_values(values, variable_id=variable_id,
+                                     time_last=time_last, row_limit=row_limit)
+        pd.testing.assert_frame_equal(result, df)
+
+    # the indexes are rebuilt when the data changes
+    df = log.df.copy()
+    df['session_id'] = 0
+    log.update_data(df, already_sorted=True)
+    assert len(log.query_by_values([0], variable_id='session_id')) == len(df)
+
+
+def test_row_indexes_not_supported_with_dask(dask_es):
+    with pytest.raises(ValueError, match="Row indexes are not supported with Dask Entities"):
+        dask_es['log'].add_row_indexes()
+
+
+def test_query_by_values_slices_sorted_time_index(pd_es):
+    pd_es.add_last_time_indexes()
+    time_last = datetime(2011, 4, 9, 10, 40, 0)
+    queries = [(entity_id, values, training_window, include_cutoff_time)
+               for entity_id in ['log', 'customers', 'cohorts']
+               for values in [None, [0, 1, 2]]
+               for training_window in [None, '5 minutes', '1 day']
+               for include_cutoff_time in [True, False]]
+
+    def query(entity_id, values, training_window, include_cutoff_time):
+        return pd_es[entity_id].query_by_values(values,
+                                                time_last=time_last,
+                                                training_window=training_window,
+                                                include_cutoff_time=include_cutoff_time)
+
+    for entity_id in ['log', 'customers', 'cohorts']:
+        assert pd_es[entity_id]._time_index_is_sorted()
+        pd_es[entity_id]._time_index_sorted = False
+    expected = [query(*args) for args in queries]
+
+    df = pd_es['customers'].df.copy()
+    for entity_id in ['log', 'customers', 'cohorts']:
+        pd_es[entity_id]._time_index_sorted = True
+    for args, expected_df in zip(queries, expected):
+        pd.testing.assert_frame_equal(query(*args), expected_df)
+
+    # masking secondary time index columns doesn't change the entity's data
+    pd.testing.assert_frame_equal(pd_es['customers'].df, df)
+
+    log = pd_es['log']
+    df = log.df.copy()
+    df['datetime'] = df['datetime'].values[::-1]
+    log.update_data(df, already_sorted=True)
+    assert not log._time_index_is_sorted()
+    result = log.query_by_values(None, time_last=time_last)
+    assert (result['datetime'] <= time_last).all()
+    assert len(result) == (df['datetime'] <= time_last).sum()
+
+
+def test_query_by_values_does_not_share_data(pd_es):
+    customers = pd_es['customers']
+    df = customers.df.copy()
+    end = datetime(2011, 10, 1)
+    columns = ['age', 'cancel_reason']
+    for values in [None, [0, 1, 2]]:
+        for time_last in [None, end]:
+            result = customers.query_by_values(values, time_last=time_last)
+            result['age'] = 0
+            pd.testing.assert_frame_equal(customers.df, df)
+
+            result = customers.query_by_values(values, columns=columns, time_last=time_last)
+            assert list(result.columns) == columns
+            expected = customers.query_by_values(values, time_last=time_last)[columns]
+            pd.testing.assert_frame_equal(result, expected)
+            result['age'] = 0
+            pd.testing.assert_frame_equal(customers.df, df)
+
+
 def test_query_by_values_secondary_time_index(es):
     end = np.datetime64(datetime(2011, 10, 1))
     all_instances = [0, 1, 2]
@@ -10,11 +10,14 @@ import featuretools as ft
 from featuretools.entityset.relationship import RelationshipPath
 from featuretools.primitives import (
     Count,
+    Max,
     Mean,
     Median,
+    Min,
     NMostCommon,
     NumTrue,
     NumUnique,
+    Std,
     Sum,
     TimeSinceFirst,
     TimeSinceLast,
@@ -689,3 +692,46 @@ def test_override_multi_feature_names(pd_es):
 
     for name in expected_names:
         assert name in fm.columns
+
+
+@pytest.mark.parametrize('primitive', [Count, Sum, Mean, Min, Max, Std])
+def test_incremental_aggregation_matches_function(primitive):
+    values = pd.Series([1.5, 2., np.nan, 4., 10., -3., 7., np.nan, 2.5, 6.])
+    groups = pd.Series([0, 0, 0, 1, 1, 2, 2, 2, 3, 0])
+    expected = values.groupby(groups).agg(primitive().get_function())
+
+    aggregation = primitive().get_incremental_aggregation()
+    state = None
+    # merge batches where some groups only appear in one of the states
+    for batch in [slice(0, 2), slice(2, 5), slice(5, 6), slice(6, 10)]:
+        new_state = aggregation.chunk(values[batch].groupby(groups[batch]))
+        state = new_state if state is None else aggregation.combine(state, new_state)
+
+    actual = aggregation.finalize(state).sort_index()
+    pd.testing.assert_series_equal(actual, expected, check_names=False, check_dtype=False)
+
+
+@pytest.mark.parametrize("primitive", [Count, Sum, Mean, Min, Max, Std])
+def test_accumulated_aggregation_matches_function(primitive):
+    values = pd.Series([1.5, 2., np.nan, 4., 10., -3., 7., np.nan, 2.5, 6.])
+    groups = pd.Series([0, 0, 0, 1, 1, 2, 2, 2, 3, 3])
+    batches = pd.Series([0, 0, 1, 2, 3, 4, 4, 5, 6, 7])
+
+    aggregation = primitive().get_incremental_aggregation()
+    state = aggregation.chunk(values.groupby(batches))
+    state = aggregation.accumulate(state, groups.groupby(batches).first().values)
+    actual = aggregation.finalize(state)
+    # the accumulated state of each batch contains all values of its group
+    # up to the end of the batch
+    for batch, value in actual.items():
+        rows = (groups == groups[batches == batch].iloc[0]) & (batches <= batch)
+        expected = values[rows].agg(primitive().get_function())
+        if np.isnan(expected):
+            assert np.isnan(value)
+        else:
+            assert value == pytest.approx(expected)
+
+
+def test_no_incremental_aggregation():
+    assert Median().get_incremental_aggregation() is None
+    assert Mean(skipna=False).get_incremental_aggregation() is None
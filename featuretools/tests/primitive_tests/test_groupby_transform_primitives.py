@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+import pytest
 
 import featuretools as ft
 from featuretools.computational_backends.feature_set import FeatureSet
@@ -12,7 +13,9 @@ from featuretools.primitives import (
     CumMean,
     CumMin,
     CumSum,
+    Diff,
     Last,
+    TimeSincePrevious,
     TransformPrimitive
 )
 from featuretools.primitives.base import make_trans_primitive
@@ -491,3 +494,54 @@ def test_groupby_with_multioutput_primitive_custom_names(pd_es):
         assert f in fm.columns
         for x, y in zip(fm[f].values, fm[answer_cols[i][1]].values):
             assert x == y
+
+
+@pytest.mark.parametrize("primitive", [CumCount, CumMax, CumMean, CumMin, CumSum,
+                                       Diff, TimeSincePrevious])
+def test_groupby_function_matches_function(pd_es, primitive):
+    class PerGroupPrimitive(primitive):
+        name = primitive.name + "_per_group"
+
+        def get_groupby_function(self):
+            return None
+
+    df = pd_es['log'].df
+    df['product_id'] = (['coke zero'] * 3 + ['car'] * 2 +
+                        ['toothpaste'] * 3 + ['brown bag'] * 2 +
+                        ['shoes'] +
+                        [np.nan] * 4 +
+                        ['coke_zero'] * 2)
+    df.loc[[2, 12], 'value'] = np.nan
+
+    if primitive == CumCount:
+        base = pd_es['log']['session_id']
+    elif primitive == TimeSincePrevious:
+        base = pd_es['log']['datetime']
+    else:
+        base = pd_es['log']['value']
+    groupby = pd_es['log']['product_id']
+    vectorized = ft.Feature(base, groupby=groupby, primitive=primitive)
+    per_group = ft.Feature(base, groupby=groupby, primitive=PerGroupPrimitive)
+    assert vectorized.get_groupby_function() is not None
+
+    fm = ft.calculate_feature_matrix([vectorized, per_group], pd_es, instance_ids=range(17))
+    pd.testing.assert_series_equal(fm[vectorized.get_name()], fm[per_group.get_name()],
+                                   check_names=False, check_dtype=False)
+
+
+def test_groupby_function_not_used_when_function_overridden(pd_es):
+    class DoubleCumSum(CumSum):
+        name = "double_cum_sum"
+
+        def get_function(self):
+            def double_cum_sum(values):
+                return values.cumsum() * 2
+
+            return double_cum_sum
+
+    feature = ft.Feature(pd_es['log']['value'], groupby=pd_es['log']['session_id'],
+                         primitive=DoubleCumSum)
+    assert feature.get_groupby_function() is None
+
+    fm = ft.calculate_feature_matrix([feature], pd_es, instance_ids=range(4))
+    assert fm[feature.get_name()].tolist() == [0, 10, 30, 60]